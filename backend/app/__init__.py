@@ -1,17 +1,20 @@
-from flask import Flask
+from flask import Flask, request
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from pymongo import MongoClient
 from datetime import timedelta
+import hmac
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from app.config import Config
+from app.database import db, mongo, ensure_indexes
+from app.utils.metrics import metrics
+from app.utils.query_monitor import query_monitor
+
 # Initialize extensions
 jwt = JWTManager()
-mongo_client = None
-db = None
 
 def create_app():
     """Create and configure Flask application"""
@@ -24,6 +27,8 @@ def create_app():
     app.config['JWT_TOKEN_LOCATION'] = ['headers']
     app.config['JWT_HEADER_NAME'] = 'Authorization'
     app.config['JWT_HEADER_TYPE'] = 'Bearer'
+    # Only the job event stream reads tokens from the query string
+    app.config['JWT_QUERY_STRING_NAME'] = 'token'
     
     # Initialize CORS
     CORS(app, resources={
@@ -38,42 +43,33 @@ def create_app():
     # Initialize JWT
     jwt.init_app(app)
     
-    # Initialize MongoDB
-    global mongo_client, db
-    mongo_uri = os.getenv('MONGO_URI')
+    @jwt.token_verification_loader
+    def scoped_token_allowed(jwt_header, jwt_data):
+        # Job event tokens travel in URLs; they open that stream and nothing else
+        return 'scope' not in jwt_data or request.endpoint == 'jobs.stream_job'
     
-    if not mongo_uri:
+    # MongoDB: the client is created lazily per process (see app/database.py)
+    if not Config.MONGO_URI:
         raise ValueError("❌ MONGO_URI not found in .env file!")
     
-    try:
-        mongo_client = MongoClient(mongo_uri)
-        db = mongo_client['mindmorph']
-        
-        # Test connection
-        mongo_client.admin.command('ping')
-        print("✅ MongoDB connected successfully!")
-        
-        # Create indexes
-        db.users.create_index('email', unique=True)
-        db.questionnaire_predictions.create_index('userId')
-        db.text_predictions.create_index('userId')
-        db.twitter_predictions.create_index('userId')
-        db.cached_tweets.create_index('twitterHandle', unique=True)
-        db.cached_tweets.create_index('expiresAt', expireAfterSeconds=0)
-        
+    # Attribute every Mongo command to the request that issued it
+    mongo.add_listener(query_monitor)
+    query_monitor.init_app(app)
+    
+    if Config.MONGO_MIGRATE_ON_BOOT:
+        ensure_indexes(db.resolve())
         print("✅ Database indexes created!")
-        
-    except Exception as e:
-        print(f"❌ MongoDB connection failed: {str(e)}")
-        raise
     
     # Register blueprints (routes)
-    from app.routes import auth, questionnaire, text, twitter, twitter_mock_api
+    from app.routes import auth, questionnaire, text, twitter, twitter_mock_api, history, summary, jobs
     app.register_blueprint(auth.bp)
     app.register_blueprint(questionnaire.bp)
     app.register_blueprint(text.bp)
     app.register_blueprint(twitter.bp)
     app.register_blueprint(twitter_mock_api.bp)
+    app.register_blueprint(history.bp)
+    app.register_blueprint(summary.bp)
+    app.register_blueprint(jobs.bp)
     
     # Root route
     @app.route('/')
@@ -84,9 +80,36 @@ def create_app():
             'status': 'running'
         }
     
-    # Health check route
+    # Health check route (ping result is cached briefly per process)
     @app.route('/health')
     def health():
-        return {'status': 'healthy', 'database': 'connected'}
+        ping = mongo.ping()
+        
+        if not ping['connected']:
+            return {
+                'status': 'unhealthy',
+                'database': 'unreachable',
+                'error': ping['error'],
+                'checkedAt': ping['checkedAt']
+            }, 503
+        
+        return {
+            'status': 'healthy',
+            'database': 'connected',
+            'latencyMs': ping['latencyMs'],
+            'checkedAt': ping['checkedAt']
+        }
+    
+    # Process-local metrics (pool, queues, caches), for scrapers holding METRICS_TOKEN
+    @app.route('/metrics')
+    def get_metrics():
+        if not Config.METRICS_TOKEN:
+            return {'error': 'Not found'}, 404
+        
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode(), f'Bearer {Config.METRICS_TOKEN}'.encode()):
+            return {'error': 'Invalid metrics token'}, 401
+        
+        return metrics.snapshot()
     
     return app
\ No newline at end of file
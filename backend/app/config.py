@@ -16,9 +16,135 @@ class Config:
     JWT_TOKEN_LOCATION = ['headers']
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
+    JWT_QUERY_STRING_NAME = 'token'
     
     # MongoDB
     MONGO_URI = os.getenv('MONGO_URI')
+    MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'mindmorph')
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 50))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 60000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 2000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', 5000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', 20000))
+    # zlib ships with Python; zstd/snappy need the matching pip packages
+    MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', 'zlib')
+    MONGO_HEALTH_CACHE_SECONDS = float(os.getenv('MONGO_HEALTH_CACHE_SECONDS', 5))
+    # Dev convenience only; production runs scripts/migrate_indexes.py once per deploy
+    MONGO_MIGRATE_ON_BOOT = os.getenv('MONGO_MIGRATE_ON_BOOT', 'false').lower() == 'true'
+    
+    # Password hashing (bcrypt runs on a bounded executor per worker)
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    BCRYPT_MAX_CONCURRENCY = int(os.getenv('BCRYPT_MAX_CONCURRENCY', 2))
+    BCRYPT_MAX_QUEUE = int(os.getenv('BCRYPT_MAX_QUEUE', 32))
+    BCRYPT_TIMEOUT_SECONDS = float(os.getenv('BCRYPT_TIMEOUT_SECONDS', 10))
+    
+    # Per-process cache of sanitized user records (auth verify / me)
+    USER_CACHE_TTL_SECONDS = float(os.getenv('USER_CACHE_TTL_SECONDS', 60))
+    USER_CACHE_MAX_SIZE = int(os.getenv('USER_CACHE_MAX_SIZE', 10000))
+    
+    # Prediction persistence ('sync' or 'write_behind')
+    PREDICTION_WRITE_MODE = os.getenv('PREDICTION_WRITE_MODE', 'sync').lower()
+    PREDICTION_WRITE_QUEUE_SIZE = int(os.getenv('PREDICTION_WRITE_QUEUE_SIZE', 1000))
+    PREDICTION_WRITE_BATCH_SIZE = int(os.getenv('PREDICTION_WRITE_BATCH_SIZE', 100))
+    PREDICTION_WRITE_FLUSH_INTERVAL = float(os.getenv('PREDICTION_WRITE_FLUSH_INTERVAL', 0.2))
+    PREDICTION_WRITE_MAX_RETRIES = int(os.getenv('PREDICTION_WRITE_MAX_RETRIES', 3))
+    # Default write concern; override per collection with
+    # PREDICTION_WRITE_CONCERN_<COLLECTION>, e.g. PREDICTION_WRITE_CONCERN_TWITTER_PREDICTIONS=0
+    PREDICTION_WRITE_CONCERN = os.getenv('PREDICTION_WRITE_CONCERN')
+    
+    # Mock Twitter API transport: 'inprocess' (same app) or 'http' (mock runs elsewhere)
+    MOCK_TWITTER_TRANSPORT = os.getenv('MOCK_TWITTER_TRANSPORT', 'inprocess').lower()
+    MOCK_TWITTER_BASE_URL = os.getenv('MOCK_TWITTER_BASE_URL', 'http://localhost:5000/api/mock/twitter')
+    MOCK_TWITTER_TIMEOUT_SECONDS = float(os.getenv('MOCK_TWITTER_TIMEOUT_SECONDS', 5))
+    # Point at a larger synthetic dataset for load tests
+    MOCK_TWITTER_DATA_PATH = os.getenv('MOCK_TWITTER_DATA_PATH')
+    
+    # Real Twitter API quota, shared by all workers through db.api_quota
+    TWITTER_READ_LIMIT = int(os.getenv('TWITTER_READ_LIMIT', 100))
+    TWITTER_QUOTA_WINDOW = os.getenv('TWITTER_QUOTA_WINDOW', 'month').lower()  # 'month' or 'day'
+    
+    # Model outputs shared across users, keyed by handle + tweet set + model version (0 = off)
+    ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv('ANALYSIS_CACHE_TTL_SECONDS', 3600))
+    
+    # Re-analysis fetches only tweets newer than the stored per-tweet features
+    # (db.tweet_features) and pools them instead of re-encoding all 20 tweets
+    TWITTER_INCREMENTAL = os.getenv('TWITTER_INCREMENTAL', 'false').lower() == 'true'
+    
+    # Batch Twitter analysis
+    TWITTER_BATCH_MAX_HANDLES = int(os.getenv('TWITTER_BATCH_MAX_HANDLES', 200))
+    TWITTER_BATCH_CONCURRENCY = int(os.getenv('TWITTER_BATCH_CONCURRENCY', 8))
+    
+    # Circuit breaker around the real Twitter API (per worker)
+    TWITTER_BREAKER_FAILURES = int(os.getenv('TWITTER_BREAKER_FAILURES', 5))
+    TWITTER_BREAKER_WINDOW_SECONDS = float(os.getenv('TWITTER_BREAKER_WINDOW_SECONDS', 60))
+    # Calls slower than this count as failures
+    TWITTER_BREAKER_SLOW_SECONDS = float(os.getenv('TWITTER_BREAKER_SLOW_SECONDS', 5))
+    TWITTER_BREAKER_OPEN_SECONDS = float(os.getenv('TWITTER_BREAKER_OPEN_SECONDS', 30))
+    TWITTER_BREAKER_HALF_OPEN_CALLS = int(os.getenv('TWITTER_BREAKER_HALF_OPEN_CALLS', 1))
+    # Start the Mock fetch if the real API hasn't answered within this many seconds (0 = off)
+    TWITTER_HEDGE_AFTER_SECONDS = float(os.getenv('TWITTER_HEDGE_AFTER_SECONDS', 0))
+    
+    # Read-through tweet cache (db.cached_tweets)
+    TWEET_CACHE_TTL_SECONDS = int(os.getenv('TWEET_CACHE_TTL_SECONDS', 6 * 3600))
+    # Extra window in which an expired entry is still served while it refreshes (0 = off)
+    TWEET_CACHE_STALE_SECONDS = int(os.getenv('TWEET_CACHE_STALE_SECONDS', 0))
+    # Freshness of Mock fallback entries while the real API is enabled, so a
+    # transient real-API failure doesn't pin synthetic tweets for the full TTL
+    TWEET_CACHE_FALLBACK_TTL_SECONDS = int(os.getenv('TWEET_CACHE_FALLBACK_TTL_SECONDS', 300))
+    
+    # Background analysis jobs (db.analysis_jobs)
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_MAX_PENDING = int(os.getenv('JOB_MAX_PENDING', 100))
+    JOB_TTL_SECONDS = int(os.getenv('JOB_TTL_SECONDS', 24 * 3600))
+    # The owning worker renews a job's lease every JOB_HEARTBEAT_SECONDS; an
+    # unfinished job whose lease lapsed (worker restarted/killed) is marked failed
+    JOB_HEARTBEAT_SECONDS = float(os.getenv('JOB_HEARTBEAT_SECONDS', 10))
+    JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', 45))
+    JOB_POLL_INTERVAL_SECONDS = float(os.getenv('JOB_POLL_INTERVAL_SECONDS', 0.5))
+    # SSE streams end (and EventSource reconnects) well before the gunicorn worker timeout
+    JOB_STREAM_TIMEOUT_SECONDS = float(os.getenv('JOB_STREAM_TIMEOUT_SECONDS', 20))
+    # Lifetime of the job-scoped ?token= in eventsUrl
+    JOB_EVENTS_TOKEN_SECONDS = int(os.getenv('JOB_EVENTS_TOKEN_SECONDS', 300))
+    # Text predictions at least this long run as a job unless the client sends async=false (0 = off)
+    TEXT_ASYNC_MIN_LENGTH = int(os.getenv('TEXT_ASYNC_MIN_LENGTH', 0))
+    
+    # Admission control for model-backed routes (per worker). Beyond
+    # ADMISSION_MAX_IN_FLIGHT, requests wait up to ADMISSION_QUEUE_TIMEOUT_SECONDS
+    # in a queue of ADMISSION_MAX_QUEUE, else get 503 + Retry-After (0 = no limit).
+    # Keep in-flight + queue below the gunicorn --threads (Procfile: 8) so some
+    # threads always remain for login and other cheap routes
+    ADMISSION_MAX_IN_FLIGHT = int(os.getenv('ADMISSION_MAX_IN_FLIGHT', 2))
+    ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', 4))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_SECONDS', 2))
+    # Per-user token bucket (per worker); empty -> 429 + Retry-After (0 = off)
+    ADMISSION_USER_RATE_PER_MINUTE = float(os.getenv('ADMISSION_USER_RATE_PER_MINUTE', 30))
+    ADMISSION_USER_BURST = int(os.getenv('ADMISSION_USER_BURST', 10))
+    ADMISSION_MAX_TRACKED_USERS = int(os.getenv('ADMISSION_MAX_TRACKED_USERS', 10000))
+    
+    # Text inference: 'full' (BERT ensemble for every text) or 'cascade'
+    # (fast tier first, BERT only inside its uncertainty band; needs fast_tier.pkl)
+    TEXT_INFERENCE_MODE = os.getenv('TEXT_INFERENCE_MODE', 'full').lower()
+    # Sentence encoder: 'minilm' (all-MiniLM-L6-v2) or 'static' (distilled table,
+    # see scripts/distill_static_encoder.py and scripts/train_static_ensembles.py)
+    TEXT_ENCODER = os.getenv('TEXT_ENCODER', 'minilm').lower()
+    # Local MiniLM bundle (scripts/encoder_bundle.py); default app/ml_models/encoders/all-MiniLM-L6-v2
+    TEXT_ENCODER_PATH = os.getenv('TEXT_ENCODER_PATH')
+    # Never contact the HuggingFace hub: a missing bundle fails the load instead of downloading
+    MODEL_OFFLINE = os.getenv('MODEL_OFFLINE', 'false').lower() == 'true'
+    
+    # Model registry (app/ml_models/registry, see scripts/model_registry.py)
+    # How often each worker checks the ACTIVE/CANDIDATE pointers (0 = never hot-swap)
+    MODEL_REGISTRY_POLL_SECONDS = float(os.getenv('MODEL_REGISTRY_POLL_SECONDS', 10))
+    # How long a swap waits for requests still on the old version
+    MODEL_DRAIN_TIMEOUT_SECONDS = float(os.getenv('MODEL_DRAIN_TIMEOUT_SECONDS', 60))
+    # Share of requests re-scored on the CANDIDATE version in the background
+    MODEL_SHADOW_SAMPLE_RATE = float(os.getenv('MODEL_SHADOW_SAMPLE_RATE', 0))
+    MODEL_SHADOW_MAX_PENDING = int(os.getenv('MODEL_SHADOW_MAX_PENDING', 8))
+    
+    # Bearer token required by GET /metrics (unset = endpoint disabled, 404)
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
     
     # CORS
     CORS_ORIGINS = ["http://localhost:5173", "http://localhost:3000"]
\ No newline at end of file
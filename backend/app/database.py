@@ -0,0 +1,272 @@
+import os
+import threading
+import time
+from datetime import datetime
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import monitoring
+from app.config import Config
+from app.utils.metrics import metrics
+
+# Every index the app relies on; applied by scripts/migrate_indexes.py
+INDEXES = {
+    'users': [
+        ([('email', ASCENDING)], {'unique': True})
+    ],
+    'questionnaire_predictions': [
+        ([('userId', ASCENDING)], {}),
+        ([('userId', ASCENDING), ('timestamp', DESCENDING), ('_id', DESCENDING)], {})
+    ],
+    'text_predictions': [
+        ([('userId', ASCENDING)], {}),
+        ([('userId', ASCENDING), ('timestamp', DESCENDING), ('_id', DESCENDING)], {}),
+        ([('featureId', ASCENDING)], {'sparse': True})
+    ],
+    'twitter_predictions': [
+        ([('userId', ASCENDING)], {}),
+        ([('userId', ASCENDING), ('timestamp', DESCENDING), ('_id', DESCENDING)], {}),
+        ([('featureId', ASCENDING)], {'sparse': True})
+    ],
+    'cached_tweets': [
+        ([('twitterHandle', ASCENDING)], {'unique': True}),
+        ([('expiresAt', ASCENDING)], {'expireAfterSeconds': 0})
+    ],
+    'tweet_features': [
+        ([('twitterHandle', ASCENDING)], {'unique': True})
+    ],
+    'analysis_cache': [
+        ([('expiresAt', ASCENDING)], {'expireAfterSeconds': 0})
+    ],
+    'analysis_jobs': [
+        ([('expiresAt', ASCENDING)], {'expireAfterSeconds': 0})
+    ]
+}
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection pool listener tracking checkouts and checkout wait time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stats = {
+                'connectionsCreated': 0,
+                'connectionsClosed': 0,
+                'checkedOut': 0,
+                'checkouts': 0,
+                'checkoutFailures': 0,
+                'checkoutWaitTotalMs': 0.0,
+                'checkoutWaitMaxMs': 0.0
+            }
+
+    def _bump(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._bump('connectionsCreated')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._bump('connectionsClosed')
+
+    def connection_check_out_started(self, event):
+        # Check-out start and finish are reported on the requesting thread
+        self._local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._bump('checkoutFailures')
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, 'started', None)
+        wait_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+
+        with self._lock:
+            self.stats['checkouts'] += 1
+            self.stats['checkedOut'] += 1
+            self.stats['checkoutWaitTotalMs'] += wait_ms
+            self.stats['checkoutWaitMaxMs'] = max(self.stats['checkoutWaitMaxMs'], wait_ms)
+
+    def connection_checked_in(self, event):
+        self._bump('checkedOut', -1)
+
+class MongoConnectionManager:
+    """
+    Lazily creates one MongoClient per process
+
+    The client is built on first use and rebuilt if the PID changes, so a
+    client created in a gunicorn master (e.g. with --preload) is never
+    shared with forked workers.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._ping_cache = None
+        self.pool_monitor = PoolMonitor()
+        self.event_listeners = [self.pool_monitor]
+
+    def add_listener(self, listener):
+        """Register a pymongo event listener for clients created from now on"""
+        if listener not in self.event_listeners:
+            self.event_listeners.append(listener)
+
+    def client_options(self):
+        """MongoClient keyword arguments built from settings"""
+        options = {
+            'maxPoolSize': Config.MONGO_MAX_POOL_SIZE,
+            'minPoolSize': Config.MONGO_MIN_POOL_SIZE,
+            'maxIdleTimeMS': Config.MONGO_MAX_IDLE_TIME_MS,
+            'waitQueueTimeoutMS': Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            'serverSelectionTimeoutMS': Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            'connectTimeoutMS': Config.MONGO_CONNECT_TIMEOUT_MS,
+            'socketTimeoutMS': Config.MONGO_SOCKET_TIMEOUT_MS,
+            'event_listeners': list(self.event_listeners)
+        }
+
+        if Config.MONGO_COMPRESSORS:
+            options['compressors'] = Config.MONGO_COMPRESSORS
+
+        return options
+
+    def client(self):
+        """Get this process's MongoClient, creating it on first use"""
+        if self._client is not None and self._pid == os.getpid():
+            return self._client
+
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                if not Config.MONGO_URI:
+                    raise ValueError("❌ MONGO_URI not found in .env file!")
+
+                # Never close an inherited client: its sockets belong to the parent
+                self._client = MongoClient(Config.MONGO_URI, **self.client_options())
+                self._pid = os.getpid()
+                self._ping_cache = None
+                self.pool_monitor.reset()
+
+        return self._client
+
+    def database(self):
+        """Get this process's application database"""
+        return self.client()[Config.MONGO_DB_NAME]
+
+    def ping(self):
+        """
+        Check connectivity, caching the answer for MONGO_HEALTH_CACHE_SECONDS
+
+        Returns:
+            dict: {connected, latencyMs, checkedAt, error}
+        """
+        cached = self._ping_cache
+        if cached and cached['pid'] == os.getpid() and \
+                time.monotonic() - cached['at'] < Config.MONGO_HEALTH_CACHE_SECONDS:
+            return cached['result']
+
+        started = time.perf_counter()
+        try:
+            self.client().admin.command('ping')
+            result = {
+                'connected': True,
+                'latencyMs': round((time.perf_counter() - started) * 1000, 2),
+                'checkedAt': datetime.utcnow().isoformat() + 'Z',
+                'error': None
+            }
+        except Exception as e:
+            result = {
+                'connected': False,
+                'latencyMs': None,
+                'checkedAt': datetime.utcnow().isoformat() + 'Z',
+                'error': str(e)
+            }
+
+        self._ping_cache = {'pid': os.getpid(), 'at': time.monotonic(), 'result': result}
+        return result
+
+    def pool_stats(self):
+        """Pool configuration plus checkout statistics for this process"""
+        stats = dict(self.pool_monitor.stats)
+        checkouts = stats['checkouts']
+        stats['checkoutWaitAvgMs'] = round(stats['checkoutWaitTotalMs'] / checkouts, 3) if checkouts else 0.0
+        stats['checkoutWaitTotalMs'] = round(stats['checkoutWaitTotalMs'], 3)
+        stats['checkoutWaitMaxMs'] = round(stats['checkoutWaitMaxMs'], 3)
+        stats['maxPoolSize'] = Config.MONGO_MAX_POOL_SIZE
+        stats['pid'] = os.getpid()
+        stats['clientCreated'] = self._client is not None and self._pid == os.getpid()
+        return stats
+
+class LazyCollection:
+    """Collection handle that resolves against the current process's client"""
+
+    def __init__(self, manager, name):
+        self._manager = manager
+        self.name = name
+
+    def _resolve(self):
+        return self._manager.database()[self.name]
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __getitem__(self, name):
+        return LazyCollection(self._manager, f'{self.name}.{name}')
+
+class LazyDatabase:
+    """
+    Database handle safe to capture at import time
+
+    Services keep `db.<collection>` references; each one resolves to the
+    current process's client when an operation is actually issued.
+    """
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._collections = {}
+
+    def _collection(self, name):
+        if name not in self._collections:
+            self._collections[name] = LazyCollection(self._manager, name)
+        return self._collections[name]
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self._collection(name)
+
+    def __getitem__(self, name):
+        return self._collection(name)
+
+    def resolve(self):
+        """Get the underlying pymongo Database (e.g. for admin commands)"""
+        return self._manager.database()
+
+def ensure_indexes(database):
+    """Create every index in INDEXES (idempotent)"""
+    created = []
+    for collection_name, indexes in INDEXES.items():
+        for keys, options in indexes:
+            created.append(database[collection_name].create_index(keys, **options))
+    return created
+
+# Global instances
+mongo = MongoConnectionManager()
+db = LazyDatabase(mongo)
+
+metrics.register('mongo_pool', mongo.pool_stats)
\ No newline at end of file
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+
+# Local copy of the sentence encoder (see scripts/encoder_bundle.py)
+ENCODERS_DIR = os.path.join(os.path.dirname(__file__), 'encoders')
+MANIFEST_FILE = 'manifest.json'
+
+class BundleError(Exception):
+    """Raised when a model bundle is missing or fails its integrity check"""
+
+def enable_offline_mode():
+    """
+    Forbid HuggingFace hub access for this process
+
+    Must run before sentence_transformers / transformers are imported
+    (they read these variables at import time).
+    """
+    os.environ['HF_HUB_OFFLINE'] = '1'
+    os.environ['TRANSFORMERS_OFFLINE'] = '1'
+    os.environ['HF_DATASETS_OFFLINE'] = '1'
+
+def default_encoder_path(encoder_name):
+    return os.path.join(ENCODERS_DIR, encoder_name)
+
+def file_digests(path):
+    """sha256 of every file in a bundle (relative paths), manifest excluded"""
+    digests = {}
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            full_path = os.path.join(root, name)
+            relative = os.path.relpath(full_path, path).replace(os.sep, '/')
+            if relative == MANIFEST_FILE:
+                continue
+            digest = hashlib.sha256()
+            with open(full_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            digests[relative] = digest.hexdigest()
+    return digests
+
+def write_manifest(path, encoder_name):
+    """Record the bundle's files and hashes"""
+    manifest = {'encoder': encoder_name, 'files': file_digests(path)}
+    with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def verify_bundle(path, encoder_name=None):
+    """
+    Check a bundle against its manifest
+
+    Returns:
+        dict: The manifest
+
+    Raises:
+        BundleError: Missing manifest, wrong encoder, or any missing,
+            extra or modified file
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise BundleError(f'No model bundle at {path}')
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if encoder_name and manifest.get('encoder') != encoder_name:
+        raise BundleError(f"Bundle at {path} holds {manifest.get('encoder')}, expected {encoder_name}")
+
+    actual = file_digests(path)
+    expected = manifest.get('files', {})
+    missing = sorted(set(expected) - set(actual))
+    extra = sorted(set(actual) - set(expected))
+    modified = sorted(name for name in set(expected) & set(actual) if expected[name] != actual[name])
+
+    if missing or extra or modified:
+        raise BundleError(
+            f'Model bundle at {path} failed verification '
+            f'(missing: {missing}, extra: {extra}, modified: {modified})'
+        )
+
+    return manifest
+
+def resolve_encoder(encoder_name, path=None, offline=False):
+    """
+    What to pass to SentenceTransformer: a verified local bundle if there
+    is one, else the hub name (unless offline)
+
+    Raises:
+        BundleError: Bundle present but corrupt, or absent in offline mode
+    """
+    path = path or default_encoder_path(encoder_name)
+
+    if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        verify_bundle(path, encoder_name)
+        return path
+
+    if offline:
+        raise BundleError(
+            f'No model bundle at {path} and offline mode refuses to download '
+            f'(run scripts/encoder_bundle.py fetch)'
+        )
+
+    print(f"⚠️  No model bundle at {path}, downloading {encoder_name} from the HuggingFace hub")
+    return encoder_name
@@ -0,0 +1,292 @@
+import os
+import random
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from app.config import Config
+from app.ml_models.model_bundle import MANIFEST_FILE, verify_bundle
+
+# registry/<model>/<version>/ holds one version's artifacts; the ACTIVE and
+# CANDIDATE files name the version serving traffic and the one shadow-scored
+# (managed with scripts/model_registry.py)
+REGISTRY_DIR = os.path.join(os.path.dirname(__file__), 'registry')
+ACTIVE_POINTER = 'ACTIVE'
+CANDIDATE_POINTER = 'CANDIDATE'
+
+# Version label of models loaded from the pre-registry locations
+LEGACY_VERSION = 'legacy'
+
+def version_dir(model_name, version):
+    return os.path.join(REGISTRY_DIR, model_name, version)
+
+def list_versions(model_name):
+    """Version directories of a model, oldest first"""
+    model_dir = os.path.join(REGISTRY_DIR, model_name)
+    if not os.path.isdir(model_dir):
+        return []
+    versions = [name for name in os.listdir(model_dir) if os.path.isdir(os.path.join(model_dir, name))]
+    return sorted(versions, key=lambda name: os.path.getmtime(os.path.join(model_dir, name)))
+
+def load_version(model_name, version, loader, previous):
+    """Verify a version's manifest (if published with one), then load it"""
+    path = version_dir(model_name, version)
+    if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        verify_bundle(path)
+    return loader(path, previous)
+
+def read_pointer(model_name, pointer):
+    """Version named by a pointer file, or None"""
+    try:
+        with open(os.path.join(REGISTRY_DIR, model_name, pointer)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def write_pointer(model_name, pointer, version):
+    """Atomically point ACTIVE/CANDIDATE at a version (None removes it)"""
+    model_dir = os.path.join(REGISTRY_DIR, model_name)
+    path = os.path.join(model_dir, pointer)
+
+    if version is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+
+    if not os.path.isdir(version_dir(model_name, version)):
+        raise ValueError(f'Unknown {model_name} version: {version}')
+
+    fd, staging = tempfile.mkstemp(prefix=f'.{pointer}-', dir=model_dir)
+    with os.fdopen(fd, 'w') as f:
+        f.write(version + '\n')
+    os.replace(staging, path)
+
+class _LoadedVersion:
+    """One loaded version and the requests currently using it"""
+
+    def __init__(self, version, model):
+        self.version = version
+        self.model = model
+        self.in_flight = 0
+        self.retired = False
+        self.drained = threading.Event()
+
+class ModelRegistry:
+    """
+    Versioned model with background loading and atomic swaps
+
+    Requests take a lease (`with registry.lease() as model:`) and use that
+    model for the whole request. A per-process watcher polls the ACTIVE
+    pointer; a new version is loaded off the request path and swapped in
+    under a lock, so later leases get it while requests already holding
+    the old one finish on it (the old version is dropped once drained).
+
+    If a CANDIDATE is set and MODEL_SHADOW_SAMPLE_RATE > 0, a sample of
+    requests is re-scored on it in a background thread and compared with
+    the served output; the request never waits for it.
+    """
+
+    def __init__(self, name, loader, compare=None):
+        """
+        Args:
+            name: Registry folder (e.g. 'text')
+            loader: loader(path, previous) -> model; path is None for the
+                legacy location, previous is the model being replaced.
+                Raises if the version can't serve.
+            compare: compare(served, shadow) -> {check: agreement in [0, 1]}
+        """
+        self.name = name
+        self.loader = loader
+        self.compare = compare
+        self._lock = threading.Lock()
+        self._candidate = None
+        self._watcher_pid = None
+        self._shadow_executor = None
+        self._shadow_pending = 0
+        self._failed_versions = set()  # Not retried every poll; publish a new version instead
+        self.stats = {'swaps': 0, 'loadFailures': 0, 'drained': 0, 'shadowScored': 0, 'shadowSkipped': 0, 'shadowFailed': 0}
+        self.agreement = {}
+
+        version = read_pointer(name, ACTIVE_POINTER)
+        model = None
+        if version:
+            print(f"📦 Loading {name} model version {version}")
+            try:
+                model = load_version(name, version, loader, None)
+            except Exception as e:
+                # Keep the app booting on the legacy model; the version isn't retried
+                self.stats['loadFailures'] += 1
+                self._failed_versions.add(version)
+                print(f"❌ Failed to load {name} model version {version}, using the legacy model: {str(e)}")
+        if model is None:
+            version = LEGACY_VERSION
+            model = loader(None, None)
+        self._active = _LoadedVersion(version, model)
+
+    @property
+    def current(self):
+        """Active model, for one-off reads (requests should lease)"""
+        return self._active.model
+
+    @property
+    def version(self):
+        return self._active.version
+
+    @contextmanager
+    def lease(self):
+        """Pin the active version for the duration of a request"""
+        self._ensure_watcher()
+
+        with self._lock:
+            loaded = self._active
+            loaded.in_flight += 1
+        try:
+            yield loaded.model
+        finally:
+            with self._lock:
+                loaded.in_flight -= 1
+                if loaded.retired and loaded.in_flight == 0:
+                    loaded.drained.set()
+
+    def _ensure_watcher(self):
+        # One watcher per process, started lazily after gunicorn forks
+        if Config.MODEL_REGISTRY_POLL_SECONDS <= 0 or self._watcher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._watcher_pid = os.getpid()
+            self._shadow_executor = None
+            self._shadow_pending = 0
+        threading.Thread(target=self._watch, name=f'{self.name}-model-watcher', daemon=True).start()
+
+    def _watch(self):
+        while True:
+            time.sleep(Config.MODEL_REGISTRY_POLL_SECONDS)
+            try:
+                self.refresh()
+            except Exception:
+                traceback.print_exc()
+
+    def refresh(self):
+        """Apply pointer changes: swap ACTIVE, (un)load CANDIDATE"""
+        active = read_pointer(self.name, ACTIVE_POINTER)
+        if active and active != self._active.version and active not in self._failed_versions:
+            self._swap(active)
+
+        candidate = read_pointer(self.name, CANDIDATE_POINTER)
+        if candidate == self._active.version or candidate in self._failed_versions:
+            candidate = None
+        current_candidate = self._candidate.version if self._candidate else None
+        if candidate != current_candidate:
+            self._candidate = self._load(candidate) if candidate else None
+            self.agreement = {}
+
+    def _load(self, version):
+        """Load a version off the request path; None if it can't serve"""
+        started = time.monotonic()
+        print(f"📦 Loading {self.name} model version {version} in the background...")
+        try:
+            model = load_version(self.name, version, self.loader, self._active.model)
+        except Exception as e:
+            self.stats['loadFailures'] += 1
+            self._failed_versions.add(version)
+            print(f"❌ Failed to load {self.name} model version {version}: {str(e)}")
+            return None
+        print(f"✅ {self.name} model version {version} loaded in {time.monotonic() - started:.1f}s")
+        return _LoadedVersion(version, model)
+
+    def _swap(self, version):
+        if self._candidate and self._candidate.version == version:
+            loaded, self._candidate = self._candidate, None
+        else:
+            loaded = self._load(version)
+        if not loaded:
+            return
+
+        with self._lock:
+            previous = self._active
+            self._active = loaded
+            previous.retired = True
+            if previous.in_flight == 0:
+                previous.drained.set()
+
+        self.stats['swaps'] += 1
+        print(f"🔁 {self.name} model now serving version {version} (was {previous.version})")
+
+        # Requests already holding the old version finish on it
+        if previous.drained.wait(Config.MODEL_DRAIN_TIMEOUT_SECONDS):
+            self.stats['drained'] += 1
+            print(f"   {self.name} model version {previous.version} drained")
+        else:
+            print(f"⚠️  {self.name} model version {previous.version} still has {previous.in_flight} requests in flight")
+
+    def shadow(self, score, served):
+        """
+        Maybe re-score a request on the candidate, in the background
+
+        Args:
+            score: score(model) -> output comparable with `served`
+            served: Output returned to the client
+        """
+        candidate = self._candidate
+        if not candidate or not self.compare or random.random() >= Config.MODEL_SHADOW_SAMPLE_RATE:
+            return
+
+        with self._lock:
+            if self._shadow_pending >= Config.MODEL_SHADOW_MAX_PENDING:
+                self.stats['shadowSkipped'] += 1
+                return
+            self._shadow_pending += 1
+            if self._shadow_executor is None:
+                self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'{self.name}-shadow')
+            executor = self._shadow_executor
+
+        executor.submit(self._shadow_score, candidate, score, served)
+
+    def _shadow_score(self, candidate, score, served):
+        try:
+            started = time.monotonic()
+            checks = self.compare(served, score(candidate.model))
+            elapsed_ms = (time.monotonic() - started) * 1000
+
+            with self._lock:
+                stats = self.agreement.setdefault(candidate.version, {'samples': 0, 'totalMs': 0.0})
+                stats['samples'] += 1
+                stats['totalMs'] += elapsed_ms
+                for check, agreed in checks.items():
+                    stats[check] = stats.get(check, 0.0) + float(agreed)
+            self.stats['shadowScored'] += 1
+        except Exception as e:
+            self.stats['shadowFailed'] += 1
+            print(f"⚠️  Shadow scoring on {self.name} {candidate.version} failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._shadow_pending -= 1
+
+    def registry_stats(self):
+        """Versions, swap counters and candidate agreement, for metrics"""
+        with self._lock:
+            agreement = {
+                version: {
+                    'samples': stats['samples'],
+                    'avgMs': round(stats['totalMs'] / stats['samples'], 2) if stats['samples'] else 0.0,
+                    **{
+                        check: round(count / stats['samples'], 4)
+                        for check, count in stats.items() if check not in ('samples', 'totalMs')
+                    }
+                }
+                for version, stats in self.agreement.items()
+            }
+            in_flight = self._active.in_flight
+
+        return {
+            'active': self._active.version,
+            'candidate': self._candidate.version if self._candidate else None,
+            'inFlight': in_flight,
+            'available': list_versions(self.name),
+            **self.stats,
+            'agreement': agreement
+        }
@@ -1,18 +1,24 @@
+import hashlib
 import json
 import os
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder
 import pickle
+from app.ml_models.model_registry import ModelRegistry
+from app.utils.metrics import metrics
+
+MODEL_FILE = 'questionnaire_model.pkl'
 
 class QuestionnaireMLEnhancer:
     """Simple ML model to enhance questionnaire confidence scores"""
     
-    def __init__(self):
+    def __init__(self, model_path=None):
         self.model = None
         self.label_encoder = LabelEncoder()
         self.is_trained = False
-        self.model_path = os.path.join(os.path.dirname(__file__), 'questionnaire_model.pkl')
+        self.model_version = None
+        self.model_path = model_path or os.path.join(os.path.dirname(__file__), MODEL_FILE)
         
         # Try to load existing model
         self.load_model()
@@ -72,8 +78,10 @@ class QuestionnaireMLEnhancer:
             'label_encoder': self.label_encoder
         }
         
+        model_bytes = pickle.dumps(model_data)
         with open(self.model_path, 'wb') as f:
-            pickle.dump(model_data, f)
+            f.write(model_bytes)
+        self.model_version = hashlib.sha256(model_bytes).hexdigest()[:12]
         
         print(f"✅ Model saved to {self.model_path}")
     
@@ -82,11 +90,13 @@ class QuestionnaireMLEnhancer:
         if os.path.exists(self.model_path):
             try:
                 with open(self.model_path, 'rb') as f:
-                    model_data = pickle.load(f)
+                    model_bytes = f.read()
+                model_data = pickle.loads(model_bytes)
                 
                 self.model = model_data['model']
                 self.label_encoder = model_data['label_encoder']
                 self.is_trained = True
+                self.model_version = hashlib.sha256(model_bytes).hexdigest()[:12]
                 
                 print("✅ Loaded existing ML model")
                 return True
@@ -154,9 +164,22 @@ class QuestionnaireMLEnhancer:
             print(f"ML enhancement failed: {e}")
             return base_confidence
 
-# Global instance
-ml_enhancer = QuestionnaireMLEnhancer()
+def _load_questionnaire_model(model_dir, previous):
+    if model_dir:
+        enhancer = QuestionnaireMLEnhancer(os.path.join(model_dir, MODEL_FILE))
+        if not enhancer.is_trained:
+            raise Exception(f'No usable questionnaire model in {model_dir}')
+        return enhancer
+    
+    enhancer = QuestionnaireMLEnhancer()
+    
+    # Train on first import if not already trained
+    if not enhancer.is_trained:
+        enhancer.train()
+    
+    return enhancer
+
+# Global registry; requests use `with questionnaire_models.lease() as ml_enhancer:`
+questionnaire_models = ModelRegistry('questionnaire', _load_questionnaire_model)
 
-# Train on first import if not already trained
-if not ml_enhancer.is_trained:
-    ml_enhancer.train()
\ No newline at end of file
+metrics.register('questionnaire_model_registry', questionnaire_models.registry_stats)
\ No newline at end of file
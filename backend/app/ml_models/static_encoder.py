@@ -0,0 +1,102 @@
+import hashlib
+import os
+import re
+import unicodedata
+from functools import lru_cache
+import numpy as np
+
+# Files written by scripts/distill_static_encoder.py
+STATIC_ENCODER_DIR = 'static_encoder'
+VOCAB_FILE = 'vocab.txt'
+EMBEDDINGS_FILE = 'embeddings.npy'
+WEIGHTS_FILE = 'weights.npy'
+
+_PUNCTUATION = re.compile(r'(\W)', re.UNICODE)
+
+def static_encoder_name(path):
+    """Identity of a distilled table (changes whenever it is re-distilled)"""
+    digest = hashlib.sha256()
+    for name in (VOCAB_FILE, EMBEDDINGS_FILE, WEIGHTS_FILE):
+        with open(os.path.join(path, name), 'rb') as f:
+            digest.update(f.read())
+    return f'static-{digest.hexdigest()[:12]}'
+
+class StaticEncoder:
+    """
+    Static token-embedding encoder distilled from all-MiniLM-L6-v2
+
+    Every WordPiece token has a fixed vector (MiniLM's embedding of the
+    token on its own). A text is embedded as the weighted mean of its
+    tokens' vectors, with frequent tokens down-weighted, then L2-normalized
+    like MiniLM's output. No transformer forward pass: encoding is a table
+    lookup and a mean in NumPy.
+
+    Exposes the `encode` call TextMBTIClassifier uses on SentenceTransformer.
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, VOCAB_FILE), encoding='utf-8') as f:
+            tokens = [line.rstrip('\n') for line in f]
+
+        self.vocab = {token: index for index, token in enumerate(tokens)}
+        self.embeddings = np.load(os.path.join(path, EMBEDDINGS_FILE)).astype(np.float32)
+        self.weights = np.load(os.path.join(path, WEIGHTS_FILE)).astype(np.float32)
+        self.name = static_encoder_name(path)
+
+        # Most words repeat across texts; memoize their WordPiece split
+        self._word_ids = lru_cache(maxsize=100000)(self._wordpiece)
+
+    def tokenize(self, text):
+        """WordPiece token ids (uncased BERT rules; unknown words dropped)"""
+        text = unicodedata.normalize('NFD', text.lower())
+        text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
+
+        ids = []
+        for chunk in text.split():
+            for word in _PUNCTUATION.split(chunk):
+                if word:
+                    ids.extend(self._word_ids(word))
+        return ids
+
+    def _wordpiece(self, word):
+        """Greedy longest-match-first split of one word"""
+        if len(word) > 100:
+            return ()
+
+        ids = []
+        start = 0
+        while start < len(word):
+            end = len(word)
+            while end > start:
+                piece = word[start:end] if start == 0 else '##' + word[start:end]
+                if piece in self.vocab:
+                    ids.append(self.vocab[piece])
+                    break
+                end -= 1
+            else:
+                return ()  # [UNK]: contributes nothing
+            start = end
+        return tuple(ids)
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        """
+        Embed texts (batch_size is accepted for interface parity)
+
+        Returns:
+            np.ndarray: (len(texts), dimensions) float32, unit length
+        """
+        result = np.zeros((len(texts), self.embeddings.shape[1]), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            ids = self.tokenize(text)
+            if not ids:
+                continue
+            weights = self.weights[ids]
+            total = weights.sum()
+            if total <= 0:
+                continue
+            vector = weights @ self.embeddings[ids] / total
+            norm = np.linalg.norm(vector)
+            result[row] = vector / norm if norm > 0 else vector
+
+        return result
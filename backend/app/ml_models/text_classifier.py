@@ -1,169 +1,376 @@
-import pickle
 import numpy as np
 import os
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import CountVectorizer
+import threading
+from app.config import Config
+from app.ml_models.text_scoring import (
+    ENCODER_NAME, DIMENSIONS, load_artifacts, score_features,
+    linguistic_features, load_fast_tier, fast_tier_probabilities
+)
+from app.ml_models.static_encoder import StaticEncoder, STATIC_ENCODER_DIR
+from app.ml_models.model_bundle import enable_offline_mode, resolve_encoder
+from app.ml_models.model_registry import ModelRegistry
+from app.utils.metrics import metrics
 
 class TextMBTIClassifier:
-    """Text-based MBTI classifier using aggregated ensemble models"""
+    """
+    Text-based MBTI classifier using aggregated ensemble models
     
-    def __init__(self):
+    With TEXT_INFERENCE_MODE=cascade, a BERT-free fast tier (hashed n-grams
+    + linguistic features) scores every text first; the full ensemble only
+    runs for texts with a dimension inside the fast tier's uncertainty band.
+    The fast tier also answers alone (degraded mode) when the full model
+    failed to load.
+    
+    TEXT_ENCODER=static swaps MiniLM for a distilled static embedding table
+    (text_static/, ensembles retrained on its features) behind the same
+    encode() call.
+    
+    One instance is one model version; `text_models` (bottom) serves the
+    active one and hot-swaps it.
+    """
+    
+    DIMENSIONS = DIMENSIONS
+    
+    def __init__(self, model_dir=None, previous=None):
+        """
+        Args:
+            model_dir: Registry version directory; None for the legacy
+                text/ (or text_static/) location
+            previous: Model being replaced; its encoder is reused when the
+                new version was trained on the same one
+        """
         self.models = {}
         self.vectorizers = {}
         self.bert_model = None
+        self.fast_tier = None
+        self.encoder_name = None
+        self.model_version = None
+        self.features_version = None
         self.is_loaded = False
+        self._feature_names = {}
+        self._stats_lock = threading.Lock()
+        self.tier_stats = {'texts': 0, 'fastResolved': 0, 'fullTexts': 0, 'degraded': 0}
+        self.dimension_stats = {dim: {'fast': 0, 'full': 0} for dim in DIMENSIONS}
         
         # Try to load models
-        self.load_models()
+        self.load_models(model_dir, previous)
     
-    def load_models(self):
+    def load_models(self, model_dir=None, previous=None):
         """Load all trained models"""
+        base_dir = os.path.dirname(__file__)
+        if model_dir:
+            static = os.path.isdir(os.path.join(model_dir, STATIC_ENCODER_DIR))
+            fast_tier_dir = model_dir
+        else:
+            static = Config.TEXT_ENCODER == 'static'
+            model_dir = os.path.join(base_dir, 'text_static' if static else 'text')
+            fast_tier_dir = os.path.join(base_dir, 'text')
+        
+        print("Loading text classification models...")
+        
+        # Fast tier first: it is the fallback if the full model can't load
+        try:
+            self.fast_tier = load_fast_tier(fast_tier_dir)
+            if self.fast_tier:
+                print(f"  - Loaded fast tier (version {self.fast_tier['version']})")
+        except Exception as e:
+            print(f"⚠️  Failed to load fast tier: {str(e)}")
+            self.fast_tier = None
+        
         try:
-            model_dir = os.path.join(os.path.dirname(__file__), 'text')
-            
-            print("Loading text classification models...")
-            
-            # Load BERT model
-            print("  - Loading BERT model...")
-            self.bert_model = SentenceTransformer('all-MiniLM-L6-v2')
-            
             # Load 4 binary classifiers and vectorizers
-            dimensions = ['IE', 'NS', 'TF', 'JP']
+            # (versions hash the artifacts, so caches keyed on them invalidate themselves)
+            artifacts = load_artifacts(model_dir)
+            self.models = artifacts['models']
+            self.vectorizers = artifacts['vectorizers']
+            self.encoder_name = artifacts['encoderName']
+            self.model_version = artifacts['modelVersion']
+            self.features_version = artifacts['featureVersion']
+            print(f"  - Loaded {', '.join(self.models)} classifiers")
             
-            for dim in dimensions:
-                ensemble_path = os.path.join(model_dir, f'{dim}_aggregated_ensemble.pkl')
-                vectorizer_path = os.path.join(model_dir, f'{dim}_aggregated_vectorizer.pkl')
-                
-                with open(ensemble_path, 'rb') as f:
-                    self.models[dim] = pickle.load(f)
-                
-                with open(vectorizer_path, 'rb') as f:
-                    self.vectorizers[dim] = pickle.load(f)
-                
-                print(f"  - Loaded {dim} classifier")
+            if previous and previous.bert_model is not None and previous.encoder_name == self.encoder_name:
+                print("  - Reusing the loaded encoder")
+                self.bert_model = previous.bert_model
+            elif static:
+                print("  - Loading static encoder...")
+                self.bert_model = StaticEncoder(os.path.join(model_dir, STATIC_ENCODER_DIR))
+            else:
+                # Load BERT model from the verified local bundle (hub only if allowed)
+                print("  - Loading BERT model...")
+                if Config.MODEL_OFFLINE:
+                    enable_offline_mode()
+                encoder_source = resolve_encoder(ENCODER_NAME, Config.TEXT_ENCODER_PATH, Config.MODEL_OFFLINE)
+                from sentence_transformers import SentenceTransformer
+                self.bert_model = SentenceTransformer(encoder_source)
             
             self.is_loaded = True
-            print("✅ Text classification models loaded successfully!")
+            print(f"✅ Text classification models loaded successfully! (version {self.model_version})")
             
         except Exception as e:
             print(f"❌ Failed to load text models: {str(e)}")
             self.is_loaded = False
+            if self.fast_tier:
+                print("⚠️  Serving text predictions from the fast tier only (degraded mode)")
+    
+    def is_available(self):
+        """True if some tier can answer (full model or degraded fast tier)"""
+        return self.is_loaded or self.fast_tier is not None
+    
+    def cascading(self):
+        """True if the fast tier screens texts before the full model"""
+        return self.is_loaded and self.fast_tier is not None and Config.TEXT_INFERENCE_MODE == 'cascade'
+    
+    def inference_version(self):
+        """
+        Version of what actually produces outputs (model + tier setup)
+        
+        Used for cache keys and stored on predictions, so cascade or
+        degraded outputs never pass for full-model ones.
+        """
+        if not self.is_loaded:
+            return f"fast-{self.fast_tier['version']}" if self.fast_tier else None
+        if self.cascading():
+            return f"{self.model_version}+fast-{self.fast_tier['version']}"
+        return self.model_version
     
     def extract_linguistic_features(self, text):
         """Extract linguistic features from text"""
-        words = text.split()
-        sentences = text.split('.')
-        
-        features = {
-            'avg_word_length': np.mean([len(w) for w in words]) if words else 0,
-            'avg_sentence_length': np.mean([len(s.split()) for s in sentences]) if sentences else 0,
-            'num_words': len(words),
-            'num_sentences': len(sentences),
-            'num_chars': len(text),
-            
-            # Punctuation
-            'exclamation_ratio': text.count('!') / max(len(words), 1),
-            'question_ratio': text.count('?') / max(len(words), 1),
-            'comma_ratio': text.count(',') / max(len(words), 1),
-            'ellipsis_ratio': text.count('...') / max(len(words), 1),
-            
-            # Capitalization
-            'uppercase_ratio': sum(1 for c in text if c.isupper()) / max(len(text), 1),
-            'title_case_words': sum(1 for w in words if w.istitle()) / max(len(words), 1),
-            
-            # Personal pronouns
-            'i_count': text.lower().count(' i ') / max(len(words), 1),
-            'we_count': text.lower().count(' we ') / max(len(words), 1),
-            'you_count': text.lower().count(' you ') / max(len(words), 1),
-            
-            # Emotional words
-            'positive_words': sum(1 for w in ['good', 'great', 'happy', 'love', 'like', 'best', 'amazing', 'wonderful'] if w in text.lower()) / max(len(words), 1),
-            'negative_words': sum(1 for w in ['bad', 'hate', 'worst', 'never', 'no', 'not', 'terrible', 'awful'] if w in text.lower()) / max(len(words), 1),
-            
-            # Thinking words
-            'think_words': sum(1 for w in ['think', 'believe', 'feel', 'know', 'understand', 'realize', 'consider'] if w in text.lower()) / max(len(words), 1),
-            
-            # Social words
-            'social_words': sum(1 for w in ['friend', 'people', 'together', 'meet', 'party', 'group', 'social'] if w in text.lower()) / max(len(words), 1),
-            
-            # Planning words
-            'plan_words': sum(1 for w in ['plan', 'schedule', 'organize', 'prepare', 'ready', 'structured'] if w in text.lower()) / max(len(words), 1),
-            
-            # Abstract words
-            'abstract_words': sum(1 for w in ['idea', 'theory', 'concept', 'possibility', 'future', 'potential', 'vision'] if w in text.lower()) / max(len(words), 1),
-        }
-        
-        return np.array(list(features.values())).reshape(1, -1)
+        return linguistic_features(text)
     
-    def predict(self, text):
+    def predict(self, text, include_keywords=True):
         """
         Predict MBTI type from text
         
         Args:
             text: Input text (minimum 500 characters recommended)
+            include_keywords: False skips keyword extraction (keywords is None)
         
         Returns:
             tuple: (mbti_type, confidence_dict, keywords)
         """
-        if not self.is_loaded:
+        return self.predict_batch([text], include_keywords=include_keywords)[0]
+    
+    def predict_batch(self, texts, batch_size=32, return_features=False, include_keywords=True):
+        """
+        Predict MBTI types for many texts in one pass
+        
+        BERT encodes all texts in batches and each dimension's classifier
+        scores the whole feature matrix at once, instead of one row per call.
+        When cascading (or degraded), only texts the fast tier is unsure
+        about reach BERT.
+        
+        Args:
+            texts: List of input texts (each at least 100 characters)
+            batch_size: BERT encoding batch size
+            return_features: Also return each text's model inputs
+                ({embedding, linguistic, counts}) so they can be stored;
+                None for texts the fast tier resolved (no embedding)
+            include_keywords: False skips keyword extraction (keywords is
+                None), and word counts are only computed for texts that
+                reach the full model
+        
+        Returns:
+            list: (mbti_type, confidence_dict, keywords[, features]) per text, in order
+        """
+        if not self.is_available():
             raise Exception("Models not loaded")
         
-        if len(text) < 100:
+        if any(len(text) < 100 for text in texts):
             raise ValueError("Text too short. Minimum 100 characters required.")
         
+        if not texts:
+            return []
+        
         # Extract features
-        bert_features = self.bert_model.encode([text])
-        linguistic_features = self.extract_linguistic_features(text)
+        linguistic_features = np.vstack([self.extract_linguistic_features(text) for text in texts])
         
-        # Predict each dimension
-        mbti_letters = []
-        confidence_scores = {}
-        dimension_map = {
-            'IE': ('I', 'E'),
-            'NS': ('N', 'S'),
-            'TF': ('T', 'F'),
-            'JP': ('J', 'P')
-        }
+        # {dim: (letter, confidence)} per text; filled by the fast tier, then BERT
+        letters = [{} for _ in texts]
+        full_dims = [list(self.DIMENSIONS) for _ in texts]
         
-        for dim, letters in dimension_map.items():
-            # Get CountVectorizer features
-            count_features = self.vectorizers[dim].transform([text]).toarray()
+        if self.fast_tier and (self.cascading() or not self.is_loaded):
+            probabilities = fast_tier_probabilities(self.fast_tier, texts, linguistic_features)
+            full_dims = [[] for _ in texts]
             
-            # Combine all features
-            combined_features = np.hstack([bert_features, count_features, linguistic_features])
-            
-            # Predict
-            prediction = self.models[dim].predict(combined_features)[0]
+            for dim, dim_probabilities in probabilities.items():
+                low, high = self.fast_tier['dimensions'][dim]['band']
+                for i, probability in enumerate(dim_probabilities):
+                    letters[i][dim] = self._fast_letter(dim, probability)
+                    # Inside the band: let the full model decide (unless degraded)
+                    if self.is_loaded and low < probability < high:
+                        full_dims[i].append(dim)
+        
+        full_rows = [i for i, dims in enumerate(full_dims) if dims]
+        bert_features = {}
+        
+        # Get CountVectorizer features (full-model inputs and keyword source)
+        count_rows = list(range(len(texts))) if include_keywords else full_rows
+        count_position = {i: position for position, i in enumerate(count_rows)}
+        count_features = {
+            dim: self.vectorizers[dim].transform([texts[i] for i in count_rows]).toarray()
+            for dim in self.vectorizers
+        } if count_rows else {}
+        
+        if full_rows:
+            embeddings = self.bert_model.encode([texts[i] for i in full_rows], batch_size=batch_size)
+            scores = self._score(
+                embeddings,
+                {dim: rows[[count_position[i] for i in full_rows]] for dim, rows in count_features.items()},
+                linguistic_features[full_rows]
+            )
+            for position, (i, (mbti_type, confidence)) in enumerate(zip(full_rows, scores)):
+                bert_features[i] = embeddings[position]
+                for index, dim in enumerate(self.DIMENSIONS):
+                    if dim in full_dims[i]:
+                        letters[i][dim] = (mbti_type[index], confidence[dim])
+        
+        self._record_tiers(full_dims, degraded=not self.is_loaded)
+        
+        results = []
+        for i, text_letters in enumerate(letters):
+            mbti_type = ''.join(text_letters[dim][0] for dim in self.DIMENSIONS)
+            confidence = {dim: text_letters[dim][1] for dim in self.DIMENSIONS}
+            counts = {dim: rows[count_position[i]] for dim, rows in count_features.items()} if i in count_position else {}
             
-            # Get probability
-            if hasattr(self.models[dim], 'predict_proba'):
-                proba = self.models[dim].predict_proba(combined_features)[0]
-                confidence = float(proba[prediction])
+            # Extract keywords (top features from CountVectorizer)
+            if include_keywords:
+                keywords = self.keywords_from_counts(counts) if counts else []
             else:
-                confidence = 0.75  # Default if no probability available
+                keywords = None
+            result = (mbti_type, confidence, keywords)
             
-            # Determine letter
-            predicted_letter = letters[1] if prediction == 1 else letters[0]
-            mbti_letters.append(predicted_letter)
+            if return_features:
+                result += ({
+                    'embedding': bert_features[i],
+                    'linguistic': linguistic_features[i],
+                    'counts': counts
+                } if i in bert_features else None,)
             
-            confidence_scores[dim] = round(confidence, 2)
+            results.append(result)
+        
+        return results
+    
+    def _fast_letter(self, dim, probability):
+        """Letter + confidence from the fast tier's second-letter probability"""
+        first, second = self.DIMENSIONS[dim]
+        if probability >= 0.5:
+            return second, round(float(probability), 2)
+        return first, round(float(1 - probability), 2)
+    
+    def _record_tiers(self, full_dims, degraded):
+        with self._stats_lock:
+            self.tier_stats['texts'] += len(full_dims)
+            for dims in full_dims:
+                if degraded:
+                    self.tier_stats['degraded'] += 1
+                elif dims:
+                    self.tier_stats['fullTexts'] += 1
+                else:
+                    self.tier_stats['fastResolved'] += 1
+                for dim in self.DIMENSIONS:
+                    self.dimension_stats[dim]['full' if dim in dims else 'fast'] += 1
+    
+    def inference_stats(self):
+        """Share of texts/dimensions resolved at each tier, for metrics"""
+        with self._stats_lock:
+            stats = dict(self.tier_stats)
+            dimensions = {dim: dict(counts) for dim, counts in self.dimension_stats.items()}
+        total = stats['texts']
+        return {
+            'mode': 'degraded' if not self.is_loaded else ('cascade' if self.cascading() else 'full'),
+            'version': self.inference_version(),
+            **stats,
+            'fastShare': round((stats['fastResolved'] + stats['degraded']) / total, 4) if total else 0.0,
+            'dimensions': {
+                dim: {**counts, 'fastShare': round(counts['fast'] / total, 4) if total else 0.0}
+                for dim, counts in dimensions.items()
+            }
+        }
+    
+    def _score(self, bert_features, count_features, linguistic_features):
+        """
+        Run the four dimension classifiers over prepared feature rows
+        
+        Returns:
+            list: (mbti_type, confidence_dict) per row
+        """
+        return score_features(self.models, bert_features, count_features, linguistic_features)
+    
+    def feature_version(self):
+        """Identifies the encoder + vocabularies that produced stored features"""
+        return self.features_version
+    
+    def encode_units(self, texts, batch_size=32):
+        """
+        Per-text features that can be pooled later (e.g. one row per tweet)
         
-        mbti_type = ''.join(mbti_letters)
+        Returns:
+            tuple: (embeddings (n, dim) float32, {dimension: sparse count rows})
+        """
+        embeddings = self.bert_model.encode(texts, batch_size=batch_size)
+        counts = {dim: self.vectorizers[dim].transform(texts) for dim in self.DIMENSIONS}
+        return np.asarray(embeddings, dtype=np.float32), counts
+    
+    def predict_from_features(self, embedding, counts, text, return_features=False, include_keywords=True):
+        """
+        Predict from pooled features instead of re-encoding the text
         
-        # Extract keywords (top features from CountVectorizer)
-        keywords = self._extract_keywords(text)
+        Args:
+            embedding: Mean-pooled BERT embedding (1-D)
+            counts: {dimension: 1-D count vector}, summed over the units
+            text: Combined text (for the cheap linguistic features)
+            return_features: Also return the model inputs, as predict_batch does
+            include_keywords: False skips keyword extraction (keywords is None)
+        
+        Returns:
+            tuple: (mbti_type, confidence_dict, keywords[, features])
+        """
+        if not self.is_loaded:
+            raise Exception("Models not loaded")
         
-        return mbti_type, confidence_scores, keywords
+        linguistic_features = self.extract_linguistic_features(text)
+        
+        mbti_type, confidence = self._score(
+            np.asarray(embedding, dtype=np.float32).reshape(1, -1),
+            {dim: np.asarray(counts[dim]).reshape(1, -1) for dim in self.DIMENSIONS},
+            linguistic_features
+        )[0]
+        
+        result = (mbti_type, confidence, self.keywords_from_counts(counts) if include_keywords else None)
+        
+        if return_features:
+            result += ({
+                'embedding': embedding,
+                'linguistic': linguistic_features[0],
+                'counts': counts
+            },)
+        
+        return result
     
-    def _extract_keywords(self, text):
+    def vocab_sizes(self):
+        """{dimension: vocabulary size}, to decode stored count vectors"""
+        return {dim: len(vectorizer.vocabulary_) for dim, vectorizer in self.vectorizers.items()}
+    
+    def extract_keywords(self, text):
         """Extract top keywords that influenced prediction"""
+        if not self.vectorizers:
+            return []
+        return self.keywords_from_counts({
+            dim: self.vectorizers[dim].transform([text]).toarray()[0]
+            for dim in self.DIMENSIONS
+        })
+    
+    def keywords_from_counts(self, counts):
+        """Top keywords from per-dimension count vectors"""
         keywords = []
         
         # Get words from each dimension's vectorizer
         for dim in ['IE', 'NS', 'TF', 'JP']:
-            vectorizer = self.vectorizers[dim]
-            features = vectorizer.transform([text]).toarray()[0]
-            feature_names = vectorizer.get_feature_names_out()
+            features = np.asarray(counts[dim]).ravel()
+            # Building the name array is O(vocabulary); do it once per model
+            if dim not in self._feature_names:
+                self._feature_names[dim] = self.vectorizers[dim].get_feature_names_out()
+            feature_names = self._feature_names[dim]
             
             # Get top 5 features for this dimension
             top_indices = features.argsort()[-5:][::-1]
@@ -175,5 +382,23 @@ class TextMBTIClassifier:
         
         return keywords
 
-# Global instance
-text_classifier = TextMBTIClassifier()
\ No newline at end of file
+def _load_text_model(model_dir, previous):
+    model = TextMBTIClassifier(model_dir, previous)
+    # A published version must load fully; degraded (fast tier only) is for the legacy fallback
+    if model_dir and not model.is_loaded:
+        raise Exception(f'Full text model failed to load from {model_dir}')
+    return model
+
+def _agreement(served, shadow):
+    """Share of texts where the candidate matches the served type / letters"""
+    pairs = [(s[0], c[0]) for s, c in zip(served, shadow)]
+    checks = {'type': np.mean([s == c for s, c in pairs])}
+    for index, dim in enumerate(DIMENSIONS):
+        checks[dim] = np.mean([s[index] == c[index] for s, c in pairs])
+    return checks
+
+# Global registry; requests use `with text_models.lease() as text_classifier:`
+text_models = ModelRegistry('text', _load_text_model, compare=_agreement)
+
+metrics.register('text_inference', lambda: text_models.current.inference_stats())
+metrics.register('text_model_registry', text_models.registry_stats)
\ No newline at end of file
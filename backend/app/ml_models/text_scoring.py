@@ -0,0 +1,193 @@
+import hashlib
+import os
+import pickle
+import numpy as np
+from scipy.sparse import hstack, csr_matrix
+from app.ml_models.static_encoder import STATIC_ENCODER_DIR, static_encoder_name
+
+# Encoder and classifier artifacts, kept free of the encoder itself so
+# offline jobs (e.g. scripts/rescore_predictions.py) can score stored
+# features without loading BERT.
+
+ENCODER_NAME = 'all-MiniLM-L6-v2'
+
+# BERT-free first tier (see scripts/train_fast_tier.py)
+FAST_TIER_FILE = 'fast_tier.pkl'
+
+DIMENSIONS = {
+    'IE': ('I', 'E'),
+    'NS': ('N', 'S'),
+    'TF': ('T', 'F'),
+    'JP': ('J', 'P')
+}
+
+def encoder_name(model_dir):
+    """Encoder the ensembles in `model_dir` were trained on"""
+    static_dir = os.path.join(model_dir, STATIC_ENCODER_DIR)
+    if os.path.isdir(static_dir):
+        return static_encoder_name(static_dir)
+    return ENCODER_NAME
+
+def load_artifacts(model_dir):
+    """
+    Load the per-dimension ensembles and vectorizers from a model directory
+
+    Returns:
+        dict: {models, vectorizers, encoderName, modelVersion, featureVersion}
+            modelVersion hashes every artifact (changes with any retrain);
+            featureVersion hashes the encoder name + vectorizers only, i.e.
+            what stored features depend on.
+    """
+    models = {}
+    vectorizers = {}
+    encoder = encoder_name(model_dir)
+    model_digest = hashlib.sha256(encoder.encode('utf-8'))
+    feature_digest = hashlib.sha256(encoder.encode('utf-8'))
+
+    for dim in DIMENSIONS:
+        ensemble_path = os.path.join(model_dir, f'{dim}_aggregated_ensemble.pkl')
+        vectorizer_path = os.path.join(model_dir, f'{dim}_aggregated_vectorizer.pkl')
+
+        with open(ensemble_path, 'rb') as f:
+            ensemble_bytes = f.read()
+            models[dim] = pickle.loads(ensemble_bytes)
+
+        with open(vectorizer_path, 'rb') as f:
+            vectorizer_bytes = f.read()
+            vectorizers[dim] = pickle.loads(vectorizer_bytes)
+
+        model_digest.update(ensemble_bytes)
+        model_digest.update(vectorizer_bytes)
+        feature_digest.update(vectorizer_bytes)
+
+    return {
+        'models': models,
+        'vectorizers': vectorizers,
+        'encoderName': encoder,
+        'modelVersion': model_digest.hexdigest()[:12],
+        'featureVersion': feature_digest.hexdigest()[:12]
+    }
+
+def score_features(models, bert_features, count_features, linguistic_features):
+    """
+    Run the four dimension classifiers over prepared feature rows
+
+    Args:
+        models: {dimension: classifier}
+        bert_features: (n, d) sentence embeddings
+        count_features: {dimension: (n, vocab) dense counts}
+        linguistic_features: (n, 20) linguistic features
+
+    Returns:
+        list: (mbti_type, confidence_dict) per row
+    """
+    rows = bert_features.shape[0]
+    mbti_letters = [[] for _ in range(rows)]
+    confidence_scores = [{} for _ in range(rows)]
+
+    for dim, letters in DIMENSIONS.items():
+        # Combine all features
+        combined_features = np.hstack([bert_features, count_features[dim], linguistic_features])
+
+        # Predict
+        predictions = models[dim].predict(combined_features)
+
+        # Get probability
+        if hasattr(models[dim], 'predict_proba'):
+            probas = models[dim].predict_proba(combined_features)
+            confidences = [float(proba[pred]) for proba, pred in zip(probas, predictions)]
+        else:
+            confidences = [0.75] * rows  # Default if no probability available
+
+        for i, (prediction, confidence) in enumerate(zip(predictions, confidences)):
+            # Determine letter
+            mbti_letters[i].append(letters[1] if prediction == 1 else letters[0])
+            confidence_scores[i][dim] = round(confidence, 2)
+
+    return [(''.join(mbti_letters[i]), confidence_scores[i]) for i in range(rows)]
+
+def linguistic_features(text):
+    """Extract linguistic features from text"""
+    words = text.split()
+    sentences = text.split('.')
+    
+    features = {
+        'avg_word_length': np.mean([len(w) for w in words]) if words else 0,
+        'avg_sentence_length': np.mean([len(s.split()) for s in sentences]) if sentences else 0,
+        'num_words': len(words),
+        'num_sentences': len(sentences),
+        'num_chars': len(text),
+        
+        # Punctuation
+        'exclamation_ratio': text.count('!') / max(len(words), 1),
+        'question_ratio': text.count('?') / max(len(words), 1),
+        'comma_ratio': text.count(',') / max(len(words), 1),
+        'ellipsis_ratio': text.count('...') / max(len(words), 1),
+        
+        # Capitalization
+        'uppercase_ratio': sum(1 for c in text if c.isupper()) / max(len(text), 1),
+        'title_case_words': sum(1 for w in words if w.istitle()) / max(len(words), 1),
+        
+        # Personal pronouns
+        'i_count': text.lower().count(' i ') / max(len(words), 1),
+        'we_count': text.lower().count(' we ') / max(len(words), 1),
+        'you_count': text.lower().count(' you ') / max(len(words), 1),
+        
+        # Emotional words
+        'positive_words': sum(1 for w in ['good', 'great', 'happy', 'love', 'like', 'best', 'amazing', 'wonderful'] if w in text.lower()) / max(len(words), 1),
+        'negative_words': sum(1 for w in ['bad', 'hate', 'worst', 'never', 'no', 'not', 'terrible', 'awful'] if w in text.lower()) / max(len(words), 1),
+        
+        # Thinking words
+        'think_words': sum(1 for w in ['think', 'believe', 'feel', 'know', 'understand', 'realize', 'consider'] if w in text.lower()) / max(len(words), 1),
+        
+        # Social words
+        'social_words': sum(1 for w in ['friend', 'people', 'together', 'meet', 'party', 'group', 'social'] if w in text.lower()) / max(len(words), 1),
+        
+        # Planning words
+        'plan_words': sum(1 for w in ['plan', 'schedule', 'organize', 'prepare', 'ready', 'structured'] if w in text.lower()) / max(len(words), 1),
+        
+        # Abstract words
+        'abstract_words': sum(1 for w in ['idea', 'theory', 'concept', 'possibility', 'future', 'potential', 'vision'] if w in text.lower()) / max(len(words), 1),
+    }
+    
+    return np.array(list(features.values())).reshape(1, -1)
+
+def load_fast_tier(model_dir):
+    """
+    Load the fast tier, if it has been trained
+
+    Returns:
+        dict: {version, dimensions: {dim: {vectorizer, scaler, model, band}}}, or None
+    """
+    path = os.path.join(model_dir, FAST_TIER_FILE)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as f:
+        fast_tier_bytes = f.read()
+
+    fast_tier = pickle.loads(fast_tier_bytes)
+    fast_tier['version'] = hashlib.sha256(fast_tier_bytes).hexdigest()[:12]
+    return fast_tier
+
+def fast_tier_features(fast_tier_dim, texts, linguistic):
+    """Hashed n-gram counts + scaled linguistic features for one dimension"""
+    return hstack([
+        fast_tier_dim['vectorizer'].transform(texts),
+        csr_matrix(fast_tier_dim['scaler'].transform(linguistic))
+    ]).tocsr()
+
+def fast_tier_probabilities(fast_tier, texts, linguistic):
+    """
+    Fast-tier probability of each dimension's second letter
+
+    Args:
+        linguistic: (n, 20) linguistic features of `texts`
+
+    Returns:
+        dict: {dimension: (n,) probabilities}
+    """
+    return {
+        dim: entry['model'].predict_proba(fast_tier_features(entry, texts, linguistic))[:, 1]
+        for dim, entry in fast_tier['dimensions'].items()
+    }
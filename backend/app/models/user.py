@@ -1,6 +1,6 @@
 from datetime import datetime
 from bson import ObjectId
-import bcrypt
+from app.utils.password_hasher import password_hasher, HasherSaturated
 
 class User:
     """User model for authentication"""
@@ -15,18 +15,24 @@ class User:
     
     @staticmethod
     def hash_password(password):
-        """Hash password using bcrypt"""
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        """Hash password using bcrypt (on the bounded hasher pool)"""
+        return password_hasher.hash(password)
     
     @staticmethod
     def verify_password(password, hashed):
         """Verify password against hash"""
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+            return password_hasher.verify(password, hashed)
+        except HasherSaturated:
+            raise
         except Exception:
             return False
     
+    @staticmethod
+    def needs_rehash(hashed):
+        """True if the hash was made with a different work factor than configured"""
+        return password_hasher.needs_rehash(hashed)
+    
     def to_dict(self):
         """Convert user to dictionary for MongoDB"""
         return {
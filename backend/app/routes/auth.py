@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.services.auth_service import AuthService
+from app.utils.password_hasher import HasherSaturated
 from app.utils.validators import validate_email, validate_password, validate_name
 
 # Create blueprint
@@ -50,6 +51,9 @@ def signup():
         
         return jsonify(result), 201
         
+    except HasherSaturated:
+        return jsonify({'error': 'Server busy, please try again shortly'}), 503, {'Retry-After': '2'}
+        
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
@@ -81,6 +85,9 @@ def login():
         
         return jsonify(result), 200
         
+    except HasherSaturated:
+        return jsonify({'error': 'Server busy, please try again shortly'}), 503, {'Retry-After': '2'}
+        
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
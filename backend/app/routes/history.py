@@ -0,0 +1,38 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import db
+from app.services.history_service import HistoryService
+
+bp = Blueprint('history', __name__, url_prefix='/api/history')
+
+# Initialize services
+history_service = HistoryService(db)
+
+@bp.route('', methods=['GET'])
+@jwt_required()
+def get_history():
+    """
+    Get the user's combined history across questionnaire, text and Twitter
+    
+    Query params:
+        limit: Page size (default 20, max 100)
+        cursor: nextCursor from the previous page
+        modules: Comma-separated subset, e.g. "text,twitter"
+    """
+    try:
+        user_id = get_jwt_identity()
+        
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        modules = request.args.get('modules')
+        modules = [m.strip() for m in modules.split(',') if m.strip()] if modules else None
+        
+        page, error = history_service.get_history(user_id, limit, cursor, modules)
+        
+        if error:
+            return jsonify({'error': error}), 400
+        
+        return jsonify(page), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to load history: {str(e)}'}), 500
\ No newline at end of file
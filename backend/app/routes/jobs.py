@@ -0,0 +1,51 @@
+from flask import Blueprint, Response, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, get_jwt_request_location
+from app.services.job_service import job_service, job_links, EVENTS_TOKEN_SCOPE
+
+bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+@bp.route('/<id>', methods=['GET'])
+@jwt_required()
+def get_job(id):
+    """Get status (and result once done) of an analysis job, with a fresh eventsUrl"""
+    try:
+        user_id = get_jwt_identity()
+        
+        job = job_service.get_job(id, user_id)
+        
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify(job_links(job, user_id)), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to load job: {str(e)}'}), 500
+
+@bp.route('/<id>/events', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_job(id):
+    """
+    Server-sent events for an analysis job
+    
+    Emits one event per stage (queued, fetching, analyzing, saving) and a
+    final done/failed event carrying the job; then the stream closes.
+    Streams end after JOB_STREAM_TIMEOUT_SECONDS and EventSource reconnects.
+    
+    Browsers pass ?token= from the job's eventsUrl (short-lived, scoped to
+    this job); other clients can use the Authorization header.
+    """
+    if get_jwt_request_location() == 'query_string':
+        claims = get_jwt()
+        if claims.get('scope') != EVENTS_TOKEN_SCOPE or claims.get('jobId') != id:
+            return jsonify({'error': 'Use the token from this job\'s eventsUrl'}), 403
+    
+    user_id = get_jwt_identity()
+    
+    if not job_service.get_job(id, user_id):
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return Response(
+        stream_with_context(job_service.stream_events(id, user_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
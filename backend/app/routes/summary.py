@@ -0,0 +1,34 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import db
+from app.services.summary_service import SummaryService
+from app.services.mbti_service import MBTIService
+
+bp = Blueprint('summary', __name__, url_prefix='/api/summary')
+
+# Initialize services
+summary_service = SummaryService(db)
+mbti_service = MBTIService()
+
+@bp.route('', methods=['GET'])
+@jwt_required()
+def get_summary():
+    """Get user's latest result per module and the fused overall type"""
+    try:
+        user_id = get_jwt_identity()
+        
+        summary = summary_service.get_summary(user_id)
+        
+        if not summary or not summary.get('overall'):
+            return jsonify({'message': 'No results found'}), 404
+        
+        # Get insights for the fused type
+        insights = mbti_service.get_insights(summary['overall']['mbtiType'])
+        
+        return jsonify({
+            'summary': summary,
+            'insights': insights
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to load summary: {str(e)}'}), 500
\ No newline at end of file
@@ -3,6 +3,10 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.services.text_service import TextService
 from app.services.mbti_service import MBTIService
+from app.config import Config
+from app.services.job_service import job_service, JobQueueFull, wants_async, job_links
+from app.utils.fields import requested_fields, select_fields
+from app.utils.admission import prediction_admission, AdmissionRejected
 
 bp = Blueprint('text', __name__, url_prefix='/api/text')
 
@@ -18,31 +22,61 @@ def predict():
     
     Expected JSON:
     {
-        "text": "Your text here..."
+        "text": "Your text here...",
+        "async": false,     (optional: true -> 202 with a job to poll)
+        "fields": "type,confidence"   (optional, default all: type,
+                                       confidence, keywords, insights)
     }
+    
+    Texts of TEXT_ASYNC_MIN_LENGTH+ characters run as a job by default.
+    Outputs left out of `fields` are not computed; keywords can be fetched
+    later from /result/<id>.
+    
+    Rate limited per user (429); synchronous predictions wait for an
+    admission slot and get 503 + Retry-After when the worker is saturated.
     """
     try:
         user_id = get_jwt_identity()
         data = request.get_json()
         
         text = data.get('text', '').strip()
+        fields = requested_fields(data.get('fields', request.args.get('fields')))
+        include_keywords = 'keywords' in fields
         
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
+        prediction_admission.check_rate(user_id)
+        
+        long_text = Config.TEXT_ASYNC_MIN_LENGTH > 0 and len(text) >= Config.TEXT_ASYNC_MIN_LENGTH
+        
+        if wants_async(data.get('async', request.args.get('async')), default=long_text):
+            def run(progress):
+                result, error = text_service.predict(text, user_id, progress, include_keywords)
+                if error:
+                    return None, error
+                return _with_insights(result, fields), None
+            
+            job = job_service.submit(user_id, 'text', run, params={'textLength': len(text)})
+            return jsonify(job_links(job, user_id)), 202, {'Location': f"/api/jobs/{job['jobId']}"}
+        
         # Predict
-        result, error = text_service.predict(text, user_id)
+        with prediction_admission.slot():
+            result, error = text_service.predict(text, user_id, include_keywords=include_keywords)
         
         if error:
             return jsonify({'error': error}), 400
         
-        # Get insights
-        insights = mbti_service.get_insights(result['mbtiType'])
+        return jsonify(_with_insights(result, fields)), 201
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+        
+    except AdmissionRejected as e:
+        return jsonify({'error': str(e)}), e.status, {'Retry-After': str(e.retry_after)}
         
-        return jsonify({
-            **result,
-            'insights': insights
-        }), 201
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
         
     except Exception as e:
         return jsonify({'error': f'Prediction failed: {str(e)}'}), 500
@@ -50,22 +84,20 @@ def predict():
 @bp.route('/results', methods=['GET'])
 @jwt_required()
 def get_results():
-    """Get user's latest text prediction"""
+    """Get user's latest text prediction (?fields= as for /result/<id>)"""
     try:
         user_id = get_jwt_identity()
+        fields = requested_fields(request.args.get('fields'))
         
         prediction = text_service.get_latest_prediction(user_id)
         
         if not prediction:
             return jsonify({'message': 'No results found'}), 404
         
-        # Get insights
-        insights = mbti_service.get_insights(prediction['mbtiType'])
+        return jsonify(_stored_result(prediction, fields)), 200
         
-        return jsonify({
-            'prediction': prediction,
-            'insights': insights
-        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
         
     except Exception as e:
         return jsonify({'error': f'Failed to load results: {str(e)}'}), 500
@@ -73,22 +105,25 @@ def get_results():
 @bp.route('/result/<id>', methods=['GET'])
 @jwt_required()
 def get_result_by_id(id):
-    """Get specific result by ID"""
+    """
+    Get specific result by ID
+    
+    ?fields= selects outputs as on /predict (default all). Keywords skipped
+    at prediction time are computed now and stored on the prediction.
+    """
     try:
         user_id = get_jwt_identity()
+        fields = requested_fields(request.args.get('fields'))
         
         prediction = text_service.get_prediction_by_id(id, user_id)
         
         if not prediction:
             return jsonify({'error': 'Result not found'}), 404
         
-        # Get insights
-        insights = mbti_service.get_insights(prediction['mbtiType'])
+        return jsonify(_stored_result(prediction, fields)), 200
         
-        return jsonify({
-            'prediction': prediction,
-            'insights': insights
-        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
         
     except Exception as e:
         return jsonify({'error': f'Failed to load result: {str(e)}'}), 500
@@ -104,4 +139,20 @@ def get_history():
         return jsonify({'predictions': predictions}), 200
         
     except Exception as e:
-        return jsonify({'error': f'Failed to load history: {str(e)}'}), 500
\ No newline at end of file
+        return jsonify({'error': f'Failed to load history: {str(e)}'}), 500
+
+def _with_insights(result, fields):
+    """Prediction response with only the requested optional outputs"""
+    if 'insights' in fields:
+        result = {**result, 'insights': mbti_service.get_insights(result['mbtiType'])}
+    return select_fields(result, fields)
+
+def _stored_result(prediction, fields):
+    """{prediction, insights} for a stored prediction, computing missing keywords if requested"""
+    if 'keywords' in fields:
+        prediction = text_service.fill_keywords(prediction)
+    
+    response = {'prediction': prediction}
+    if 'insights' in fields:
+        response['insights'] = mbti_service.get_insights(prediction['mbtiType'])
+    return response
\ No newline at end of file
@@ -4,6 +4,10 @@ from app import db
 from app.services.twitter_service import TwitterService
 from app.services.mbti_service import MBTIService
 from app.services.twitter_hybrid_service import TwitterHybridService
+from app.config import Config
+from app.services.job_service import job_service, JobQueueFull, wants_async, job_links
+from app.utils.fields import requested_fields, select_fields
+from app.utils.admission import prediction_admission, AdmissionRejected
 
 
 bp = Blueprint('twitter', __name__, url_prefix='/api/twitter')
@@ -21,54 +25,133 @@ def analyze():
     
     Expected JSON:
     {
-        "username": "elonmusk"
+        "username": "elonmusk",
+        "async": false,     (optional: true -> 202 with a job to poll)
+        "fields": "type,confidence"   (optional, default all: type,
+                                       confidence, keywords, insights)
     }
+    
+    Outputs left out of `fields` are not computed; keywords can be fetched
+    later from /result/<id>.
+    
+    Rate limited per user (429); synchronous analyses wait for an
+    admission slot and get 503 + Retry-After when the worker is saturated.
     """
     try:
         user_id = get_jwt_identity()
         data = request.get_json()
         
         username = data.get('username', '').strip()
+        fields = requested_fields(data.get('fields', request.args.get('fields')))
+        include_keywords = 'keywords' in fields
         
         if not username:
             return jsonify({'error': 'Username is required'}), 400
         
+        prediction_admission.check_rate(user_id)
+        
+        if wants_async(data.get('async', request.args.get('async'))):
+            def run(progress):
+                result, error = twitter_service.analyze_twitter(username, user_id, progress, include_keywords)
+                if error:
+                    return None, error
+                return _with_insights(result, fields), None
+            
+            job = job_service.submit(user_id, 'twitter', run, params={'username': username})
+            return jsonify(job_links(job, user_id)), 202, {'Location': f"/api/jobs/{job['jobId']}"}
+        
         # Analyze
-        result, error = twitter_service.analyze_twitter(username, user_id)
+        with prediction_admission.slot():
+            result, error = twitter_service.analyze_twitter(username, user_id, include_keywords=include_keywords)
         
         if error:
             return jsonify({'error': error}), 400
         
-        # Get insights
-        insights = mbti_service.get_insights(result['mbtiType'])
+        return jsonify(_with_insights(result, fields)), 201
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
         
-        return jsonify({
-            **result,
-            'insights': insights
-        }), 201
+    except AdmissionRejected as e:
+        return jsonify({'error': str(e)}), e.status, {'Retry-After': str(e.retry_after)}
+        
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
         
     except Exception as e:
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
+@bp.route('/analyze-batch', methods=['POST'])
+@jwt_required()
+def analyze_batch():
+    """
+    Analyze many Twitter profiles at once
+    
+    Expected JSON:
+    {
+        "usernames": ["elonmusk", "naval", ...],
+        "async": true       (default; false -> wait for the whole batch)
+    }
+    
+    Each handle gets its own result entry; handles that fail are reported
+    with an error instead of failing the batch. Each handle costs one
+    token of the user's rate limit (up to the burst size).
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json() or {}
+        
+        usernames = data.get('usernames')
+        
+        if not isinstance(usernames, list) or not usernames:
+            return jsonify({'error': 'usernames must be a non-empty list'}), 400
+        
+        if len(usernames) > Config.TWITTER_BATCH_MAX_HANDLES:
+            return jsonify({'error': f'At most {Config.TWITTER_BATCH_MAX_HANDLES} usernames per batch'}), 400
+        
+        prediction_admission.check_rate(user_id, cost=len(usernames))
+        
+        if wants_async(data.get('async', request.args.get('async')), default=True):
+            def run(progress):
+                return twitter_service.analyze_batch(usernames, user_id, progress)
+            
+            job = job_service.submit(user_id, 'twitter_batch', run, params={'handles': len(usernames)})
+            return jsonify(job_links(job, user_id)), 202, {'Location': f"/api/jobs/{job['jobId']}"}
+        
+        with prediction_admission.slot():
+            result, error = twitter_service.analyze_batch(usernames, user_id)
+        
+        if error:
+            return jsonify({'error': error}), 400
+        
+        return jsonify(result), 201
+        
+    except AdmissionRejected as e:
+        return jsonify({'error': str(e)}), e.status, {'Retry-After': str(e.retry_after)}
+        
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+        
+    except Exception as e:
+        return jsonify({'error': f'Batch analysis failed: {str(e)}'}), 500
+
 @bp.route('/results', methods=['GET'])
 @jwt_required()
 def get_results():
-    """Get user's latest Twitter prediction"""
+    """Get user's latest Twitter prediction (?fields= as for /result/<id>)"""
     try:
         user_id = get_jwt_identity()
+        fields = requested_fields(request.args.get('fields'))
         
         prediction = twitter_service.get_latest_prediction(user_id)
         
         if not prediction:
             return jsonify({'message': 'No results found'}), 404
         
-        # Get insights
-        insights = mbti_service.get_insights(prediction['mbtiType'])
+        return jsonify(_stored_result(prediction, fields)), 200
         
-        return jsonify({
-            'prediction': prediction,
-            'insights': insights
-        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
         
     except Exception as e:
         return jsonify({'error': f'Failed to load results: {str(e)}'}), 500
@@ -76,22 +159,25 @@ def get_results():
 @bp.route('/result/<id>', methods=['GET'])
 @jwt_required()
 def get_result_by_id(id):
-    """Get specific result by ID"""
+    """
+    Get specific result by ID
+    
+    ?fields= selects outputs as on /analyze (default all). Keywords skipped
+    at analysis time are computed now and stored on the prediction.
+    """
     try:
         user_id = get_jwt_identity()
+        fields = requested_fields(request.args.get('fields'))
         
         prediction = twitter_service.get_prediction_by_id(id, user_id)
         
         if not prediction:
             return jsonify({'error': 'Result not found'}), 404
         
-        # Get insights
-        insights = mbti_service.get_insights(prediction['mbtiType'])
+        return jsonify(_stored_result(prediction, fields)), 200
         
-        return jsonify({
-            'prediction': prediction,
-            'insights': insights
-        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
         
     except Exception as e:
         return jsonify({'error': f'Failed to load result: {str(e)}'}), 500
@@ -116,4 +202,20 @@ def get_available_usernames():
         usernames = twitter_service.get_available_usernames()
         return jsonify({'usernames': usernames}), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+def _with_insights(result, fields):
+    """Analysis response with only the requested optional outputs"""
+    if 'insights' in fields:
+        result = {**result, 'insights': mbti_service.get_insights(result['mbtiType'])}
+    return select_fields(result, fields)
+
+def _stored_result(prediction, fields):
+    """{prediction, insights} for a stored prediction, computing missing keywords if requested"""
+    if 'keywords' in fields:
+        prediction = twitter_service.fill_keywords(prediction)
+    
+    response = {'prediction': prediction}
+    if 'insights' in fields:
+        response['insights'] = mbti_service.get_insights(prediction['mbtiType'])
+    return response
\ No newline at end of file
@@ -0,0 +1,110 @@
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from app.config import Config
+from app.utils.metrics import metrics
+
+_stats = {'hits': 0, 'misses': 0, 'stores': 0}
+_stats_lock = threading.Lock()
+
+def _bump(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+def analysis_cache_stats():
+    """Hit ratio of the shared analysis cache"""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hitRatio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+    stats['ttlSeconds'] = Config.ANALYSIS_CACHE_TTL_SECONDS
+    return stats
+
+metrics.register('analysis_cache', analysis_cache_stats)
+
+class AnalysisCache:
+    """
+    Model output shared across users in `analysis_cache`
+
+    Keyed by (handle, hash of the analyzed tweets, model version): the same
+    tweets through the same model give the same answer, so only the first
+    analysis runs inference and everyone else just gets a prediction record.
+    A new model version changes every key, so stale results are never read
+    and expire through the TTL index.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.cache_collection = db.analysis_cache
+        self.ttl = timedelta(seconds=Config.ANALYSIS_CACHE_TTL_SECONDS)
+
+    @property
+    def enabled(self):
+        return Config.ANALYSIS_CACHE_TTL_SECONDS > 0
+
+    @staticmethod
+    def key(handle, tweets, model_version):
+        """Cache key for a handle's tweet set under a model version"""
+        tweet_hash = hashlib.sha1('\x1e'.join(tweets).encode('utf-8')).hexdigest()
+        return f'{handle}:{tweet_hash}:{model_version}'
+
+    def get_many(self, keys):
+        """
+        Cached outputs for several keys
+
+        Returns:
+            dict: key -> {mbtiType, confidence, keywords} for the hits
+        """
+        if not self.enabled or not keys:
+            return {}
+
+        try:
+            found = {
+                entry['_id']: entry
+                for entry in self.cache_collection.find({
+                    '_id': {'$in': list(keys)},
+                    'expiresAt': {'$gt': datetime.utcnow()}
+                })
+            }
+        except Exception as e:
+            print(f"⚠️  Analysis cache lookup failed: {str(e)}")
+            found = {}
+
+        _bump('hits', len(found))
+        _bump('misses', len(set(keys)) - len(found))
+
+        return {
+            key: {
+                'mbtiType': entry['mbtiType'],
+                'confidence': entry['confidence'],
+                'keywords': entry['keywords']
+            }
+            for key, entry in found.items()
+        }
+
+    def get(self, key):
+        """Cached output for one key, or None"""
+        return self.get_many([key]).get(key)
+
+    def store(self, key, handle, mbti_type, confidence, keywords):
+        """Remember a model output"""
+        if not self.enabled:
+            return
+
+        now = datetime.utcnow()
+        try:
+            self.cache_collection.update_one(
+                {'_id': key},
+                {'$set': {
+                    'twitterHandle': handle,
+                    'mbtiType': mbti_type,
+                    'confidence': confidence,
+                    'keywords': keywords,
+                    'createdAt': now,
+                    'expiresAt': now + self.ttl
+                }},
+                upsert=True
+            )
+            _bump('stores')
+        except Exception as e:
+            print(f"⚠️  Failed to cache analysis of @{handle}: {str(e)}")
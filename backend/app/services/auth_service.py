@@ -1,11 +1,27 @@
 from datetime import datetime
 from bson import ObjectId
 from flask_jwt_extended import create_access_token
+from pymongo.errors import DuplicateKeyError
+from app.config import Config
 from app.models.user import User
+from app.utils.cache import TTLCache
+from app.utils.password_hasher import HasherSaturated
+from app.utils.metrics import metrics
+
+# Sanitized user records keyed by user id (shared by every AuthService in the process).
+# Only signup and login write users, and both refresh the entry; any future
+# write to email/name must call user_cache.invalidate(user_id)
+user_cache = TTLCache(maxsize=Config.USER_CACHE_MAX_SIZE, ttl=Config.USER_CACHE_TTL_SECONDS)
+metrics.register('user_cache', user_cache.stats)
 
 class AuthService:
     """Service for handling authentication logic"""
     
+    # Only the fields sanitize_user needs
+    USER_PROJECTION = {'email': 1, 'name': 1}
+    # ... plus the hash, for login
+    LOGIN_PROJECTION = {'email': 1, 'name': 1, 'password': 1}
+    
     def __init__(self, db):
         self.db = db
         self.users_collection = db.users
@@ -15,27 +31,32 @@ class AuthService:
         try:
             email = email.lower().strip()
             
-            # Check if user already exists
-            existing_user = self.users_collection.find_one({'email': email})
-            if existing_user:
+            # Create new user (the unique email index rejects duplicates)
+            user = User(email, password, name)
+            
+            try:
+                result = self.users_collection.insert_one(user.to_dict())
+            except DuplicateKeyError:
                 return None, 'Email already registered'
             
-            # Create new user
-            user = User(email, password, name)
-            result = self.users_collection.insert_one(user.to_dict())
+            user_id = str(result.inserted_id)
+            sanitized = {
+                'id': user_id,
+                'email': email,
+                'name': user.name
+            }
+            user_cache.set(user_id, sanitized)
             
             # Generate JWT token
-            token = create_access_token(identity=str(result.inserted_id))
+            token = create_access_token(identity=user_id)
             
             return {
                 'token': token,
-                'user': {
-                    'id': str(result.inserted_id),
-                    'email': email,
-                    'name': name
-                }
+                'user': sanitized
             }, None
             
+        except HasherSaturated:
+            raise
         except Exception as e:
             return None, f'Signup failed: {str(e)}'
     
@@ -44,8 +65,8 @@ class AuthService:
         try:
             email = email.lower().strip()
             
-            # Find user by email
-            user_data = self.users_collection.find_one({'email': email})
+            # Failed attempts cost one read and no writes
+            user_data = self.users_collection.find_one({'email': email}, self.LOGIN_PROJECTION)
             
             if not user_data:
                 return None, 'Invalid email or password'
@@ -54,39 +75,56 @@ class AuthService:
             if not User.verify_password(password, user_data['password']):
                 return None, 'Invalid email or password'
             
-            # Update last login
-            self.users_collection.update_one(
-                {'_id': user_data['_id']},
-                {'$set': {'last_login': datetime.utcnow()}}
-            )
+            # Stamp last login; transparently upgrade hashes made with an old
+            # work factor in the same write
+            updates = {'last_login': datetime.utcnow()}
+            if User.needs_rehash(user_data['password']):
+                try:
+                    updates['password'] = User.hash_password(password)
+                except HasherSaturated:
+                    # Busy (or timed out) pool: log in anyway, rehash on a later login
+                    print("⚠️  Skipped password rehash, hasher busy")
+            self.users_collection.update_one({'_id': user_data['_id']}, {'$set': updates})
+            
+            user_id = str(user_data['_id'])
+            sanitized = User.sanitize_user(user_data)
+            user_cache.set(user_id, sanitized)
             
             # Generate JWT token
-            token = create_access_token(identity=str(user_data['_id']))
+            token = create_access_token(identity=user_id)
             
             return {
                 'token': token,
-                'user': User.sanitize_user(user_data)
+                'user': sanitized
             }, None
             
+        except HasherSaturated:
+            raise
         except Exception as e:
             return None, f'Login failed: {str(e)}'
     
     def get_user_by_id(self, user_id):
-        """Get user by ID"""
+        """Get user by ID (served from the user cache when possible)"""
         try:
-            user_data = self.users_collection.find_one({'_id': ObjectId(user_id)})
+            cached = user_cache.get(user_id)
+            if cached:
+                return cached
+            
+            user_data = self.users_collection.find_one(
+                {'_id': ObjectId(user_id)},
+                self.USER_PROJECTION
+            )
             if user_data:
-                return User.sanitize_user(user_data)
+                sanitized = User.sanitize_user(user_data)
+                user_cache.set(user_id, sanitized)
+                return sanitized
             return None
         except Exception:
             return None
     
     def verify_token(self, user_id):
         """Verify if user exists (for token validation)"""
-        try:
-            user_data = self.users_collection.find_one({'_id': ObjectId(user_id)})
-            if user_data:
-                return True, User.sanitize_user(user_data)
-            return False, None
-        except Exception:
-            return False, None
\ No newline at end of file
+        user = self.get_user_by_id(user_id)
+        if user:
+            return True, user
+        return False, None
\ No newline at end of file
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+from bson import ObjectId
+import base64
+
+EPOCH = datetime(1970, 1, 1)
+
+class HistoryService:
+    """Service for the combined cross-module prediction timeline"""
+
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+
+    # Summary fields projected for each module (full documents stay in /result/<id>)
+    MODULE_PROJECTIONS = {
+        'questionnaire': {
+            'mbtiType': 1,
+            'confidence': 1,
+            'timestamp': 1
+        },
+        'text': {
+            'mbtiType': 1,
+            'confidence': 1,
+            'timestamp': 1,
+            'textLength': 1,
+            'preview': {'$substrCP': [{'$ifNull': ['$textSnippet', '']}, 0, 120]}
+        },
+        'twitter': {
+            'mbtiType': 1,
+            'confidence': 1,
+            'timestamp': 1,
+            'username': 1,
+            'tweetCount': 1,
+            'source': 1
+        }
+    }
+
+    MODULE_COLLECTIONS = {
+        'questionnaire': 'questionnaire_predictions',
+        'text': 'text_predictions',
+        'twitter': 'twitter_predictions'
+    }
+
+    def __init__(self, db):
+        self.db = db
+
+    @staticmethod
+    def encode_cursor(timestamp, prediction_id):
+        """Build an opaque pagination cursor from the last item of a page"""
+        # Stored timestamps are naive UTC with millisecond precision
+        millis = (timestamp - EPOCH) // timedelta(milliseconds=1)
+        raw = f"{millis}:{prediction_id}".encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('utf-8').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Parse a pagination cursor
+
+        Returns:
+            tuple: (timestamp, ObjectId)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode('utf-8')).decode('utf-8')
+            millis, prediction_id = raw.split(':', 1)
+            timestamp = EPOCH + timedelta(milliseconds=int(millis))
+            return timestamp, ObjectId(prediction_id)
+        except Exception:
+            raise ValueError('Invalid cursor')
+
+    def _module_pipeline(self, module, match, limit):
+        """Per-collection branch: indexed match + sort, bounded before the union"""
+        return [
+            {'$match': match},
+            {'$sort': {'timestamp': -1, '_id': -1}},
+            {'$limit': limit},
+            {'$project': {**self.MODULE_PROJECTIONS[module], 'module': {'$literal': module}}}
+        ]
+
+    def get_history(self, user_id, limit=None, cursor=None, modules=None):
+        """
+        Get a page of the user's predictions across all modules, newest first
+
+        Args:
+            user_id: Current user's ID
+            limit: Page size (capped at MAX_LIMIT)
+            cursor: Cursor returned with the previous page
+            modules: Optional subset of module names to include
+
+        Returns:
+            tuple: (page_dict, error)
+        """
+        try:
+            limit = min(max(int(limit or self.DEFAULT_LIMIT), 1), self.MAX_LIMIT)
+            modules = [m for m in self.MODULE_COLLECTIONS if not modules or m in modules]
+
+            if not modules:
+                return None, 'No valid modules requested'
+
+            match = {'userId': ObjectId(user_id)}
+
+            if cursor:
+                before_ts, before_id = self.decode_cursor(cursor)
+                match['$or'] = [
+                    {'timestamp': {'$lt': before_ts}},
+                    {'timestamp': before_ts, '_id': {'$lt': before_id}}
+                ]
+
+            # Fetch one extra item to know whether another page exists
+            branch_limit = limit + 1
+
+            first, *rest = modules
+            pipeline = self._module_pipeline(first, match, branch_limit)
+
+            for module in rest:
+                pipeline.append({
+                    '$unionWith': {
+                        'coll': self.MODULE_COLLECTIONS[module],
+                        'pipeline': self._module_pipeline(module, match, branch_limit)
+                    }
+                })
+
+            pipeline.extend([
+                {'$sort': {'timestamp': -1, '_id': -1}},
+                {'$limit': branch_limit}
+            ])
+
+            items = list(self.db[self.MODULE_COLLECTIONS[first]].aggregate(pipeline))
+
+            has_more = len(items) > limit
+            items = items[:limit]
+
+            next_cursor = None
+            if has_more and items:
+                next_cursor = self.encode_cursor(items[-1]['timestamp'], items[-1]['_id'])
+
+            for item in items:
+                item['_id'] = str(item['_id'])
+
+            return {
+                'items': items,
+                'nextCursor': next_cursor,
+                'hasMore': has_more
+            }, None
+
+        except ValueError as e:
+            return None, str(e)
+        except Exception as e:
+            return None, f'Failed to load history: {str(e)}'
\ No newline at end of file
@@ -0,0 +1,310 @@
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from bson import ObjectId
+from flask_jwt_extended import create_access_token
+from app.config import Config
+from app.database import db
+from app.utils.metrics import metrics
+
+TERMINAL_STATUSES = ('done', 'failed')
+ACTIVE_STATUSES = ('queued', 'running')
+
+ORPHANED_ERROR = 'Worker restarted, please retry'
+
+# Claim of the short-lived tokens that may open a job's event stream from a
+# query string (EventSource can't send an Authorization header)
+EVENTS_TOKEN_SCOPE = 'job_events'
+
+class JobQueueFull(Exception):
+    """Raised when this worker already has JOB_MAX_PENDING jobs queued"""
+
+def wants_async(value, default=False):
+    """Parse an `async` flag from JSON or a query string ('true', '1', true...)"""
+    if value is None:
+        return default
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def events_token(job_id, user_id):
+    """Token that only opens this job's event stream, for JOB_EVENTS_TOKEN_SECONDS"""
+    return create_access_token(
+        identity=user_id,
+        expires_delta=timedelta(seconds=Config.JOB_EVENTS_TOKEN_SECONDS),
+        additional_claims={'scope': EVENTS_TOKEN_SCOPE, 'jobId': job_id}
+    )
+
+def job_links(job, user_id):
+    """
+    Job payload plus where to poll / subscribe
+
+    eventsUrl carries a short-lived job-scoped token, so a browser
+    EventSource can open it; polling the job returns a fresh one.
+    """
+    status_url = f"/api/jobs/{job['jobId']}"
+    token = events_token(job['jobId'], user_id)
+    return {**job, 'statusUrl': status_url, 'eventsUrl': f'{status_url}/events?token={token}'}
+
+class JobService:
+    """
+    Background analysis jobs
+
+    POST handlers hand the slow part (fetch, predict, persist) to a local
+    worker pool and answer 202 right away. Job state lives in
+    db.analysis_jobs, so any gunicorn worker can answer status and event
+    requests for a job run by another one.
+
+    Jobs record their owning host/pid and a lease the owner keeps renewing
+    (a heartbeat thread per process). If the worker dies, the lease lapses
+    and the next read marks the job failed instead of leaving it queued
+    or running until the TTL.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.jobs_collection = db.analysis_jobs
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._live = set()  # Unfinished job ids owned by this process
+        self.stats = {'submitted': 0, 'done': 0, 'failed': 0, 'rejected': 0, 'orphaned': 0}
+
+    def _get_executor(self):
+        # Created lazily per process, like the Mongo client
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=Config.JOB_WORKERS,
+                        thread_name_prefix='analysis-job'
+                    )
+                    self._pid = os.getpid()
+                    self._pending = 0
+                    self._live = set()
+                    threading.Thread(target=self._heartbeat, name='analysis-job-heartbeat', daemon=True).start()
+        return self._executor
+
+    @staticmethod
+    def _owner():
+        return {'host': socket.gethostname(), 'pid': os.getpid()}
+
+    @staticmethod
+    def _lease_until():
+        return datetime.utcnow() + timedelta(seconds=Config.JOB_LEASE_SECONDS)
+
+    def _heartbeat(self):
+        """Renew the leases of this process's unfinished jobs"""
+        while True:
+            time.sleep(Config.JOB_HEARTBEAT_SECONDS)
+            with self._lock:
+                live = list(self._live)
+            if not live:
+                continue
+            try:
+                self.jobs_collection.update_many(
+                    {'_id': {'$in': live}, 'status': {'$in': list(ACTIVE_STATUSES)}},
+                    {'$set': {'leaseUntil': self._lease_until()}}
+                )
+            except Exception as e:
+                print(f"⚠️  Failed to renew job leases: {str(e)}")
+
+    def submit(self, user_id, kind, runner, params=None):
+        """
+        Queue a job
+
+        Args:
+            kind: 'twitter' or 'text'
+            runner: runner(progress) -> (result, error); call progress(stage)
+                to publish stages such as 'fetching' or 'analyzing'
+            params: Small request summary stored with the job
+
+        Returns:
+            dict: The job document (serialized)
+
+        Raises:
+            JobQueueFull: If this worker's queue is full
+        """
+        executor = self._get_executor()
+
+        with self._lock:
+            if self._pending >= Config.JOB_MAX_PENDING:
+                self.stats['rejected'] += 1
+                raise JobQueueFull('Too many analyses queued, please retry shortly')
+            self._pending += 1
+
+        now = datetime.utcnow()
+        job = {
+            '_id': ObjectId(),
+            'userId': ObjectId(user_id),
+            'kind': kind,
+            'params': params or {},
+            'status': 'queued',
+            'stage': 'queued',
+            'result': None,
+            'error': None,
+            'createdAt': now,
+            'updatedAt': now,
+            'expiresAt': now + timedelta(seconds=Config.JOB_TTL_SECONDS),
+            'owner': self._owner(),
+            'leaseUntil': self._lease_until()
+        }
+
+        try:
+            self.jobs_collection.insert_one(job)
+            with self._lock:
+                self._live.add(job['_id'])
+            executor.submit(self._run, job['_id'], runner)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                self._live.discard(job['_id'])
+            raise
+
+        self.stats['submitted'] += 1
+        return self._serialize(job)
+
+    def _run(self, job_id, runner):
+        """Execute a job on the pool, recording each stage in Mongo"""
+        try:
+            self._update(job_id, {'status': 'running', 'startedAt': datetime.utcnow()})
+
+            result, error = runner(lambda stage: self._update(job_id, {'stage': stage}))
+
+            if error:
+                self._update(job_id, {'status': 'failed', 'stage': 'failed', 'error': error})
+                self.stats['failed'] += 1
+            else:
+                self._update(job_id, {'status': 'done', 'stage': 'done', 'result': result})
+                self.stats['done'] += 1
+
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self._update(job_id, {'status': 'failed', 'stage': 'failed', 'error': f'Analysis failed: {str(e)}'})
+            self.stats['failed'] += 1
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._live.discard(job_id)
+
+    def _update(self, job_id, fields):
+        try:
+            self.jobs_collection.update_one(
+                {'_id': job_id},
+                {'$set': {**fields, 'updatedAt': datetime.utcnow(), 'leaseUntil': self._lease_until()}}
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to update job {job_id}: {str(e)}")
+
+    def get_job(self, job_id, user_id):
+        """Get a job owned by the user"""
+        try:
+            job = self.jobs_collection.find_one({
+                '_id': ObjectId(job_id),
+                'userId': ObjectId(user_id)
+            })
+        except Exception:
+            return None
+
+        if job and self._orphaned(job):
+            job = self._fail_orphaned(job)
+
+        return self._serialize(job) if job else None
+
+    @staticmethod
+    def _orphaned(job):
+        """Unfinished, and its owner stopped renewing the lease"""
+        if job['status'] not in ACTIVE_STATUSES:
+            return False
+        lease_until = job.get('leaseUntil') or job['updatedAt'] + timedelta(seconds=Config.JOB_LEASE_SECONDS)
+        return lease_until < datetime.utcnow()
+
+    def _fail_orphaned(self, job):
+        """Mark a job whose worker died as failed (unless it moved on meanwhile)"""
+        now = datetime.utcnow()
+        failed = {'status': 'failed', 'stage': 'failed', 'error': ORPHANED_ERROR, 'updatedAt': now}
+        try:
+            result = self.jobs_collection.update_one(
+                {'_id': job['_id'], 'status': {'$in': list(ACTIVE_STATUSES)}, 'leaseUntil': job.get('leaseUntil')},
+                {'$set': failed}
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to mark job {job['_id']} orphaned: {str(e)}")
+            return job
+
+        if result.modified_count:
+            self.stats['orphaned'] += 1
+            print(f"⚠️  Job {job['_id']} lost its worker {job.get('owner')}, marked failed")
+            return {**job, **failed}
+
+        # Renewed or finished concurrently: read it again
+        return self.jobs_collection.find_one({'_id': job['_id']}) or job
+
+    def stream_events(self, job_id, user_id):
+        """
+        Server-sent events for a job: one event per stage change
+
+        Polls the job document (it may be running in another worker) until
+        it finishes or JOB_STREAM_TIMEOUT_SECONDS pass. The cap is kept
+        below the gunicorn worker timeout; an EventSource reconnects on its
+        own after `retry` ms and gets the current stage again.
+        """
+        deadline = time.monotonic() + Config.JOB_STREAM_TIMEOUT_SECONDS
+        last_stage = None
+
+        yield f"retry: {int(Config.JOB_POLL_INTERVAL_SECONDS * 1000)}\n\n"
+
+        while True:
+            job = self.get_job(job_id, user_id)
+
+            if not job:
+                yield self._event('error', {'error': 'Job not found'})
+                return
+
+            if job['stage'] != last_stage:
+                last_stage = job['stage']
+                yield self._event(job['stage'], job)
+
+            if job['status'] in TERMINAL_STATUSES:
+                return
+
+            if time.monotonic() >= deadline:
+                yield self._event('timeout', {'jobId': job['jobId'], 'status': job['status']})
+                return
+
+            time.sleep(Config.JOB_POLL_INTERVAL_SECONDS)
+
+    @staticmethod
+    def _event(name, data):
+        return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+    @staticmethod
+    def _serialize(job):
+        return {
+            'jobId': str(job['_id']),
+            'kind': job['kind'],
+            'status': job['status'],
+            'stage': job['stage'],
+            'result': job.get('result'),
+            'error': job.get('error'),
+            'createdAt': job['createdAt'].isoformat() + 'Z',
+            'updatedAt': job['updatedAt'].isoformat() + 'Z'
+        }
+
+    def queue_stats(self):
+        """Local pool usage for metrics"""
+        return {
+            'workers': Config.JOB_WORKERS,
+            'pending': self._pending,
+            'maxPending': Config.JOB_MAX_PENDING,
+            **self.stats
+        }
+
+# Global instance, shared by the twitter, text and jobs blueprints
+job_service = JobService(db)
+
+metrics.register('analysis_jobs', job_service.queue_stats)
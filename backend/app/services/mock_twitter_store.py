@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from app.config import Config
+
+USER_ID_SPACE = 10000000000
+TWEET_ID_SPACE = 10000000000000000
+TWEET_SEQUENCE_SPACE = 1000000
+
+def load_mock_data():
+    """Load mock profiles (MOCK_TWITTER_DATA_PATH or data/mock_twitter_data.json)"""
+    try:
+        mock_file = Config.MOCK_TWITTER_DATA_PATH or \
+            os.path.join(os.path.dirname(__file__), '../../data/mock_twitter_data.json')
+        with open(mock_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Failed to load mock data: {e}")
+        return {}
+
+def stable_id(value, space):
+    """
+    Deterministic numeric ID for a string
+
+    Python's hash() is salted per process, so IDs built from it differ
+    between gunicorn workers; a SHA-1 prefix is the same everywhere.
+    """
+    digest = hashlib.sha1(value.encode('utf-8')).hexdigest()
+    return str(int(digest[:16], 16) % space)
+
+def tweet_id(user_id, sequence):
+    """
+    Snowflake-like tweet ID: newer tweets get larger IDs (like the real API)
+
+    Tweets are listed newest first, so counting from the oldest keeps IDs
+    stable when new tweets are prepended to a profile.
+    """
+    return str((int(user_id) * TWEET_SEQUENCE_SPACE + sequence) % TWEET_ID_SPACE)
+
+def parse_count(value):
+    """Parse display counts like '1,234', '2M', '1.5K' into an int"""
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    text = str(value or '0').replace(',', '').strip().upper()
+    multipliers = {'K': 1000, 'M': 1000000, 'B': 1000000000}
+
+    try:
+        if text and text[-1] in multipliers:
+            return int(float(text[:-1]) * multipliers[text[-1]])
+        return int(float(text))
+    except ValueError:
+        return 0
+
+def _not_found(detail):
+    return {
+        'errors': [{
+            'title': 'Not Found Error',
+            'detail': detail,
+            'type': 'https://api.twitter.com/2/problems/resource-not-found'
+        }]
+    }
+
+def invalid_request(parameter, value, message):
+    """Twitter v2 style 400 payload for a bad query parameter"""
+    return {
+        'errors': [{
+            'parameters': {parameter: [value]},
+            'message': message
+        }],
+        'title': 'Invalid Request',
+        'detail': 'One or more parameters to your request was invalid.',
+        'type': 'https://api.twitter.com/2/problems/invalid-request'
+    }
+
+class MockTwitterStore:
+    """
+    Data layer behind the mock Twitter API
+
+    Returns (payload, status) pairs shaped like Twitter API v2 responses.
+    Used directly by the in-process mock client transport and wrapped in
+    HTTP by the /api/mock/twitter blueprint.
+
+    Everything a request needs is precomputed at load: stable IDs indexed
+    both ways, parsed metrics and ready-made tweet objects, so lookups are
+    O(1) and identical in every worker.
+    """
+
+    def __init__(self, data=None):
+        self.mock_data = data if data is not None else load_mock_data()
+        self._build_index()
+
+    def _build_index(self):
+        """Precompute user records and tweet objects for every profile"""
+        self.users_by_name = {}
+        self.users_by_id = {}
+        base_time = datetime.utcnow()
+
+        for username, profile in self.mock_data.items():
+            username = username.lower()
+            user_id = stable_id(username, USER_ID_SPACE)
+            # Seeded per user so the "random" metrics are stable across workers
+            rng = random.Random(user_id)
+            tweets = profile.get('tweets', [])
+
+            tweet_objects = []
+            for i, tweet_text in enumerate(tweets):
+                tweet_objects.append({
+                    'id': tweet_id(user_id, len(tweets) - i),
+                    'text': tweet_text,
+                    'created_at': (base_time - timedelta(days=i)).isoformat() + 'Z',
+                    'lang': 'en',
+                    'public_metrics': {
+                        'retweet_count': rng.randint(10, 10000),
+                        'reply_count': rng.randint(5, 1000),
+                        'like_count': rng.randint(50, 50000),
+                        'quote_count': rng.randint(0, 500)
+                    }
+                })
+
+            record = {
+                'user': {
+                    'id': user_id,
+                    'name': profile['displayName'],
+                    'username': username,
+                    'description': profile.get('bio', ''),
+                    'verified': profile.get('verified', False),
+                    'public_metrics': {
+                        'followers_count': parse_count(profile.get('followers', '0')),
+                        'following_count': rng.randint(100, 1000),
+                        'tweet_count': len(tweets),
+                        'listed_count': rng.randint(50, 500)
+                    }
+                },
+                'tweets': tweet_objects,
+                'summary': {
+                    'username': username,
+                    'name': profile['displayName'],
+                    'verified': profile.get('verified', False),
+                    'tweet_count': len(tweets)
+                }
+            }
+
+            self.users_by_name[username] = record
+            self.users_by_id[user_id] = record
+
+        print(f"✅ Mock Twitter index built: {len(self.users_by_name)} users")
+
+    def get_user(self, username):
+        """Simulates: GET https://api.twitter.com/2/users/by/username/:username"""
+        username = username.lower()
+        record = self.users_by_name.get(username)
+
+        if not record:
+            return _not_found(f'Could not find user with username: {username}'), 404
+
+        return {'data': record['user']}, 200
+
+    def get_user_tweets(self, user_id, max_results=10, since_id=None):
+        """
+        Simulates: GET https://api.twitter.com/2/users/:id/tweets
+
+        With since_id only tweets newer than it are returned (IDs grow with time).
+        """
+        record = self.users_by_id.get(str(user_id))
+
+        if not record:
+            return _not_found(f'Could not find user with id: {user_id}'), 404
+
+        max_results = min(int(max_results), 100)
+        tweets = record['tweets']
+        if since_id:
+            tweets = [t for t in tweets if int(t['id']) > int(since_id)]
+        tweet_data = tweets[:max_results]
+
+        return {
+            'data': tweet_data,
+            'meta': {
+                'result_count': len(tweet_data),
+                'newest_id': tweet_data[0]['id'] if tweet_data else None,
+                'oldest_id': tweet_data[-1]['id'] if tweet_data else None
+            }
+        }, 200
+
+    def get_available_users(self):
+        """List all available mock users"""
+        return {'users': [record['summary'] for record in self.users_by_name.values()]}, 200
+
+# Global instance
+mock_twitter_store = MockTwitterStore()
\ No newline at end of file
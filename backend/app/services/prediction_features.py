@@ -0,0 +1,142 @@
+import numpy as np
+from datetime import datetime
+from bson import Binary
+from pymongo import UpdateOne
+from app.ml_models.text_scoring import DIMENSIONS
+
+# Module -> prediction collection whose documents reference the features
+PREDICTION_COLLECTIONS = {
+    'text': 'text_predictions',
+    'twitter': 'twitter_predictions'
+}
+
+class PredictionFeatureStore:
+    """
+    Model inputs of text/Twitter predictions in `prediction_features`
+
+    Each document holds what the ensembles consumed: the sentence embedding
+    (float16), the linguistic vector (float32) and per-dimension sparse word
+    counts. Predictions point at it with `featureId`, so a new ensemble can
+    re-score history without re-encoding anything
+    (see scripts/rescore_predictions.py).
+
+    Twitter features are keyed by content (handle + tweet set), so users
+    analyzing the same tweets share one document.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.features_collection = db.prediction_features
+
+    @staticmethod
+    def encode(features):
+        """Compact BSON fields for {embedding, linguistic, counts}"""
+        counts = {}
+        for dim, row in features['counts'].items():
+            if hasattr(row, 'indices'):
+                indices, values = row.indices, row.data
+            else:
+                row = np.asarray(row).ravel()
+                indices = np.flatnonzero(row)
+                values = row[indices]
+            counts[dim] = {'i': [int(i) for i in indices], 'c': [float(v) for v in values]}
+
+        return {
+            'embedding': Binary(np.asarray(features['embedding'], dtype=np.float16).tobytes()),
+            'linguistic': Binary(np.asarray(features['linguistic'], dtype=np.float32).ravel().tobytes()),
+            'counts': counts
+        }
+
+    @staticmethod
+    def decode_batch(documents, vocab_sizes):
+        """
+        Stack stored features into model-ready matrices
+
+        Args:
+            vocab_sizes: {dimension: vocabulary size} of the vectorizers
+
+        Returns:
+            tuple: (embeddings (n, d), {dimension: counts (n, vocab)}, linguistic (n, 20))
+        """
+        embeddings = np.vstack([
+            np.frombuffer(doc['embedding'], dtype=np.float16).astype(np.float32)
+            for doc in documents
+        ])
+        linguistic = np.vstack([
+            np.frombuffer(doc['linguistic'], dtype=np.float32)
+            for doc in documents
+        ])
+
+        counts = {}
+        for dim in DIMENSIONS:
+            matrix = np.zeros((len(documents), vocab_sizes[dim]), dtype=np.float32)
+            for row, doc in enumerate(documents):
+                matrix[row, doc['counts'][dim]['i']] = doc['counts'][dim]['c']
+            counts[dim] = matrix
+
+        return embeddings, counts, linguistic
+
+    def get_counts(self, feature_id, feature_version, vocab_sizes):
+        """
+        Stored word counts of one prediction, as dense rows
+
+        Returns:
+            dict: {dimension: counts (vocab,)}, or None if missing or from
+                other vocabularies than `feature_version`
+        """
+        try:
+            doc = self.features_collection.find_one(
+                {'_id': feature_id, 'featureVersion': feature_version},
+                {'counts': 1}
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to load prediction features: {str(e)}")
+            return None
+
+        if not doc:
+            return None
+
+        counts = {}
+        for dim in DIMENSIONS:
+            row = np.zeros(vocab_sizes[dim], dtype=np.float32)
+            row[doc['counts'][dim]['i']] = doc['counts'][dim]['c']
+            counts[dim] = row
+        return counts
+
+    def save_many(self, entries, feature_version):
+        """
+        Store features once per id (existing documents are left alone)
+
+        Args:
+            entries: [(feature_id, module, features)]
+            feature_version: text_classifier.feature_version() that produced them
+
+        Returns:
+            bool: False if the write failed (predictions are still saved)
+        """
+        if not entries:
+            return True
+
+        now = datetime.utcnow()
+        try:
+            self.features_collection.bulk_write([
+                UpdateOne(
+                    {'_id': feature_id},
+                    {'$setOnInsert': {
+                        'module': module,
+                        'featureVersion': feature_version,
+                        'createdAt': now,
+                        **self.encode(features)
+                    }},
+                    upsert=True
+                )
+                for feature_id, module, features in entries
+            ], ordered=False)
+            return True
+        except Exception as e:
+            print(f"⚠️  Failed to store prediction features: {str(e)}")
+            return False
+
+    def save(self, feature_id, module, features, feature_version):
+        """Store one prediction's features"""
+        return self.save_many([(feature_id, module, features)], feature_version)
@@ -0,0 +1,271 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from pymongo.write_concern import WriteConcern
+from app.config import Config
+from app.utils.metrics import metrics
+
+# Every writer created in this process, flushed on interpreter shutdown
+_writers = []
+
+def _parse_write_concern(value):
+    """Turn '0', '1', 'majority' into a WriteConcern (None keeps the client default)"""
+    if not value:
+        return None
+    value = value.strip()
+    return WriteConcern(w=int(value) if value.isdigit() else value)
+
+class PredictionWriter:
+    """
+    Persists prediction documents for one collection
+
+    In 'sync' mode (default) this is a plain insert_one. In 'write_behind'
+    mode the _id is generated client-side, the document is queued and the
+    caller returns immediately; a background flusher batches queued
+    documents into insert_many(ordered=False) with retries.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.name = collection.name
+        self.write_behind = Config.PREDICTION_WRITE_MODE == 'write_behind'
+
+        env_key = f'PREDICTION_WRITE_CONCERN_{self.name.upper()}'
+        self.write_concern = _parse_write_concern(
+            os.getenv(env_key, Config.PREDICTION_WRITE_CONCERN)
+        )
+
+        self.batch_size = Config.PREDICTION_WRITE_BATCH_SIZE
+        self.flush_interval = Config.PREDICTION_WRITE_FLUSH_INTERVAL
+        self.max_retries = Config.PREDICTION_WRITE_MAX_RETRIES
+
+        self.stats = {'written': 0, 'failed': 0, 'retries': 0, 'batches': 0, 'sync_fallbacks': 0}
+        self._reset()
+
+        _writers.append(self)
+
+    def _reset(self):
+        """(Re)create per-process state; the flusher thread starts lazily"""
+        self._pid = os.getpid()
+        self._queue = queue.Queue(maxsize=Config.PREDICTION_WRITE_QUEUE_SIZE)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = None
+
+    def _target(self):
+        """Collection with the configured write concern applied"""
+        if self.write_concern is None:
+            return self.collection
+        return self.collection.with_options(write_concern=self.write_concern)
+
+    def _ensure_flusher(self):
+        """Start the flusher thread in this process (safe after fork)"""
+        if self._pid != os.getpid():
+            self._reset()
+
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run,
+                        name=f'prediction-writer-{self.name}',
+                        daemon=True
+                    )
+                    self._thread.start()
+
+    def insert(self, document, on_written=None):
+        """
+        Persist a prediction document
+
+        Args:
+            document: Document to insert (an _id is assigned if missing)
+            on_written: Optional callback(document) run once it is stored
+
+        Returns:
+            ObjectId: The document's _id
+        """
+        document.setdefault('_id', ObjectId())
+
+        if not self.write_behind:
+            self._target().insert_one(document)
+            self.stats['written'] += 1
+            self._notify([(document, on_written)])
+            return document['_id']
+
+        self._ensure_flusher()
+
+        with self._lock:
+            self._pending[document['_id']] = document
+            self._idle.clear()
+
+        try:
+            self._queue.put_nowait((document, on_written))
+        except queue.Full:
+            # Queue saturated: apply backpressure by writing inline
+            with self._lock:
+                self._pending.pop(document['_id'], None)
+            self.stats['sync_fallbacks'] += 1
+            self._target().insert_one(document)
+            self.stats['written'] += 1
+            self._notify([(document, on_written)])
+
+        return document['_id']
+
+    def insert_many(self, documents, on_written=None):
+        """
+        Persist several prediction documents with one bulk insert
+
+        Args:
+            documents: Documents to insert (_ids are assigned if missing)
+            on_written: Optional callback(document) run once, for the last
+                document, after the whole batch is stored
+
+        Returns:
+            list: The documents' _ids, in order
+        """
+        if not documents:
+            return []
+
+        for document in documents:
+            document.setdefault('_id', ObjectId())
+
+        if not self.write_behind:
+            self._target().insert_many(documents, ordered=False)
+            self.stats['written'] += len(documents)
+            self.stats['batches'] += 1
+            self._notify([(documents[-1], on_written)])
+            return [document['_id'] for document in documents]
+
+        # The flusher writes in queue order, so the last document lands last
+        for document in documents[:-1]:
+            self.insert(document)
+        self.insert(documents[-1], on_written=on_written)
+
+        return [document['_id'] for document in documents]
+
+    def get_pending(self, document_id, user_id=None):
+        """Return a queued (not yet flushed) document so reads see our own writes"""
+        try:
+            document = self._pending.get(ObjectId(document_id))
+        except Exception:
+            return None
+
+        if document is None:
+            return None
+
+        if user_id is not None and document.get('userId') != ObjectId(user_id):
+            return None
+
+        return dict(document)
+
+    def flush(self, timeout=10):
+        """Block until everything queued so far has been written (or timeout)"""
+        if not self.write_behind or self._pid != os.getpid() or self._thread is None:
+            return True
+        return self._idle.wait(timeout)
+
+    def queue_depth(self):
+        """Documents waiting to be flushed"""
+        return len(self._pending)
+
+    def _run(self):
+        """Flusher loop: block for the first item, then drain up to batch_size"""
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                with self._lock:
+                    if not self._pending:
+                        self._idle.set()
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        """insert_many with retry; duplicate-key errors mean an earlier attempt landed"""
+        remaining = batch
+        attempt = 0
+
+        while remaining:
+            try:
+                self._target().insert_many([doc for doc, _ in remaining], ordered=False)
+                done, remaining = remaining, []
+            except BulkWriteError as e:
+                failed_idx = {
+                    err['index'] for err in e.details.get('writeErrors', [])
+                    if err.get('code') != 11000
+                }
+                done = [item for i, item in enumerate(remaining) if i not in failed_idx]
+                remaining = [item for i, item in enumerate(remaining) if i in failed_idx]
+            except Exception as e:
+                print(f"⚠️  Write-behind insert into {self.name} failed: {str(e)}")
+                done = []
+
+            self.stats['written'] += len(done)
+            self._finish(done)
+
+            if not remaining:
+                break
+
+            attempt += 1
+            if attempt > self.max_retries:
+                print(f"❌ Dropping {len(remaining)} {self.name} documents after {self.max_retries} retries")
+                self.stats['failed'] += len(remaining)
+                self._finish(remaining, notify=False)
+                break
+
+            self.stats['retries'] += 1
+            time.sleep(min(0.1 * 2 ** attempt, 2.0))
+
+        self.stats['batches'] += 1
+
+    def _finish(self, items, notify=True):
+        with self._lock:
+            for document, _ in items:
+                self._pending.pop(document['_id'], None)
+            if not self._pending and self._queue.empty():
+                self._idle.set()
+
+        if notify:
+            self._notify(items)
+
+    @staticmethod
+    def _notify(items):
+        for document, on_written in items:
+            if on_written is None:
+                continue
+            try:
+                on_written(document)
+            except Exception as e:
+                print(f"⚠️  Post-write hook failed: {str(e)}")
+
+def flush_all(timeout=10):
+    """Flush every writer in this process (called on shutdown)"""
+    for writer in _writers:
+        writer.flush(timeout)
+
+def writer_stats():
+    """Per-collection write-behind statistics"""
+    return {
+        writer.name: {
+            **writer.stats,
+            'mode': 'write_behind' if writer.write_behind else 'sync',
+            'queueDepth': writer.queue_depth()
+        }
+        for writer in _writers
+    }
+
+atexit.register(flush_all)
+metrics.register('prediction_writer', writer_stats)
\ No newline at end of file
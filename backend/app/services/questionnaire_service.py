@@ -2,7 +2,9 @@ from datetime import datetime
 from bson import ObjectId
 import json
 import os
-from app.ml_models.questionnaire_enhancer import ml_enhancer
+from app.ml_models.questionnaire_enhancer import questionnaire_models
+from app.services.summary_service import SummaryService
+from app.services.prediction_writer import PredictionWriter
 
 class QuestionnaireService:
     """Service for handling questionnaire predictions"""
@@ -10,6 +12,8 @@ class QuestionnaireService:
     def __init__(self, db):
         self.db = db
         self.predictions_collection = db.questionnaire_predictions
+        self.summary_service = SummaryService(db)
+        self.writer = PredictionWriter(self.predictions_collection)
         
         # Load questions
         questions_path = os.path.join(os.path.dirname(__file__), '../../data/questions.json')
@@ -91,9 +95,11 @@ class QuestionnaireService:
         """Save prediction to database with ML enhancement"""
         try:
             # Enhance confidence with ML
-            enhanced_confidence = ml_enhancer.enhance_confidence(
-                answers, mbti_type, confidence
-            )
+            with questionnaire_models.lease() as ml_enhancer:
+                enhanced_confidence = ml_enhancer.enhance_confidence(
+                    answers, mbti_type, confidence
+                )
+                model_version = ml_enhancer.model_version
             
             prediction = {
                 'userId': ObjectId(user_id),
@@ -102,15 +108,23 @@ class QuestionnaireService:
                 'base_confidence': confidence,  # Store original for comparison
                 'answers': answers,
                 'timestamp': datetime.utcnow(),
-                'ml_enhanced': True
+                'ml_enhanced': True,
+                'modelVersion': model_version
             }
             
-            result = self.predictions_collection.insert_one(prediction)
+            prediction_id = self.writer.insert(prediction, on_written=self._record_summary)
             
-            return str(result.inserted_id), None
+            return str(prediction_id), None
         except Exception as e:
             return None, f'Failed to save prediction: {str(e)}'
     
+    def _record_summary(self, prediction):
+        """Refresh the user's summary once the prediction is stored"""
+        self.summary_service.record_prediction(
+            prediction['userId'], 'questionnaire', prediction['_id'],
+            prediction['mbtiType'], prediction['confidence'], prediction['timestamp']
+        )
+    
     def get_user_predictions(self, user_id):
         """Get all predictions for a user"""
         try:
@@ -130,10 +144,14 @@ class QuestionnaireService:
     def get_prediction_by_id(self, prediction_id, user_id):
         """Get specific prediction by ID"""
         try:
-            prediction = self.predictions_collection.find_one({
-                '_id': ObjectId(prediction_id),
-                'userId': ObjectId(user_id)
-            })
+            # Write-behind: serve our own not-yet-flushed write
+            prediction = self.writer.get_pending(prediction_id, user_id)
+            
+            if not prediction:
+                prediction = self.predictions_collection.find_one({
+                    '_id': ObjectId(prediction_id),
+                    'userId': ObjectId(user_id)
+                })
             
             if prediction:
                 prediction['_id'] = str(prediction['_id'])
@@ -147,10 +165,19 @@ class QuestionnaireService:
     def get_latest_prediction(self, user_id):
         """Get user's most recent prediction"""
         try:
-            prediction = self.predictions_collection.find_one(
-                {'userId': ObjectId(user_id)},
-                sort=[('timestamp', -1)]
-            )
+            # Point lookup through the user summary; sorted scan only if not backfilled yet
+            latest = self.summary_service.get_latest_entry(user_id, 'questionnaire')
+            
+            if latest:
+                prediction = self.predictions_collection.find_one({
+                    '_id': latest['predictionId'],
+                    'userId': ObjectId(user_id)
+                })
+            else:
+                prediction = self.predictions_collection.find_one(
+                    {'userId': ObjectId(user_id)},
+                    sort=[('timestamp', -1)]
+                )
             
             if prediction:
                 prediction['_id'] = str(prediction['_id'])
@@ -0,0 +1,187 @@
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+EPOCH = datetime(1970, 1, 1)
+
+class SummaryService:
+    """
+    Materialized per-user personality summary
+
+    One document per user in `user_summaries` holding the latest result of
+    each module plus a confidence-weighted fused MBTI type, so "latest" and
+    "overall" reads are single point lookups by _id.
+    """
+
+    MODULES = ['questionnaire', 'text', 'twitter']
+
+    # (confidence key, first letter, second letter) in MBTI letter order
+    DIMENSIONS = [
+        ('IE', 'I', 'E'),
+        ('NS', 'N', 'S'),
+        ('TF', 'T', 'F'),
+        ('JP', 'J', 'P')
+    ]
+
+    def __init__(self, db):
+        self.db = db
+        self.summaries_collection = db.user_summaries
+
+    def record_prediction(self, user_id, module, prediction_id, mbti_type, confidence, timestamp, extra=None):
+        """
+        Update the user's summary after a prediction insert
+
+        The per-module entry is replaced atomically (only if this prediction is
+        newer than the stored one), then the fused type is recomputed and
+        written guarded by the summary revision so concurrent writers can't
+        overwrite a newer fusion with an older one.
+        """
+        try:
+            entry = {
+                'predictionId': ObjectId(prediction_id),
+                'mbtiType': mbti_type,
+                'confidence': confidence,
+                'timestamp': timestamp,
+                **(extra or {})
+            }
+            field = f'latest.{module}'
+
+            summary = self.summaries_collection.find_one_and_update(
+                {'_id': ObjectId(user_id)},
+                [{
+                    '$set': {
+                        field: {
+                            '$cond': [
+                                {'$gt': [timestamp, {'$ifNull': [f'${field}.timestamp', EPOCH]}]},
+                                {'$literal': entry},
+                                f'${field}'
+                            ]
+                        },
+                        'revision': {'$add': [{'$ifNull': ['$revision', 0]}, 1]},
+                        'updatedAt': '$$NOW'
+                    }
+                }],
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+
+            overall = self.fuse(summary.get('latest', {}))
+
+            self.summaries_collection.update_one(
+                {'_id': summary['_id'], 'revision': summary['revision']},
+                {'$set': {'overall': overall}}
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to update summary for user {user_id}: {str(e)}")
+
+    @classmethod
+    def fuse(cls, latest):
+        """
+        Fuse the latest per-module results into one MBTI type
+
+        Each module votes on every dimension with its signed margin
+        (confidence - 0.5), so confident results outweigh borderline ones.
+
+        Returns:
+            dict: {mbtiType, confidence, modules} or None if no results yet
+        """
+        entries = [latest[m] for m in cls.MODULES if latest.get(m)]
+
+        if not entries:
+            return None
+
+        mbti_type = ''
+        confidence = {}
+
+        for idx, (dim, first, second) in enumerate(cls.DIMENSIONS):
+            score = 0.0
+
+            for entry in entries:
+                conf = float(entry.get('confidence', {}).get(dim, 0.5))
+                letter = entry['mbtiType'][idx]
+                margin = conf - 0.5
+                score += margin if letter == first else -margin
+
+            mbti_type += first if score >= 0 else second
+            confidence[dim] = round(0.5 + abs(score) / len(entries), 2)
+
+        return {
+            'mbtiType': mbti_type,
+            'confidence': confidence,
+            'modules': [m for m in cls.MODULES if latest.get(m)]
+        }
+
+    def get_summary(self, user_id):
+        """Get the user's summary document"""
+        try:
+            summary = self.summaries_collection.find_one({'_id': ObjectId(user_id)})
+
+            if not summary:
+                return None
+
+            latest = summary.get('latest', {})
+            for entry in latest.values():
+                entry['predictionId'] = str(entry['predictionId'])
+
+            return {
+                'userId': str(summary['_id']),
+                'latest': latest,
+                'overall': summary.get('overall'),
+                'updatedAt': summary.get('updatedAt')
+            }
+        except Exception:
+            return None
+
+    def get_latest_entry(self, user_id, module):
+        """Get the stored latest entry for one module (or None)"""
+        try:
+            summary = self.summaries_collection.find_one(
+                {'_id': ObjectId(user_id)},
+                {f'latest.{module}': 1}
+            )
+
+            if summary:
+                return summary.get('latest', {}).get(module)
+
+            return None
+        except Exception:
+            return None
+
+    def backfill(self, prediction_collections=None):
+        """
+        Build summaries for existing users from their stored predictions
+
+        Returns:
+            int: Number of module entries recorded
+        """
+        prediction_collections = prediction_collections or {
+            'questionnaire': self.db.questionnaire_predictions,
+            'text': self.db.text_predictions,
+            'twitter': self.db.twitter_predictions
+        }
+
+        recorded = 0
+
+        for module, collection in prediction_collections.items():
+            # Latest prediction per user, walking the (userId, timestamp) index
+            latest_per_user = collection.aggregate([
+                {'$sort': {'userId': 1, 'timestamp': -1}},
+                {'$group': {
+                    '_id': '$userId',
+                    'predictionId': {'$first': '$_id'},
+                    'mbtiType': {'$first': '$mbtiType'},
+                    'confidence': {'$first': '$confidence'},
+                    'timestamp': {'$first': '$timestamp'},
+                    'username': {'$first': '$username'}
+                }}
+            ], allowDiskUse=True)
+
+            for doc in latest_per_user:
+                extra = {'username': doc['username']} if module == 'twitter' else None
+                self.record_prediction(
+                    doc['_id'], module, doc['predictionId'],
+                    doc['mbtiType'], doc['confidence'], doc['timestamp'], extra
+                )
+                recorded += 1
+
+        return recorded
\ No newline at end of file
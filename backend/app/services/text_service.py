@@ -1,6 +1,9 @@
 from datetime import datetime
 from bson import ObjectId
-from app.ml_models.text_classifier import text_classifier
+from app.ml_models.text_classifier import text_models
+from app.services.summary_service import SummaryService
+from app.services.prediction_writer import PredictionWriter
+from app.services.prediction_features import PredictionFeatureStore
 
 class TextService:
     """Service for text-based MBTI predictions"""
@@ -8,9 +11,20 @@ class TextService:
     def __init__(self, db):
         self.db = db
         self.predictions_collection = db.text_predictions
+        self.summary_service = SummaryService(db)
+        self.writer = PredictionWriter(self.predictions_collection)
+        self.feature_store = PredictionFeatureStore(db)
     
-    def predict(self, text, user_id):
-        """Predict MBTI from text"""
+    def predict(self, text, user_id, progress=None, include_keywords=True):
+        """
+        Predict MBTI from text
+        
+        Args:
+            progress: Optional progress(stage) callback (used by analysis jobs)
+            include_keywords: False skips keyword extraction; the prediction
+                is stored with keywords None (see fill_keywords for when
+                they can be recovered)
+        """
         try:
             # Validate text length
             if len(text) < 100:
@@ -19,11 +33,34 @@ class TextService:
             if len(text) > 10000:
                 text = text[:10000]  # Limit to 10k characters
             
-            # Get prediction from ML model
-            mbti_type, confidence, keywords = text_classifier.predict(text)
+            if progress:
+                progress('analyzing')
+            
+            # Get prediction from ML model (one version for the whole request,
+            # even if a new one is swapped in meanwhile)
+            with text_models.lease() as text_classifier:
+                mbti_type, confidence, keywords, features = text_classifier.predict_batch(
+                    [text], return_features=True, include_keywords=include_keywords
+                )[0]
+                model_version = text_classifier.inference_version()
+                feature_version = text_classifier.feature_version()
+            
+            text_models.shadow(lambda candidate: candidate.predict_batch([text], include_keywords=False), [(mbti_type, confidence)])
+            
+            if progress:
+                progress('saving')
+            
+            # Keep the model inputs so future ensembles can re-score this prediction
+            # (not available when the fast tier answered without BERT)
+            prediction_id = ObjectId()
+            feature_id = f'text:{prediction_id}'
+            stored = features is not None and self.feature_store.save(
+                feature_id, 'text', features, feature_version
+            )
             
             # Save prediction
             prediction = {
+                '_id': prediction_id,
                 'userId': ObjectId(user_id),
                 'mbtiType': mbti_type,
                 'confidence': confidence,
@@ -31,13 +68,15 @@ class TextService:
                 'textLength': len(text),
                 'keywords': keywords,
                 'timestamp': datetime.utcnow(),
-                'ml_enhanced': True
+                'ml_enhanced': True,
+                'modelVersion': model_version,
+                'featureId': feature_id if stored else None
             }
             
-            result = self.predictions_collection.insert_one(prediction)
+            self.writer.insert(prediction, on_written=self._record_summary)
             
             return {
-                'predictionId': str(result.inserted_id),
+                'predictionId': str(prediction_id),
                 'mbtiType': mbti_type,
                 'confidence': confidence,
                 'keywords': keywords,
@@ -49,13 +88,29 @@ class TextService:
         except Exception as e:
             return None, f'Prediction failed: {str(e)}'
     
+    def _record_summary(self, prediction):
+        """Refresh the user's summary once the prediction is stored"""
+        self.summary_service.record_prediction(
+            prediction['userId'], 'text', prediction['_id'],
+            prediction['mbtiType'], prediction['confidence'], prediction['timestamp']
+        )
+    
     def get_latest_prediction(self, user_id):
         """Get user's most recent text prediction"""
         try:
-            prediction = self.predictions_collection.find_one(
-                {'userId': ObjectId(user_id)},
-                sort=[('timestamp', -1)]
-            )
+            # Point lookup through the user summary; sorted scan only if not backfilled yet
+            latest = self.summary_service.get_latest_entry(user_id, 'text')
+            
+            if latest:
+                prediction = self.predictions_collection.find_one({
+                    '_id': latest['predictionId'],
+                    'userId': ObjectId(user_id)
+                })
+            else:
+                prediction = self.predictions_collection.find_one(
+                    {'userId': ObjectId(user_id)},
+                    sort=[('timestamp', -1)]
+                )
             
             if prediction:
                 prediction['_id'] = str(prediction['_id'])
@@ -66,13 +121,48 @@ class TextService:
         except Exception:
             return None
     
+    def fill_keywords(self, prediction):
+        """
+        Compute keywords of a prediction made without them, and store them
+        
+        Only the full text's word counts give the real keywords, and only
+        the 500-character snippet is kept. So they come from the stored
+        feature counts (when they match the current vocabularies); without
+        those (fast-tier prediction, failed feature write) keywords stay
+        None and the prediction is flagged keywordsUnavailable.
+        """
+        if prediction.get('keywords') is not None or prediction.get('keywordsUnavailable'):
+            return prediction
+        
+        with text_models.lease() as text_classifier:
+            counts = prediction.get('featureId') and self.feature_store.get_counts(
+                prediction['featureId'], text_classifier.feature_version(), text_classifier.vocab_sizes()
+            )
+            keywords = text_classifier.keywords_from_counts(counts) if counts else None
+        
+        update = {'keywords': keywords} if keywords is not None else {'keywordsUnavailable': True}
+        try:
+            self.predictions_collection.update_one(
+                {'_id': ObjectId(prediction['_id']), 'keywords': None},
+                {'$set': update}
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to store keywords: {str(e)}")
+        
+        prediction.update(update)
+        return prediction
+    
     def get_prediction_by_id(self, prediction_id, user_id):
         """Get specific prediction by ID"""
         try:
-            prediction = self.predictions_collection.find_one({
-                '_id': ObjectId(prediction_id),
-                'userId': ObjectId(user_id)
-            })
+            # Write-behind: serve our own not-yet-flushed write
+            prediction = self.writer.get_pending(prediction_id, user_id)
+            
+            if not prediction:
+                prediction = self.predictions_collection.find_one({
+                    '_id': ObjectId(prediction_id),
+                    'userId': ObjectId(user_id)
+                })
             
             if prediction:
                 prediction['_id'] = str(prediction['_id'])
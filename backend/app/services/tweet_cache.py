@@ -0,0 +1,177 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from app.config import Config
+from app.utils.metrics import metrics
+
+REAL_API_SOURCE = 'twitter_api_real'
+
+# Hit/miss counters shared by every TweetCache in the process
+_stats = {
+    'hits': 0,
+    'staleHits': 0,
+    'misses': 0,
+    'refreshes': 0,
+    'refreshFailures': 0,
+    'realApiReadsSaved': 0
+}
+_stats_lock = threading.Lock()
+
+def _bump(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+def cache_stats():
+    """Hit ratio and Twitter API reads avoided by the cache"""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['staleHits'] + stats['misses']
+    served = stats['hits'] + stats['staleHits']
+    stats['hitRatio'] = round(served / lookups, 4) if lookups else 0.0
+    stats['ttlSeconds'] = Config.TWEET_CACHE_TTL_SECONDS
+    stats['staleSeconds'] = Config.TWEET_CACHE_STALE_SECONDS
+    stats['fallbackTtlSeconds'] = Config.TWEET_CACHE_FALLBACK_TTL_SECONDS
+    return stats
+
+metrics.register('tweet_cache', cache_stats)
+
+class TweetCache:
+    """
+    Read-through cache of fetched tweets + profile in `cached_tweets`
+
+    Entries are fresh for TWEET_CACHE_TTL_SECONDS. With
+    TWEET_CACHE_STALE_SECONDS > 0 an expired entry is still served for that
+    long while one background refresh replaces it. `expiresAt` marks the end
+    of the stale window, so the TTL index removes entries nobody refreshed.
+
+    With real_api_enabled, entries from any other source (Mock fallback
+    after a rate limit, open breaker or lost hedge) are only fresh for
+    TWEET_CACHE_FALLBACK_TTL_SECONDS, so the real API is tried again soon.
+    """
+
+    def __init__(self, db, real_api_enabled=False):
+        self.db = db
+        self.cache_collection = db.cached_tweets
+        self.ttl = timedelta(seconds=Config.TWEET_CACHE_TTL_SECONDS)
+        self.fallback_ttl = (
+            timedelta(seconds=min(Config.TWEET_CACHE_FALLBACK_TTL_SECONDS, Config.TWEET_CACHE_TTL_SECONDS))
+            if real_api_enabled else self.ttl
+        )
+        self.stale = timedelta(seconds=Config.TWEET_CACHE_STALE_SECONDS)
+
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._executor = None
+
+    def get(self, handle):
+        """Cached entry for a handle that is still inside its stale window, or None"""
+        return self.cache_collection.find_one({
+            'twitterHandle': handle,
+            'expiresAt': {'$gt': datetime.utcnow()}
+        })
+
+    def store(self, handle, fetched):
+        """Upsert a freshly fetched {tweets, profile, source} entry"""
+        now = datetime.utcnow()
+        ttl = self.ttl if fetched['source'] == REAL_API_SOURCE else self.fallback_ttl
+        entry = {
+            'twitterHandle': handle,
+            'tweets': fetched['tweets'],
+            'tweetRecords': fetched.get('tweetRecords'),
+            'newestId': fetched.get('newestId'),
+            'profile': fetched['profile'],
+            'source': fetched['source'],
+            'fetchedAt': now,
+            'freshUntil': now + ttl,
+            'expiresAt': now + ttl + self.stale
+        }
+
+        self.cache_collection.update_one(
+            {'twitterHandle': handle},
+            {'$set': entry},
+            upsert=True
+        )
+        return entry
+
+    def get_or_fetch(self, handle, fetch):
+        """
+        Read-through lookup
+
+        Args:
+            handle: Normalized Twitter handle
+            fetch: Callable(handle) -> {tweets, profile, source} or None
+
+        Returns:
+            dict: {tweets, profile, source, cacheStatus} or None if not found
+        """
+        try:
+            entry = self.get(handle)
+        except Exception as e:
+            print(f"⚠️  Tweet cache lookup failed: {str(e)}")
+            entry = None
+
+        if entry:
+            saved = len(entry['tweets']) if entry.get('source') == REAL_API_SOURCE else 0
+            _bump('realApiReadsSaved', saved)
+
+            if entry['freshUntil'] > datetime.utcnow():
+                _bump('hits')
+                status = 'hit'
+            else:
+                _bump('staleHits')
+                status = 'stale'
+                self._refresh_in_background(handle, fetch)
+
+            print(f"💾 Tweet cache {status} for @{handle}")
+            return self._result(entry, status)
+
+        _bump('misses')
+
+        fetched = fetch(handle)
+        if not fetched:
+            return None
+
+        try:
+            self.store(handle, fetched)
+        except Exception as e:
+            print(f"⚠️  Failed to cache tweets for @{handle}: {str(e)}")
+
+        return self._result(fetched, 'miss')
+
+    @staticmethod
+    def _result(entry, status):
+        return {
+            'tweets': entry['tweets'],
+            'tweetRecords': entry.get('tweetRecords'),
+            'newestId': entry.get('newestId'),
+            'profile': entry['profile'],
+            'source': entry['source'],
+            'cacheStatus': status
+        }
+
+    def _refresh_in_background(self, handle, fetch):
+        """Refresh a stale entry once, without blocking the request"""
+        with self._refresh_lock:
+            if handle in self._refreshing:
+                return
+            self._refreshing.add(handle)
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='tweet-cache')
+
+        def refresh():
+            try:
+                fetched = fetch(handle)
+                if fetched:
+                    self.store(handle, fetched)
+                    _bump('refreshes')
+                else:
+                    _bump('refreshFailures')
+            except Exception as e:
+                _bump('refreshFailures')
+                print(f"⚠️  Background refresh failed for @{handle}: {str(e)}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(handle)
+
+        self._executor.submit(refresh)
\ No newline at end of file
@@ -0,0 +1,138 @@
+import threading
+import numpy as np
+from datetime import datetime
+from bson import Binary
+from app.utils.metrics import metrics
+
+_stats = {'encodedTweets': 0, 'reusedTweets': 0, 'rebuilds': 0}
+_stats_lock = threading.Lock()
+
+def _bump(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+def feature_store_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats['encodedTweets'] + stats['reusedTweets']
+    stats['reuseRatio'] = round(stats['reusedTweets'] / total, 4) if total else 0.0
+    return stats
+
+metrics.register('tweet_features', feature_store_stats)
+
+def merge_records(new_records, previous_records, window):
+    """Newest-first union of tweet records by ID, trimmed to `window`"""
+    merged = {}
+    for record in list(new_records) + list(previous_records):
+        merged.setdefault(record['id'], record)
+    return sorted(merged.values(), key=lambda r: int(r['id']), reverse=True)[:window]
+
+class TweetFeatureStore:
+    """
+    Persisted per-tweet model features for incremental re-analysis
+
+    `tweet_features` keeps, per handle, the last `window` tweets with
+    their BERT embedding (float16) and per-dimension word counts. A
+    re-analysis only encodes tweets that aren't stored yet, then pools:
+    embeddings are mean-pooled and counts summed (what the vectorizers
+    would count over the joined text). Dropping an old tweet just removes
+    its row, so nothing has to be subtracted.
+
+    Stored features are tied to the model's feature_version(); a model or
+    vocabulary change rebuilds them on the next analysis.
+    """
+
+    def __init__(self, db, window=20):
+        self.db = db
+        self.features_collection = db.tweet_features
+        self.window = window
+
+    def get(self, handle):
+        """Stored state for a handle, or None"""
+        return self.features_collection.find_one({'twitterHandle': handle})
+
+    def pooled_features(self, text_classifier, handle, records, source):
+        """
+        Pooled features for `records`, encoding only tweets not stored yet
+
+        Args:
+            text_classifier: Leased model version doing the analysis
+            handle: Normalized Twitter handle
+            records: [{id, text}] newest first (the tweets being analyzed)
+            source: Source the records came from
+
+        Returns:
+            tuple: (embedding, {dimension: counts}, {encodedTweets, reusedTweets})
+        """
+        version = text_classifier.feature_version()
+        state = self.get(handle)
+
+        known = {}
+        if state and state.get('featureVersion') == version and state.get('source') == source:
+            known = {entry['id']: entry for entry in state['tweets']}
+        elif state:
+            _bump('rebuilds')
+
+        missing = [record for record in records if record['id'] not in known]
+
+        if missing:
+            embeddings, counts = text_classifier.encode_units([r['text'] for r in missing])
+            for i, record in enumerate(missing):
+                known[record['id']] = self._entry(record, embeddings[i], {
+                    dim: rows.getrow(i) for dim, rows in counts.items()
+                })
+
+        entries = [known[record['id']] for record in records]
+
+        _bump('encodedTweets', len(missing))
+        _bump('reusedTweets', len(entries) - len(missing))
+
+        stored_ids = [entry['id'] for entry in state['tweets']] if state else None
+        if missing or stored_ids != [entry['id'] for entry in entries]:
+            self._save(handle, source, version, entries)
+
+        embedding = np.mean([
+            np.frombuffer(entry['embedding'], dtype=np.float16).astype(np.float32)
+            for entry in entries
+        ], axis=0)
+
+        pooled_counts = {}
+        for dim in text_classifier.DIMENSIONS:
+            totals = np.zeros(len(text_classifier.vectorizers[dim].vocabulary_))
+            for entry in entries:
+                np.add.at(totals, entry['counts'][dim]['i'], entry['counts'][dim]['c'])
+            pooled_counts[dim] = totals
+
+        return embedding, pooled_counts, {
+            'encodedTweets': len(missing),
+            'reusedTweets': len(entries) - len(missing)
+        }
+
+    @staticmethod
+    def _entry(record, embedding, counts):
+        return {
+            'id': record['id'],
+            'text': record['text'],
+            'embedding': Binary(np.asarray(embedding, dtype=np.float16).tobytes()),
+            'counts': {
+                dim: {'i': row.indices.tolist(), 'c': row.data.tolist()}
+                for dim, row in counts.items()
+            }
+        }
+
+    def _save(self, handle, source, version, entries):
+        try:
+            self.features_collection.update_one(
+                {'twitterHandle': handle},
+                {'$set': {
+                    'twitterHandle': handle,
+                    'source': source,
+                    'featureVersion': version,
+                    'newestId': entries[0]['id'] if entries else None,
+                    'tweets': entries[:self.window],
+                    'updatedAt': datetime.utcnow()
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to store tweet features for @{handle}: {str(e)}")
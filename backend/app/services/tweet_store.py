@@ -0,0 +1,78 @@
+import hashlib
+from datetime import datetime
+from pymongo import UpdateOne
+from app.utils.cache import TTLCache
+from app.utils.metrics import metrics
+
+# Keys this process has already written; popular handles skip the upsert
+_known_keys = TTLCache(maxsize=50000, ttl=3600)
+_stats = {'stored': 0, 'skipped': 0, 'hydrated': 0}
+
+metrics.register('tweet_store', lambda: {**_stats, 'knownKeys': _known_keys.stats()})
+
+def content_key(text):
+    """Content-addressed tweet key: identical text is stored once"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+class TweetStore:
+    """
+    Deduplicated tweet texts in `tweets`, keyed by content hash
+
+    twitter_predictions reference tweets by key (`tweetIds`) instead of
+    embedding the text, so a handle analyzed by thousands of users keeps
+    one copy of each tweet. Tweets are hydrated only for /result/<id>.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.tweets_collection = db.tweets
+
+    def store(self, texts):
+        """
+        Make sure every text is stored
+
+        Returns:
+            list: Content keys, in the order of `texts`
+        """
+        keys = [content_key(text) for text in texts]
+
+        now = datetime.utcnow()
+        unknown = {key: text for key, text in zip(keys, texts) if not _known_keys.get(key)}
+
+        if unknown:
+            self.tweets_collection.bulk_write([
+                UpdateOne(
+                    {'_id': key},
+                    {'$setOnInsert': {'text': text, 'length': len(text), 'firstSeenAt': now}},
+                    upsert=True
+                )
+                for key, text in unknown.items()
+            ], ordered=False)
+            for key in unknown:
+                _known_keys.set(key, True)
+
+        _stats['stored'] += len(unknown)
+        _stats['skipped'] += len(keys) - len(unknown)
+        return keys
+
+    def hydrate(self, keys):
+        """
+        Tweet objects for a prediction, in analysis order
+
+        Returns:
+            list: [{index, text, length}] (missing keys are skipped)
+        """
+        if not keys:
+            return []
+
+        found = {
+            tweet['_id']: tweet
+            for tweet in self.tweets_collection.find({'_id': {'$in': list(set(keys))}})
+        }
+        _stats['hydrated'] += 1
+
+        return [
+            {'index': i + 1, 'text': found[key]['text'], 'length': found[key]['length']}
+            for i, key in enumerate(keys)
+            if key in found
+        ]
@@ -1,13 +1,35 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeout
 from datetime import datetime
 from bson import ObjectId
-from app.ml_models.text_classifier import text_classifier
-from app.services.twitter_real_api_client import twitter_real_client
+from app.ml_models.text_classifier import text_models
+from app.services.twitter_real_api_client import twitter_real_client, RateLimited, TwitterUnavailable
 from app.services.twitter_mock_api_client import twitter_mock_client
+from app.services.summary_service import SummaryService
+from app.services.prediction_writer import PredictionWriter
+from app.services.tweet_cache import TweetCache, REAL_API_SOURCE
+from app.services.tweet_feature_store import TweetFeatureStore, merge_records
+from app.services.tweet_store import TweetStore
+from app.services.analysis_cache import AnalysisCache
+from app.services.prediction_features import PredictionFeatureStore
+from app.services.twitter_quota import TwitterQuotaLedger
+from app.utils.singleflight import SingleFlight
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.metrics import metrics
+from app.config import Config
 import os
 
 # Toggle: Set to True to use Real API, False for Mock API
 USE_REAL_API = os.getenv('USE_REAL_TWITTER_API', 'false').lower() == 'true'
 
+# Reads reserved per real analysis (one timeline page of 20 tweets)
+REAL_API_READ_COST = 20
+
+MOCK_API_SOURCE = 'mock_api'
+
+# List/latest views never carry tweets; /result/<id> hydrates them
+WITHOUT_TWEETS = {'tweets': 0, 'tweetIds': 0}
+
 class TwitterHybridService:
     """
     Hybrid Twitter service - tries Real API first, falls back to Mock
@@ -16,116 +38,591 @@ class TwitterHybridService:
     def __init__(self, db):
         self.db = db
         self.predictions_collection = db.twitter_predictions
+        self.summary_service = SummaryService(db)
+        self.writer = PredictionWriter(self.predictions_collection)
+        self.tweet_cache = TweetCache(db, real_api_enabled=USE_REAL_API and twitter_real_client.is_available())
+        self.feature_store = TweetFeatureStore(db, window=REAL_API_READ_COST)
+        self.tweet_store = TweetStore(db)
+        self.analysis_cache = AnalysisCache(db)
+        self.prediction_features = PredictionFeatureStore(db)
+        self.inflight = SingleFlight()
+        self.quota = TwitterQuotaLedger(db)
+        self.real_breaker = CircuitBreaker(
+            'twitter_real',
+            failure_threshold=Config.TWITTER_BREAKER_FAILURES,
+            window_seconds=Config.TWITTER_BREAKER_WINDOW_SECONDS,
+            slow_call_seconds=Config.TWITTER_BREAKER_SLOW_SECONDS,
+            open_seconds=Config.TWITTER_BREAKER_OPEN_SECONDS,
+            half_open_calls=Config.TWITTER_BREAKER_HALF_OPEN_CALLS
+        )
+        # Hedged fetches run the real call off the request thread
+        self.hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='twitter-hedge')
+        self.hedge_stats = {'hedged': 0, 'fallbackWon': 0, 'primaryWon': 0}
+        metrics.register('twitter_coalescing', lambda: {
+            **self.inflight.stats,
+            'inFlight': self.inflight.in_flight()
+        })
+        if USE_REAL_API:
+            metrics.register('twitter_quota', self.quota.status)
+            metrics.register('twitter_breaker', lambda: {
+                **self.real_breaker.snapshot(),
+                'hedge': dict(self.hedge_stats),
+                'hedgeAfterSeconds': Config.TWITTER_HEDGE_AFTER_SECONDS
+            })
         
         # Print which mode we're in
         if USE_REAL_API and twitter_real_client.is_available():
-            print("🔵 Twitter Module: REAL API MODE (Limited to 100 reads/month)")
-            print("⚠️  WARNING: Each analysis uses 20 tweets, so limit usage!")
+            print(f"🔵 Twitter Module: REAL API MODE (Limited to {self.quota.limit} reads/{Config.TWITTER_QUOTA_WINDOW})")
+            print("⚠️  Analyses fall back to Mock once the quota can't cover 20 tweets")
         else:
             print("🟢 Twitter Module: MOCK API MODE (Unlimited)")
     
-    def analyze_twitter(self, username, user_id):
-        """Analyze Twitter profile - tries Real API first, falls back to Mock"""
+    def analyze_twitter(self, username, user_id, progress=None, include_keywords=True):
+        """
+        Analyze Twitter profile - tries Real API first, falls back to Mock
+        
+        Args:
+            progress: Optional progress(stage) callback (used by analysis jobs)
+            include_keywords: False skips keyword extraction; the prediction
+                is stored with keywords None (see fill_keywords)
+        """
         try:
             username = username.lstrip('@').lower()
             
-            tweets = None
-            profile = None
-            source = None
+            if progress:
+                progress('fetching')
             
-            # Try Real API first (if enabled)
-            if USE_REAL_API and twitter_real_client.is_available():
-                print(f"\n{'='*60}")
-                print(f"🔵 Attempting REAL Twitter API for @{username}")
-                print(f"{'='*60}")
-                
-                tweets = twitter_real_client.get_user_tweets(username, max_tweets=20)
-                
-                if tweets and len(tweets) >= 5:
-                    profile = twitter_real_client.get_user_profile(username)
-                    source = 'twitter_api_real'
-                    print(f"✅ SUCCESS: Using Real Twitter API")
+            # Concurrent analyses of one handle share a single fetch + prediction
+            analysis, shared = self.inflight.do(
+                username, lambda: self._analyze_handle(username, progress, include_keywords)
+            )
+            
+            if analysis.get('error'):
+                return None, analysis['error']
+            
+            if shared:
+                print(f"🔗 Reused in-flight analysis of @{username}")
+            
+            if include_keywords and analysis['keywords'] is None:
+                # Shared with a caller that skipped them
+                with text_models.lease() as text_classifier:
+                    analysis = {**analysis, 'keywords': self._keywords(
+                        text_classifier, analysis['featureId'], analysis['combinedText']
+                    )}
+            
+            if progress:
+                progress('saving')
+            
+            # Tweets are stored once in db.tweets; the prediction references them
+            tweet_ids = self.tweet_store.store(analysis['tweets'])
+            prediction = self._build_prediction(analysis, username, user_id, tweet_ids)
+            
+            prediction_id = self.writer.insert(prediction, on_written=self._record_summary)
+            
+            print(f"✅ Analysis complete: {analysis['mbtiType']}")
+            print(f"   Source: {analysis['source']}")
+            print(f"{'='*60}\n")
+            
+            return self._result_payload(prediction_id, prediction), None
+            
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return None, f'Analysis failed: {str(e)}'
+    
+    def analyze_batch(self, usernames, user_id, progress=None):
+        """
+        Analyze many handles: concurrent fetches, one batched inference
+        pass and one bulk insert
+        
+        Fetches go through the tweet cache and the usual source chain (so
+        quota and circuit breaker apply), at most TWITTER_BATCH_CONCURRENCY
+        at a time. A handle that can't be analyzed gets an error entry
+        instead of failing the batch.
+        
+        Args:
+            usernames: Handles to analyze (duplicates are analyzed once)
+            progress: Optional progress(stage) callback (used by analysis jobs)
+        
+        Returns:
+            tuple: ({results, succeeded, failed}, error)
+        """
+        try:
+            handles = list(dict.fromkeys(
+                u.strip().lstrip('@').lower() for u in usernames if u and u.strip().lstrip('@')
+            ))
+            
+            if not handles:
+                return None, 'At least one username is required'
+            
+            if len(handles) > Config.TWITTER_BATCH_MAX_HANDLES:
+                return None, f'At most {Config.TWITTER_BATCH_MAX_HANDLES} usernames per batch'
+            
+            if progress:
+                progress('fetching')
+            
+            print(f"\n📦 Batch analysis of {len(handles)} handles")
+            
+            with ThreadPoolExecutor(max_workers=Config.TWITTER_BATCH_CONCURRENCY,
+                                    thread_name_prefix='twitter-batch') as executor:
+                prepared = list(executor.map(self._prepare_handle_safely, handles))
+            
+            errors = {}
+            ready = []
+            for username, item in zip(handles, prepared):
+                if item.get('error'):
+                    errors[username] = item['error']
                 else:
-                    print(f"⚠️  Real API returned insufficient data, falling back to Mock")
+                    ready.append((username, item))
             
-            # Fallback to Mock API
-            if not tweets:
-                print(f"\n{'='*60}")
-                print(f"🟢 Using Mock API for @{username}")
-                print(f"{'='*60}")
+            predictions = []
+            if ready:
+                if progress:
+                    progress('analyzing')
                 
-                tweets = twitter_mock_client.get_user_tweets(username, max_tweets=20)
+                # One model version for the whole batch
+                with text_models.lease() as text_classifier:
+                    # Cached outputs first; one inference pass over the rest
+                    model_key = self._model_key(text_classifier, pooled=False)
+                    cache_keys = [self.analysis_cache.key(u, item['tweets'], model_key) for u, item in ready]
+                    cached_outputs = self.analysis_cache.get_many(cache_keys)
+                    
+                    to_predict = [i for i, key in enumerate(cache_keys) if key not in cached_outputs]
+                    texts = [ready[i][1]['combinedText'] for i in to_predict]
+                    print(f"🤖 Batch inference over {len(to_predict)} profiles ({len(ready) - len(to_predict)} cached)...")
+                    predicted = text_classifier.predict_batch(texts, return_features=True) if to_predict else []
+                    
+                    feature_ids = [self._feature_id(text_classifier, u, item['tweets'], pooled=False) for u, item in ready]
+                    feature_version = text_classifier.feature_version()
+                    model_version = text_classifier.inference_version()
                 
-                if tweets and len(tweets) >= 5:
-                    profile = twitter_mock_client.get_user_profile(username)
-                    source = 'mock_api'
-                else:
-                    return None, f'Username @{username} not found'
+                if predicted:
+                    text_models.shadow(lambda candidate: candidate.predict_batch(texts, include_keywords=False), predicted)
                 
-            # Store individual tweets (NEW)
-            tweet_objects = []
-            for i, tweet_text in enumerate(tweets):
-                tweet_objects.append({
-                    'index': i + 1,
-                    'text': tweet_text,
-                    'length': len(tweet_text)
-                })
-
+                outputs = [None] * len(ready)
+                for i, (mbti_type, confidence, keywords, features) in zip(to_predict, predicted):
+                    outputs[i] = (mbti_type, confidence, keywords)
+                    self.analysis_cache.store(cache_keys[i], ready[i][0], mbti_type, confidence, keywords)
+                    if features is None:
+                        feature_ids[i] = None  # Resolved by the fast tier, nothing to re-score
+                self.prediction_features.save_many([
+                    (feature_ids[i], 'twitter', features)
+                    for i, (*_, features) in zip(to_predict, predicted)
+                    if features is not None
+                ], feature_version)
+                for i, key in enumerate(cache_keys):
+                    if outputs[i] is None:
+                        cached = cached_outputs[key]
+                        keywords = cached['keywords']
+                        if keywords is None:
+                            # Cached by a request that skipped keywords
+                            with text_models.lease() as text_classifier:
+                                keywords = self._keywords(text_classifier, feature_ids[i], ready[i][1]['combinedText'])
+                        outputs[i] = (cached['mbtiType'], cached['confidence'], keywords)
+                
+                if progress:
+                    progress('saving')
+                
+                # One bulk upsert for every handle's tweets
+                tweet_ids = self.tweet_store.store([t for _, item in ready for t in item['tweets']])
+                
+                offset = 0
+                for (username, item), (mbti_type, confidence, keywords), feature_id in zip(ready, outputs, feature_ids):
+                    analysis = {
+                        **item,
+                        'mbtiType': mbti_type,
+                        'confidence': confidence,
+                        'keywords': keywords,
+                        'featureId': feature_id,
+                        'modelVersion': model_version
+                    }
+                    count = len(item['tweets'])
+                    predictions.append(self._build_prediction(
+                        analysis, username, user_id, tweet_ids[offset:offset + count]
+                    ))
+                    offset += count
+                
+                self.writer.insert_many(predictions, on_written=self._record_summary)
             
-            # Combine tweets and predict
-            combined_text = ' '.join(tweets)
-            
-            if len(combined_text) < 100:
-                return None, 'Not enough tweet content for analysis.'
-            
-            print(f"\n🤖 Analyzing {len(combined_text)} characters with ML model...")
-            mbti_type, confidence, keywords = text_classifier.predict(combined_text)
-            
-            # Save prediction WITH TWEETS (UPDATED)
-            prediction = {
-                'userId': ObjectId(user_id),
-                'username': username,
-                'mbtiType': mbti_type,
-                'confidence': confidence,
-                'tweetCount': len(tweets),
-                'tweets': tweet_objects,  # NEW: Store actual tweets
-                'totalCharacters': len(combined_text),
-                'keywords': keywords,
-                'source': source,
-                'profileInfo': profile,
-                'timestamp': datetime.utcnow(),
-                'ml_enhanced': True
-            }
-            
-            result = self.predictions_collection.insert_one(prediction)
-            
-            print(f"✅ Analysis complete: {mbti_type}")
-            print(f"   Source: {source}")
-            print(f"{'='*60}\n")
+            saved = {prediction['username']: prediction for prediction in predictions}
+            results = []
+            for username in handles:
+                if username in saved:
+                    prediction = saved[username]
+                    results.append({
+                        'status': 'ok',
+                        **self._result_payload(prediction['_id'], prediction)
+                    })
+                else:
+                    results.append({'status': 'error', 'username': username, 'error': errors[username]})
+            
+            print(f"✅ Batch complete: {len(predictions)} analyzed, {len(errors)} failed\n")
             
             return {
-                'predictionId': str(result.inserted_id),
-                'username': username,
-                'mbtiType': mbti_type,
-                'confidence': confidence,
-                'tweetCount': len(tweets),
-                'keywords': keywords,
-                'source': source,
-                'profileInfo': profile
+                'results': results,
+                'succeeded': len(predictions),
+                'failed': len(errors)
             }, None
             
         except Exception as e:
             import traceback
             traceback.print_exc()
-            return None, f'Analysis failed: {str(e)}'
+            return None, f'Batch analysis failed: {str(e)}'
+    
+    def _analyze_handle(self, username, progress=None, include_keywords=True):
+        """
+        Fetch (through the cache) and predict for one handle - user independent
+        
+        Returns:
+            dict: Analysis fields, or {'error': message}
+        """
+        prepared = self._prepare_handle(username)
+        
+        if prepared.get('error'):
+            return prepared
+        
+        if progress:
+            progress('analyzing')
+        
+        # One model version for the whole analysis
+        with text_models.lease() as text_classifier:
+            return self._analyze_prepared(text_classifier, username, prepared, include_keywords)
+    
+    def _analyze_prepared(self, text_classifier, username, prepared, include_keywords=True):
+        """Predict for fetched tweets with a leased model version"""
+        pooled = bool(Config.TWITTER_INCREMENTAL and prepared.get('tweetRecords') and text_classifier.is_loaded)
+        model_version = text_classifier.inference_version()
+        
+        # Same tweets through the same model: reuse another user's result
+        cache_key = self.analysis_cache.key(username, prepared['tweets'], self._model_key(text_classifier, pooled))
+        cached_output = self.analysis_cache.get(cache_key)
+        
+        # Content-keyed, so the cached analysis' features are under the same id
+        feature_id = self._feature_id(text_classifier, username, prepared['tweets'], pooled)
+        
+        if cached_output:
+            print(f"\n♻️  Reusing cached analysis of @{username}")
+            if include_keywords and cached_output['keywords'] is None:
+                cached_output['keywords'] = self._keywords(text_classifier, feature_id, prepared['combinedText'])
+                self.analysis_cache.store(cache_key, username, cached_output['mbtiType'],
+                                          cached_output['confidence'], cached_output['keywords'])
+            return {**prepared, **cached_output, 'featureId': feature_id, 'modelVersion': model_version}
+        
+        if pooled:
+            # Encode only tweets we haven't seen; pool with the stored ones
+            embedding, counts, reuse = self.feature_store.pooled_features(
+                text_classifier, username, prepared['tweetRecords'], prepared['source']
+            )
+            print(f"\n🤖 Incremental analysis: {reuse['encodedTweets']} new, {reuse['reusedTweets']} reused tweets")
+            mbti_type, confidence, keywords, features = text_classifier.predict_from_features(
+                embedding, counts, prepared['combinedText'], return_features=True,
+                include_keywords=include_keywords
+            )
+        else:
+            print(f"\n🤖 Analyzing {prepared['totalCharacters']} characters with ML model...")
+            mbti_type, confidence, keywords, features = text_classifier.predict_batch(
+                [prepared['combinedText']], return_features=True, include_keywords=include_keywords
+            )[0]
+            text_models.shadow(
+                lambda candidate: candidate.predict_batch([prepared['combinedText']], include_keywords=False),
+                [(mbti_type, confidence)]
+            )
+        
+        self.analysis_cache.store(cache_key, username, mbti_type, confidence, keywords)
+        stored = features is not None and self.prediction_features.save(
+            feature_id, 'twitter', features, text_classifier.feature_version()
+        )
+        
+        return {
+            **prepared,
+            'mbtiType': mbti_type,
+            'confidence': confidence,
+            'keywords': keywords,
+            'featureId': feature_id if stored else None,
+            'modelVersion': model_version
+        }
+    
+    def _keywords(self, text_classifier, feature_id, text):
+        """Keywords from stored word counts if they match the model, else from the text"""
+        counts = feature_id and self.prediction_features.get_counts(
+            feature_id, text_classifier.feature_version(), text_classifier.vocab_sizes()
+        )
+        if counts:
+            return text_classifier.keywords_from_counts(counts)
+        return text_classifier.extract_keywords(text)
+    
+    @staticmethod
+    def _model_key(text_classifier, pooled):
+        """Model version + inference path, for the analysis cache key"""
+        return f"{text_classifier.inference_version()}:{'pooled' if pooled else 'full'}"
+    
+    def _feature_id(self, text_classifier, username, tweets, pooled):
+        """Content key of a tweet set's stored model inputs (shared across users)"""
+        path = 'pooled' if pooled else 'full'
+        return 'twitter:' + self.analysis_cache.key(username, tweets, f'{text_classifier.feature_version()}:{path}')
+    
+    def _prepare_handle(self, username):
+        """
+        Fetch tweets for a handle and build the text to classify
+        
+        Returns:
+            dict: Cached fields plus combinedText, or {'error': message}
+        """
+        # Cached tweets first; real/mock sources only on a miss
+        fetch = self._fetch_incremental if Config.TWITTER_INCREMENTAL else self._fetch_from_sources
+        cached = self.tweet_cache.get_or_fetch(username, fetch)
+        
+        if not cached:
+            return {'error': f'Username @{username} not found'}
+        
+        tweets = cached['tweets']
+        
+        # Combine tweets and predict
+        combined_text = ' '.join(tweets)
+        
+        if len(combined_text) < 100:
+            return {'error': 'Not enough tweet content for analysis.'}
+        
+        return {
+            **cached,
+            'combinedText': combined_text,
+            'totalCharacters': len(combined_text)
+        }
+    
+    def _fetch_incremental(self, username):
+        """
+        Fetch only tweets newer than the stored feature state, then merge
+        
+        Returns the same shape as _fetch_from_sources, holding the newest
+        tweets of the merged set, so caching and analysis are unchanged.
+        """
+        try:
+            state = self.feature_store.get(username)
+        except Exception as e:
+            print(f"⚠️  Feature state lookup failed: {str(e)}")
+            state = None
+        
+        if not state or not state.get('newestId'):
+            return self._fetch_from_sources(username)
+        
+        fetched = self._fetch_from_sources(username, since={
+            'source': state['source'],
+            'newestId': state['newestId']
+        })
+        
+        if not fetched or fetched['source'] != state['source']:
+            # Different source: that was a full fetch already
+            return fetched
+        
+        records = merge_records(
+            fetched.get('tweetRecords') or [],
+            [{'id': t['id'], 'text': t['text']} for t in state['tweets']],
+            self.feature_store.window
+        )
+        print(f"🔁 @{username}: {len(fetched.get('tweetRecords') or [])} new tweets since {state['newestId']}")
+        
+        return {
+            **fetched,
+            'tweets': [r['text'] for r in records],
+            'tweetRecords': records,
+            'newestId': records[0]['id'] if records else state['newestId']
+        }
+    
+    def _prepare_handle_safely(self, username):
+        """_prepare_handle for batch workers: one bad handle must not sink the batch"""
+        try:
+            return self._prepare_handle(username)
+        except Exception as e:
+            return {'error': f'Fetch failed: {str(e)}'}
+    
+    @staticmethod
+    def _build_prediction(analysis, username, user_id, tweet_ids):
+        """Prediction document for one analyzed handle (tweets by reference)"""
+        return {
+            'userId': ObjectId(user_id),
+            'username': username,
+            'mbtiType': analysis['mbtiType'],
+            'confidence': analysis['confidence'],
+            'tweetCount': len(tweet_ids),
+            'tweetIds': tweet_ids,  # Keys into db.tweets, hydrated on /result/<id>
+            'totalCharacters': analysis['totalCharacters'],
+            'keywords': analysis['keywords'],
+            'source': analysis['source'],
+            'cacheStatus': analysis['cacheStatus'],
+            'profileInfo': analysis['profile'],
+            'timestamp': datetime.utcnow(),
+            'ml_enhanced': True,
+            'modelVersion': analysis.get('modelVersion'),
+            'featureId': analysis.get('featureId')  # Stored model inputs, for re-scoring
+        }
+    
+    @staticmethod
+    def _result_payload(prediction_id, prediction):
+        """API response fields for a saved prediction"""
+        return {
+            'predictionId': str(prediction_id),
+            'username': prediction['username'],
+            'mbtiType': prediction['mbtiType'],
+            'confidence': prediction['confidence'],
+            'tweetCount': prediction['tweetCount'],
+            'keywords': prediction['keywords'],
+            'source': prediction['source'],
+            'cacheStatus': prediction['cacheStatus'],
+            'profileInfo': prediction['profileInfo']
+        }
+    
+    def _fetch_from_sources(self, username, since=None):
+        """
+        Fetch tweets and profile - tries Real API first, falls back to Mock
+        
+        Each source answers with one user lookup + one timeline call. The
+        real API is skipped (straight to Mock, no waiting) while its circuit
+        breaker is open, when the shared quota can't cover the reads, or
+        after a rate limit. With TWITTER_HEDGE_AFTER_SECONDS set, a slow real
+        call is raced against Mock instead of waited out.
+        
+        Args:
+            since: Optional {source, newestId}; the matching source only
+                returns newer tweets (possibly none)
+        
+        Returns:
+            dict: {tweets, tweetRecords, newestId, profile, source} or None if not found
+        """
+        # Try Real API first (if enabled, healthy and within quota)
+        if USE_REAL_API and twitter_real_client.is_available():
+            if not self.real_breaker.allow():
+                print(f"⏭️  Real API circuit open, using Mock for @{username}")
+            elif not self.quota.try_reserve(REAL_API_READ_COST):
+                self.real_breaker.cancel()
+                print(f"⏭️  Real API quota exhausted or rate limited, using Mock for @{username}")
+            elif Config.TWITTER_HEDGE_AFTER_SECONDS > 0:
+                return self._hedged_fetch(username, since)
+            else:
+                fetched = self._fetch_real(username, since)
+                if fetched:
+                    return fetched
+                print(f"⚠️  Real API returned insufficient data, falling back to Mock")
+        
+        return self._fetch_mock(username, since)
+    
+    @staticmethod
+    def _since_id(since, source):
+        """since_id to send to `source` (IDs from another source mean nothing)"""
+        if since and since.get('source') == source:
+            return since.get('newestId')
+        return None
+    
+    def _fetch_real(self, username, since=None):
+        """
+        One real API fetch; the caller has passed the breaker and reserved quota
+        
+        Returns:
+            dict: Fetched data with source, or None
+        """
+        print(f"\n{'='*60}")
+        print(f"🔵 Attempting REAL Twitter API for @{username}")
+        print(f"{'='*60}")
+        
+        fetched = None
+        since_id = self._since_id(since, REAL_API_SOURCE)
+        started = time.perf_counter()
+        try:
+            fetched = twitter_real_client.get_profile_and_tweets(
+                username, max_tweets=REAL_API_READ_COST, since_id=since_id
+            )
+        except RateLimited as e:
+            # Quota problem, not an outage
+            self.real_breaker.cancel()
+            self.quota.block_until(e.reset_at)
+        except TwitterUnavailable:
+            self.real_breaker.record_failure()
+        else:
+            self.real_breaker.record_success(time.perf_counter() - started)
+        
+        # Charge every post the timeline call returned (filtered-out ones are billed too)
+        posts_read = fetched.pop('postsRead', 0) if fetched else 0
+        self.quota.settle(REAL_API_READ_COST, posts_read)
+        
+        if fetched and (since_id or len(fetched['tweets']) >= 5):
+            print(f"✅ SUCCESS: Using Real Twitter API")
+            return {**fetched, 'source': REAL_API_SOURCE}
+        
+        return None
+    
+    def _fetch_mock(self, username, since=None):
+        """Fetch from the Mock API"""
+        print(f"\n{'='*60}")
+        print(f"🟢 Using Mock API for @{username}")
+        print(f"{'='*60}")
+        
+        since_id = self._since_id(since, MOCK_API_SOURCE)
+        fetched = twitter_mock_client.get_profile_and_tweets(username, max_tweets=20, since_id=since_id)
+        
+        if fetched and (since_id or len(fetched['tweets']) >= 5):
+            return {**fetched, 'source': MOCK_API_SOURCE}
+        
+        return None
+    
+    def _hedged_fetch(self, username, since=None):
+        """
+        Real API with a deadline: if it hasn't answered within
+        TWITTER_HEDGE_AFTER_SECONDS, start Mock too and take the first usable answer
+        
+        A real call that loses the race keeps running in the background so
+        the breaker still sees its outcome and latency.
+        """
+        primary = self.hedge_executor.submit(self._fetch_real, username, since)
+        
+        try:
+            fetched = primary.result(timeout=Config.TWITTER_HEDGE_AFTER_SECONDS)
+            return fetched or self._fetch_mock(username, since)
+        except FutureTimeout:
+            pass
+        
+        self.hedge_stats['hedged'] += 1
+        print(f"⏱️  Real API slower than {Config.TWITTER_HEDGE_AFTER_SECONDS}s, hedging with Mock")
+        fallback = self.hedge_executor.submit(self._fetch_mock, username, since)
+        
+        done, _ = wait([primary, fallback], return_when=FIRST_COMPLETED)
+        
+        if primary in done and primary.result():
+            self.hedge_stats['primaryWon'] += 1
+            return primary.result()
+        
+        fetched = fallback.result()
+        if fetched:
+            self.hedge_stats['fallbackWon'] += 1
+            return fetched
+        
+        # Mock doesn't know this handle; the real API is the only hope
+        return primary.result()
+    
+    def _record_summary(self, prediction):
+        """Refresh the user's summary once the prediction is stored"""
+        self.summary_service.record_prediction(
+            prediction['userId'], 'twitter', prediction['_id'],
+            prediction['mbtiType'], prediction['confidence'], prediction['timestamp'],
+            extra={'username': prediction['username']}
+        )
     
     def get_latest_prediction(self, user_id):
         """Get user's most recent Twitter prediction"""
         try:
-            prediction = self.predictions_collection.find_one(
-                {'userId': ObjectId(user_id)},
-                sort=[('timestamp', -1)]
-            )
+            # Point lookup through the user summary; sorted scan only if not backfilled yet
+            latest = self.summary_service.get_latest_entry(user_id, 'twitter')
+            
+            # Tweets are only hydrated for /result/<id>
+            if latest:
+                prediction = self.predictions_collection.find_one({
+                    '_id': latest['predictionId'],
+                    'userId': ObjectId(user_id)
+                }, WITHOUT_TWEETS)
+            else:
+                prediction = self.predictions_collection.find_one(
+                    {'userId': ObjectId(user_id)},
+                    WITHOUT_TWEETS,
+                    sort=[('timestamp', -1)]
+                )
             
             if prediction:
                 prediction['_id'] = str(prediction['_id'])
@@ -136,15 +633,61 @@ class TwitterHybridService:
         except Exception:
             return None
     
+    def fill_keywords(self, prediction):
+        """
+        Compute keywords of a prediction made without them, and store them
+        
+        Uses the prediction's stored word counts when they came from the
+        current vocabularies, else its tweets.
+        """
+        if prediction.get('keywords') is not None:
+            return prediction
+        
+        with text_models.lease() as text_classifier:
+            counts = prediction.get('featureId') and self.prediction_features.get_counts(
+                prediction['featureId'], text_classifier.feature_version(), text_classifier.vocab_sizes()
+            )
+            if counts:
+                keywords = text_classifier.keywords_from_counts(counts)
+            else:
+                keywords = text_classifier.extract_keywords(self._prediction_text(prediction))
+        
+        try:
+            self.predictions_collection.update_one(
+                {'_id': ObjectId(prediction['_id']), 'keywords': None},
+                {'$set': {'keywords': keywords}}
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to store keywords: {str(e)}")
+        
+        prediction['keywords'] = keywords
+        return prediction
+    
+    def _prediction_text(self, prediction):
+        """Combined tweet text of a stored prediction"""
+        tweets = prediction.get('tweets')
+        if tweets is None:
+            # List/latest views don't carry tweets
+            stored = self.predictions_collection.find_one({'_id': ObjectId(prediction['_id'])}, {'tweetIds': 1})
+            tweets = self.tweet_store.hydrate((stored or {}).get('tweetIds'))
+        return ' '.join(tweet['text'] if isinstance(tweet, dict) else tweet for tweet in tweets)
+    
     def get_prediction_by_id(self, prediction_id, user_id):
         """Get specific prediction by ID"""
         try:
-            prediction = self.predictions_collection.find_one({
-                '_id': ObjectId(prediction_id),
-                'userId': ObjectId(user_id)
-            })
+            # Write-behind: serve our own not-yet-flushed write
+            prediction = self.writer.get_pending(prediction_id, user_id)
+            
+            if not prediction:
+                prediction = self.predictions_collection.find_one({
+                    '_id': ObjectId(prediction_id),
+                    'userId': ObjectId(user_id)
+                })
             
             if prediction:
+                # Referenced tweets -> tweet objects (older documents embed them)
+                if 'tweetIds' in prediction:
+                    prediction['tweets'] = self.tweet_store.hydrate(prediction.pop('tweetIds'))
                 prediction['_id'] = str(prediction['_id'])
                 prediction['userId'] = str(prediction['userId'])
                 return prediction
@@ -157,7 +700,8 @@ class TwitterHybridService:
         """Get all predictions for a user"""
         try:
             predictions = list(self.predictions_collection.find(
-                {'userId': ObjectId(user_id)}
+                {'userId': ObjectId(user_id)},
+                WITHOUT_TWEETS
             ).sort('timestamp', -1))
             
             for pred in predictions:
@@ -1,5 +1,48 @@
 import requests
-import os
+from requests.adapters import HTTPAdapter
+from app.config import Config
+
+class InProcessTransport:
+    """Calls the mock data layer directly - no HTTP, no extra worker"""
+    
+    def __init__(self):
+        # Imported lazily so the HTTP-only setup never loads mock data
+        from app.services.mock_twitter_store import mock_twitter_store
+        self.store = mock_twitter_store
+    
+    def get_user(self, username):
+        payload, status = self.store.get_user(username)
+        return status, payload
+    
+    def get_user_tweets(self, user_id, max_results, since_id=None):
+        payload, status = self.store.get_user_tweets(user_id, max_results, since_id)
+        return status, payload
+
+class HTTPTransport:
+    """Calls an out-of-process mock API over a pooled keep-alive session"""
+    
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def get_user(self, username):
+        response = self.session.get(f"{self.base_url}/user/{username}", timeout=self.timeout)
+        return response.status_code, response.json()
+    
+    def get_user_tweets(self, user_id, max_results, since_id=None):
+        params = {'max_results': max_results}
+        if since_id:
+            params['since_id'] = since_id
+        response = self.session.get(
+            f"{self.base_url}/users/{user_id}/tweets",
+            params=params,
+            timeout=self.timeout
+        )
+        return response.status_code, response.json()
 
 class TwitterMockAPIClient:
     """
@@ -7,10 +50,20 @@ class TwitterMockAPIClient:
     Mimics Tweepy's interface but uses our mock API
     """
     
-    def __init__(self, base_url='http://localhost:5000/api/mock/twitter'):
-        self.base_url = base_url
+    def __init__(self, transport=None, base_url=None):
         self.is_mock = True
-        print("✅ Mock Twitter API Client initialized")
+        
+        if transport is None:
+            if Config.MOCK_TWITTER_TRANSPORT == 'http':
+                transport = HTTPTransport(
+                    base_url or Config.MOCK_TWITTER_BASE_URL,
+                    Config.MOCK_TWITTER_TIMEOUT_SECONDS
+                )
+            else:
+                transport = InProcessTransport()
+        
+        self.transport = transport
+        print(f"✅ Mock Twitter API Client initialized ({type(transport).__name__})")
     
     def is_available(self):
         """Check if mock API is available"""
@@ -35,29 +88,26 @@ class TwitterMockAPIClient:
             print(f"{'='*60}")
             
             # Step 1: Get user info
-            user_response = requests.get(f"{self.base_url}/user/{username}")
+            status, user_body = self.transport.get_user(username)
             
-            if user_response.status_code != 200:
+            if status != 200:
                 print(f"❌ User @{username} not found in mock API")
                 return None
             
-            user_data = user_response.json()['data']
+            user_data = user_body['data']
             user_id = user_data['id']
             
             print(f"✅ Found user: {user_data['name']} (@{user_data['username']})")
             print(f"   User ID: {user_id}")
             
             # Step 2: Get user's tweets
-            tweets_response = requests.get(
-                f"{self.base_url}/users/{user_id}/tweets",
-                params={'max_results': max_tweets}
-            )
+            status, tweets_body = self.transport.get_user_tweets(user_id, max_tweets)
             
-            if tweets_response.status_code != 200:
+            if status != 200:
                 print(f"❌ Failed to fetch tweets")
                 return None
             
-            tweets_data = tweets_response.json()['data']
+            tweets_data = tweets_body['data']
             tweet_texts = [tweet['text'] for tweet in tweets_data]
             
             print(f"✅ Fetched {len(tweet_texts)} tweets from @{username}")
@@ -83,22 +133,12 @@ class TwitterMockAPIClient:
         try:
             username = username.lstrip('@').lower()
             
-            response = requests.get(f"{self.base_url}/user/{username}")
+            status, body = self.transport.get_user(username)
             
-            if response.status_code != 200:
+            if status != 200:
                 return None
             
-            data = response.json()['data']
-            metrics = data['public_metrics']
-            
-            profile = {
-                'username': data['username'],
-                'displayName': data['name'],
-                'bio': data.get('description', ''),
-                'verified': data.get('verified', False),
-                'followers': f"{metrics['followers_count']:,}",
-                'tweets': []
-            }
+            profile = self._format_profile(body['data'])
             
             print(f"✅ Profile fetched: {profile['displayName']} (@{profile['username']})")
             print(f"   Followers: {profile['followers']}")
@@ -109,5 +149,60 @@ class TwitterMockAPIClient:
             print(f"❌ Failed to get profile: {str(e)}")
             return None
 
+    def get_profile_and_tweets(self, username, max_tweets=20, since_id=None):
+        """
+        Fetch profile and tweets with one user lookup + one timeline call
+        
+        Args:
+            since_id: Only return tweets newer than this ID (may return none)
+        
+        Returns:
+            dict: {profile, tweets, tweetRecords, newestId} or None if failed
+        """
+        try:
+            username = username.lstrip('@').lower()
+            
+            status, user_body = self.transport.get_user(username)
+            
+            if status != 200:
+                print(f"❌ User @{username} not found in mock API")
+                return None
+            
+            user_data = user_body['data']
+            
+            status, tweets_body = self.transport.get_user_tweets(user_data['id'], max_tweets, since_id)
+            
+            if status != 200:
+                print(f"❌ Failed to fetch tweets")
+                return None
+            
+            records = [{'id': t['id'], 'text': t['text']} for t in tweets_body['data']]
+            
+            print(f"✅ MOCK API: @{username} profile + {len(records)} tweets")
+            
+            return {
+                'profile': self._format_profile(user_data),
+                'tweets': [r['text'] for r in records],
+                'tweetRecords': records,
+                'newestId': tweets_body['meta'].get('newest_id')
+            }
+            
+        except Exception as e:
+            print(f"❌ Mock API error: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _format_profile(data):
+        """Convert a v2 user object into the profile shape we store"""
+        metrics = data['public_metrics']
+        return {
+            'username': data['username'],
+            'displayName': data['name'],
+            'bio': data.get('description', ''),
+            'verified': data.get('verified', False),
+            'followers': f"{metrics['followers_count']:,}",
+            'tweets': []
+        }
+
 # Global instance
 twitter_mock_client = TwitterMockAPIClient()
\ No newline at end of file
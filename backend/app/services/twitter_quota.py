@@ -0,0 +1,106 @@
+from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.config import Config
+
+class TwitterQuotaLedger:
+    """
+    Real Twitter API read quota shared by every worker
+
+    One document per window in `api_quota` counts reads. Reads are reserved
+    atomically before a call, so once the remaining budget can't cover an
+    analysis it is routed to cache/mock instead of exhausting the quota.
+    A 429 records `blockedUntil` so no worker calls again before the reset.
+    """
+
+    def __init__(self, db, limit=None):
+        self.db = db
+        self.quota_collection = db.api_quota
+        self.limit = limit if limit is not None else Config.TWITTER_READ_LIMIT
+        self.stats = {'reserved': 0, 'denied': 0, 'rateLimited': 0}
+
+    def window_key(self, now=None):
+        """Ledger document id for the current window"""
+        now = now or datetime.utcnow()
+        if Config.TWITTER_QUOTA_WINDOW == 'day':
+            return f"twitter_real:{now.strftime('%Y-%m-%d')}"
+        return f"twitter_real:{now.strftime('%Y-%m')}"
+
+    def try_reserve(self, cost):
+        """
+        Reserve `cost` reads if the window has room and we aren't rate limited
+
+        Returns:
+            bool: True if the reads were reserved
+        """
+        now = datetime.utcnow()
+
+        try:
+            ledger = self.quota_collection.find_one_and_update(
+                {
+                    '_id': self.window_key(now),
+                    'reads': {'$lte': self.limit - cost},
+                    'blockedUntil': {'$not': {'$gt': now}}
+                },
+                {
+                    '$inc': {'reads': cost},
+                    '$setOnInsert': {'limit': self.limit, 'windowStart': now}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # The window exists but is exhausted or blocked
+            ledger = None
+        except Exception as e:
+            print(f"⚠️  Quota ledger unavailable, skipping real API: {str(e)}")
+            ledger = None
+
+        if ledger is None:
+            self.stats['denied'] += 1
+            return False
+
+        self.stats['reserved'] += 1
+        return True
+
+    def settle(self, reserved, used):
+        """Correct a reservation with the reads actually consumed"""
+        if reserved == used:
+            return
+        try:
+            self.quota_collection.update_one(
+                {'_id': self.window_key()},
+                {'$inc': {'reads': used - reserved}}
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to settle quota: {str(e)}")
+
+    def block_until(self, reset_at):
+        """Record a rate-limit reset so every worker skips the real API until then"""
+        self.stats['rateLimited'] += 1
+        try:
+            self.quota_collection.update_one(
+                {'_id': self.window_key()},
+                {
+                    '$max': {'blockedUntil': reset_at},
+                    '$setOnInsert': {'reads': 0, 'limit': self.limit, 'windowStart': datetime.utcnow()}
+                },
+                upsert=True
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to record rate limit: {str(e)}")
+
+    def status(self):
+        """Current window usage for metrics"""
+        ledger = self.quota_collection.find_one({'_id': self.window_key()}) or {}
+        reads = ledger.get('reads', 0)
+        blocked_until = ledger.get('blockedUntil')
+
+        return {
+            'window': self.window_key(),
+            'reads': reads,
+            'limit': self.limit,
+            'remaining': max(self.limit - reads, 0),
+            'blockedUntil': blocked_until.isoformat() + 'Z' if blocked_until else None,
+            **self.stats
+        }
\ No newline at end of file
@@ -1,9 +1,28 @@
 import tweepy
 import os
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
 load_dotenv()
 
+class RateLimited(Exception):
+    """Raised instead of sleeping when Twitter answers 429"""
+    
+    def __init__(self, reset_at):
+        super().__init__(f'Twitter rate limit hit, resets at {reset_at.isoformat()}Z')
+        self.reset_at = reset_at
+
+class TwitterUnavailable(Exception):
+    """Raised when Twitter errors or can't be reached (not for 404s)"""
+
+def _rate_limit_reset(error):
+    """Reset time from a 429 response (x-rate-limit-reset), default 15 minutes"""
+    try:
+        reset = int(error.response.headers.get('x-rate-limit-reset'))
+        return datetime.utcfromtimestamp(reset)
+    except Exception:
+        return datetime.utcnow() + timedelta(minutes=15)
+
 class TwitterRealAPIClient:
     """Real Twitter API client using Tweepy"""
     
@@ -19,9 +38,10 @@ class TwitterRealAPIClient:
                 print("⚠️  No Twitter API credentials found")
                 return
             
+            # Never sleep inside a web worker on 429; callers fall back instead
             self.client = tweepy.Client(
                 bearer_token=bearer_token,
-                wait_on_rate_limit=True
+                wait_on_rate_limit=False
             )
             print("✅ Real Twitter API client initialized")
         except Exception as e:
@@ -119,5 +139,100 @@ class TwitterRealAPIClient:
             print(f"❌ Failed to get profile: {str(e)}")
             return None
 
+    def get_profile_and_tweets(self, username, max_tweets=20, since_id=None):
+        """
+        Fetch profile and tweets with one get_user + one timeline call
+        
+        get_user_tweets + get_user_profile each call get_user, which costs
+        two user lookups per analysis; this asks for the profile fields up
+        front and reuses the same user object.
+        
+        Args:
+            since_id: Only return tweets newer than this ID (may return none)
+        
+        Returns:
+            dict: {profile, tweets, tweetRecords, newestId, postsRead} or None
+                if failed; postsRead counts every post the timeline returned
+                (billed as reads), before the English-only filter
+        
+        Raises:
+            RateLimited: On 429, so the caller can fall back immediately
+            TwitterUnavailable: On server/network errors, so the caller's
+                circuit breaker can count them
+        """
+        if not self.client:
+            return None
+        
+        try:
+            username = username.lstrip('@')
+            print(f"\n🔵 REAL API: Fetching profile + tweets for @{username}")
+            
+            user = self.client.get_user(
+                username=username,
+                user_fields=['description', 'public_metrics', 'verified']
+            )
+            if not user.data:
+                print(f"❌ User @{username} not found")
+                return None
+            
+            data = user.data
+            
+            tweets = self.client.get_users_tweets(
+                id=data.id,
+                max_results=min(max(max_tweets, 5), 100),
+                exclude=['retweets', 'replies'],
+                tweet_fields=['lang'],
+                since_id=since_id
+            )
+            
+            # Nothing new since the last fetch is a valid incremental answer
+            if not tweets.data and not since_id:
+                print(f"⚠️  No tweets found")
+                return None
+            
+            # Filter English tweets only
+            records = [
+                {'id': str(tweet.id), 'text': tweet.text}
+                for tweet in tweets.data or []
+                if getattr(tweet, 'lang', None) in (None, 'en')
+            ]
+            
+            metrics = data.public_metrics
+            profile = {
+                'username': data.username,
+                'displayName': data.name,
+                'bio': data.description or '',
+                'verified': data.verified or False,
+                'followers': f"{metrics['followers_count']:,}",
+                'tweets': []
+            }
+            
+            print(f"✅ Fetched {len(records)} tweets from Real Twitter API")
+            
+            return {
+                'profile': profile,
+                'tweets': [r['text'] for r in records],
+                'tweetRecords': records,
+                'newestId': (tweets.meta or {}).get('newest_id'),
+                'postsRead': len(tweets.data or [])
+            }
+            
+        except tweepy.errors.TooManyRequests as e:
+            reset_at = _rate_limit_reset(e)
+            print(f"⏳ Rate limited until {reset_at.isoformat()}Z")
+            raise RateLimited(reset_at)
+        except tweepy.errors.Unauthorized:
+            print(f"❌ Unauthorized - check bearer token")
+            return None
+        except tweepy.errors.NotFound:
+            print(f"❌ User @{username} not found")
+            return None
+        except tweepy.TweepyException as e:
+            print(f"❌ Twitter API error: {str(e)}")
+            raise TwitterUnavailable(str(e))
+        except Exception as e:
+            print(f"❌ Error: {str(e)}")
+            raise TwitterUnavailable(str(e))
+
 # Global instance
 twitter_real_client = TwitterRealAPIClient()
\ No newline at end of file
@@ -1,6 +1,6 @@
 from datetime import datetime
 from bson import ObjectId
-from app.ml_models.text_classifier import text_classifier
+from app.ml_models.text_classifier import text_models
 from app.services.twitter_mock_api_client import twitter_mock_client
 import requests
 
@@ -40,7 +40,8 @@ class TwitterService:
             
             # Predict using text classifier
             print(f"\n🤖 Analyzing {len(combined_text)} characters with ML model...")
-            mbti_type, confidence, keywords = text_classifier.predict(combined_text)
+            with text_models.lease() as text_classifier:
+                mbti_type, confidence, keywords = text_classifier.predict(combined_text)
             
             # Save prediction
             prediction = {
@@ -0,0 +1,194 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from app.config import Config
+from app.utils.metrics import metrics
+
+class AdmissionRejected(Exception):
+    """Request turned away before doing any model work"""
+
+    status = 503
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class Saturated(AdmissionRejected):
+    """Every in-flight slot is busy and the wait queue is full or timed out"""
+
+class RateLimitExceeded(AdmissionRejected):
+    """The user's token bucket is empty"""
+
+    status = 429
+
+class AdmissionController:
+    """
+    Admission control for CPU-bound (model-backed) routes
+
+    At most max_in_flight requests run model work at once. Up to max_queue
+    more wait for a slot, each for at most queue_timeout seconds; anything
+    beyond that is rejected right away with Saturated (503 + Retry-After),
+    so overload sheds prediction requests instead of letting them fill the
+    gunicorn backlog in front of cheap routes like login.
+
+    Users also get a token bucket (rate_per_minute sustained, burst at
+    once); an empty bucket raises RateLimitExceeded (429).
+
+    Process-local like the circuit breaker: limits apply per gunicorn
+    worker (a user's effective rate is rate_per_minute x workers).
+    """
+
+    def __init__(self, name, max_in_flight=None, max_queue=None, queue_timeout=None,
+                 rate_per_minute=None, burst=None, max_tracked_users=None):
+        self.name = name
+        self.max_in_flight = max_in_flight if max_in_flight is not None else Config.ADMISSION_MAX_IN_FLIGHT
+        self.max_queue = max_queue if max_queue is not None else Config.ADMISSION_MAX_QUEUE
+        self.queue_timeout = queue_timeout if queue_timeout is not None else Config.ADMISSION_QUEUE_TIMEOUT_SECONDS
+        self.rate_per_minute = rate_per_minute if rate_per_minute is not None else Config.ADMISSION_USER_RATE_PER_MINUTE
+        self.burst = burst or Config.ADMISSION_USER_BURST
+        self.max_tracked_users = max_tracked_users or Config.ADMISSION_MAX_TRACKED_USERS
+
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._pid = os.getpid()
+        self._in_flight = 0
+        self._waiting = 0
+        self._buckets = OrderedDict()  # user -> (tokens, updated), least recently used first
+        self._avg_service_seconds = 0.0
+        self.stats = {
+            'admitted': 0,
+            'queued': 0,
+            'rejectedFull': 0,
+            'rejectedTimeout': 0,
+            'rateLimited': 0,
+            'totalWaitMs': 0.0,
+            'maxWaitMs': 0.0
+        }
+
+    def _ensure_process(self):
+        """Forget counts inherited from the parent process (lock held)"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._in_flight = 0
+            self._waiting = 0
+            self._buckets.clear()
+
+    def check_rate(self, user_id, cost=1):
+        """
+        Take `cost` tokens from the user's bucket
+
+        Raises:
+            RateLimitExceeded: Not enough tokens (retry_after = refill time)
+        """
+        if self.rate_per_minute <= 0:
+            return
+
+        cost = min(cost, self.burst)
+        refill_per_second = self.rate_per_minute / 60
+        now = time.monotonic()
+
+        with self._lock:
+            self._ensure_process()
+            tokens, updated = self._buckets.pop(user_id, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * refill_per_second)
+
+            if tokens < cost:
+                self._buckets[user_id] = (tokens, now)
+                self.stats['rateLimited'] += 1
+                retry_after = max(1, math.ceil((cost - tokens) / refill_per_second))
+                raise RateLimitExceeded('Too many prediction requests, please slow down', retry_after)
+
+            self._buckets[user_id] = (tokens - cost, now)
+            while len(self._buckets) > self.max_tracked_users:
+                self._buckets.popitem(last=False)
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold an in-flight slot for the model work of one request
+
+        Raises:
+            Saturated: No slot freed up in time, or the queue is full
+        """
+        if self.max_in_flight <= 0:
+            yield
+            return
+
+        with self._lock:
+            self._ensure_process()
+
+            if self._in_flight >= self.max_in_flight:
+                if self._waiting >= self.max_queue:
+                    self.stats['rejectedFull'] += 1
+                    raise Saturated('Server busy, please try again shortly', self._retry_after())
+
+                self.stats['queued'] += 1
+                self._waiting += 1
+                queued = time.monotonic()
+                deadline = queued + self.queue_timeout
+                try:
+                    while self._in_flight >= self.max_in_flight:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.stats['rejectedTimeout'] += 1
+                            raise Saturated('Server busy, please try again shortly', self._retry_after())
+                        self._slot_freed.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                self._record_wait((time.monotonic() - queued) * 1000)
+
+            self._in_flight += 1
+            self.stats['admitted'] += 1
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._in_flight -= 1
+                # Smoothed service time, for Retry-After estimates
+                self._avg_service_seconds = (
+                    elapsed if not self._avg_service_seconds
+                    else 0.9 * self._avg_service_seconds + 0.1 * elapsed
+                )
+                self._slot_freed.notify()
+
+    def _record_wait(self, wait_ms):
+        self.stats['totalWaitMs'] += wait_ms
+        self.stats['maxWaitMs'] = max(self.stats['maxWaitMs'], wait_ms)
+
+    def _retry_after(self):
+        """Seconds until the queue ahead would likely have drained (lock held)"""
+        backlog = self._in_flight + self._waiting
+        return min(30, max(1, math.ceil(self._avg_service_seconds * backlog / self.max_in_flight)))
+
+    def admission_stats(self):
+        """Slots, queue depth and rejections, for metrics"""
+        with self._lock:
+            stats = dict(self.stats)
+            in_flight = self._in_flight
+            waiting = self._waiting
+            tracked = len(self._buckets)
+            avg_service_ms = self._avg_service_seconds * 1000
+
+        waited = stats['queued'] - stats['rejectedTimeout']
+        return {
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()},
+            'maxInFlight': self.max_in_flight,
+            'maxQueue': self.max_queue,
+            'inFlight': in_flight,
+            'queueDepth': waiting,
+            'avgWaitMs': round(stats['totalWaitMs'] / waited, 3) if waited else 0.0,
+            'avgServiceMs': round(avg_service_ms, 3),
+            'ratePerMinute': self.rate_per_minute,
+            'burst': self.burst,
+            'trackedUsers': tracked
+        }
+
+# Global instance, shared by the text and Twitter prediction routes
+prediction_admission = AdmissionController('prediction')
+metrics.register('prediction_admission', prediction_admission.admission_stats)
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache with per-entry expiry
+
+    Process-local: each gunicorn worker holds its own copy, so keep TTLs
+    short for data that can change elsewhere.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return a live entry (refreshing its LRU position) or default"""
+        now = time.monotonic()
+
+        with self._lock:
+            item = self._data.get(key)
+
+            if item is None or item[0] <= now:
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entry if full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        """Drop a single entry"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Size and hit ratio"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttlSeconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
\ No newline at end of file
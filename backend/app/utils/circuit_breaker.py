@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a flaky dependency
+
+    Closed: calls go through; failures and slow calls (latency breaches)
+    are counted in a sliding window. Once `failure_threshold` of them land
+    within `window_seconds` the breaker opens and callers skip the
+    dependency for `open_seconds`. After that it goes half-open and lets
+    `half_open_calls` trial requests through: a success closes it again,
+    a failure re-opens it.
+
+    Process-local: each gunicorn worker trips independently.
+    """
+
+    def __init__(self, name, failure_threshold=5, window_seconds=60,
+                 slow_call_seconds=None, open_seconds=30, half_open_calls=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self._lock = threading.Lock()
+        self._failures = deque()
+        self._state = CLOSED
+        self._opened_at = None
+        self._probes = 0
+        self.stats = {
+            'allowed': 0,
+            'rejected': 0,
+            'successes': 0,
+            'failures': 0,
+            'slowCalls': 0,
+            'opened': 0
+        }
+
+    @property
+    def state(self):
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        """Move open -> half-open once the cool-down has passed (lock held)"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._failures.clear()
+        self._probes = 0
+        self.stats['opened'] += 1
+        print(f"🔌 Circuit '{self.name}' opened for {self.open_seconds}s")
+
+    def allow(self):
+        """
+        Whether a call may go to the dependency now
+
+        Every allowed call must be followed by record_success(),
+        record_failure() or cancel().
+        """
+        with self._lock:
+            self._refresh()
+
+            if self._state == OPEN or \
+                    (self._state == HALF_OPEN and self._probes >= self.half_open_calls):
+                self.stats['rejected'] += 1
+                return False
+
+            if self._state == HALF_OPEN:
+                self._probes += 1
+
+            self.stats['allowed'] += 1
+            return True
+
+    def record_success(self, duration=None):
+        """Record a completed call; calls slower than slow_call_seconds count as failures"""
+        if self.slow_call_seconds and duration is not None and duration > self.slow_call_seconds:
+            self.stats['slowCalls'] += 1
+            self.record_failure()
+            return
+
+        with self._lock:
+            self.stats['successes'] += 1
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._failures.clear()
+                self._probes = 0
+                print(f"🔌 Circuit '{self.name}' closed")
+
+    def record_failure(self):
+        """Record a failed call; may open the breaker"""
+        with self._lock:
+            self.stats['failures'] += 1
+
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+
+            if self._state == OPEN:
+                return
+
+            now = time.monotonic()
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window_seconds:
+                self._failures.popleft()
+
+            if len(self._failures) >= self.failure_threshold:
+                self._open()
+
+    def cancel(self):
+        """Release an allowed call that ended without saying anything about health"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def snapshot(self):
+        """State and counters for metrics"""
+        with self._lock:
+            self._refresh()
+            now = time.monotonic()
+            return {
+                'state': self._state,
+                'recentFailures': sum(1 for t in self._failures if now - t <= self.window_seconds),
+                'openForSeconds': round(max(self.open_seconds - (now - self._opened_at), 0), 1)
+                    if self._state == OPEN else 0,
+                **self.stats
+            }
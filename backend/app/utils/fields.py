@@ -0,0 +1,35 @@
+# Optional outputs of prediction responses -> response key
+PREDICTION_FIELDS = {
+    'type': 'mbtiType',
+    'confidence': 'confidence',
+    'keywords': 'keywords',
+    'insights': 'insights'
+}
+
+def requested_fields(value):
+    """
+    Parse a `fields` selection from JSON or a query string
+    ('type,confidence' or ['type', 'confidence'])
+
+    Returns:
+        set: Requested field names (all of them when not given)
+
+    Raises:
+        ValueError: Unknown field
+    """
+    if value is None or value == '':
+        return set(PREDICTION_FIELDS)
+
+    names = value.split(',') if isinstance(value, str) else value
+    fields = {str(name).strip().lower() for name in names if str(name).strip()}
+
+    unknown = fields - set(PREDICTION_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(PREDICTION_FIELDS)})")
+
+    return fields
+
+def select_fields(payload, fields):
+    """Drop the optional outputs that weren't requested"""
+    skipped = {PREDICTION_FIELDS[name] for name in PREDICTION_FIELDS if name not in fields}
+    return {key: value for key, value in payload.items() if key not in skipped}
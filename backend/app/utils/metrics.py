@@ -0,0 +1,36 @@
+import threading
+
+class MetricsRegistry:
+    """
+    Process-local registry of metric collectors
+
+    Components register a callable returning a JSON-serializable dict;
+    GET /metrics returns a snapshot of every collector (only with
+    `Authorization: Bearer <METRICS_TOKEN>`; disabled when unset).
+    """
+
+    def __init__(self):
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, collector):
+        """Register (or replace) a collector callable under a name"""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self):
+        """Collect every registered metric group"""
+        with self._lock:
+            collectors = dict(self._collectors)
+
+        result = {}
+        for name, collector in collectors.items():
+            try:
+                result[name] = collector()
+            except Exception as e:
+                result[name] = {'error': str(e)}
+
+        return result
+
+# Global instance
+metrics = MetricsRegistry()
\ No newline at end of file
@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import bcrypt
+from app.config import Config
+from app.utils.metrics import metrics
+
+class HasherSaturated(Exception):
+    """Raised when too many hash/verify operations are already waiting"""
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool
+
+    bcrypt releases the GIL, so a small pool keeps login storms from
+    occupying every request thread while prediction requests wait. Work
+    beyond max_concurrency queues up to max_queue, after which callers get
+    HasherSaturated immediately instead of piling up.
+    """
+
+    def __init__(self, rounds=None, max_concurrency=None, max_queue=None, timeout=None):
+        self.rounds = rounds or Config.BCRYPT_ROUNDS
+        self.max_concurrency = max_concurrency or Config.BCRYPT_MAX_CONCURRENCY
+        self.max_queue = max_queue if max_queue is not None else Config.BCRYPT_MAX_QUEUE
+        self.timeout = timeout or Config.BCRYPT_TIMEOUT_SECONDS
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._outstanding = 0
+        self.stats = {
+            'hashes': 0,
+            'verifies': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'totalHashMs': 0.0,
+            'maxHashMs': 0.0,
+            'totalWaitMs': 0.0,
+            'maxWaitMs': 0.0
+        }
+
+    def _get_executor(self):
+        """Executor for this process (recreated after fork)"""
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix='bcrypt'
+                    )
+                    self._pid = os.getpid()
+                    self._outstanding = 0
+        return self._executor
+
+    def _run(self, kind, fn, *args):
+        executor = self._get_executor()
+
+        with self._lock:
+            if self._outstanding >= self.max_concurrency + self.max_queue:
+                self.stats['rejected'] += 1
+                raise HasherSaturated('Password hashing queue is full')
+            self._outstanding += 1
+
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                self._record(kind, (started - submitted) * 1000, (finished - started) * 1000)
+
+        future = executor.submit(timed)
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.stats['timeouts'] += 1
+            raise HasherSaturated('Password hashing timed out')
+
+    def _release(self, future):
+        with self._lock:
+            self._outstanding -= 1
+
+    def _record(self, kind, wait_ms, hash_ms):
+        with self._lock:
+            self.stats[kind] += 1
+            self.stats['totalHashMs'] += hash_ms
+            self.stats['maxHashMs'] = max(self.stats['maxHashMs'], hash_ms)
+            self.stats['totalWaitMs'] += wait_ms
+            self.stats['maxWaitMs'] = max(self.stats['maxWaitMs'], wait_ms)
+
+    def hash(self, password):
+        """Hash a password with the configured work factor"""
+        def _hash(raw):
+            return bcrypt.hashpw(raw, bcrypt.gensalt(rounds=self.rounds)).decode('utf-8')
+
+        return self._run('hashes', _hash, password.encode('utf-8'))
+
+    def verify(self, password, hashed):
+        """Check a password against a stored bcrypt hash"""
+        return self._run('verifies', bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def needs_rehash(self, hashed):
+        """True if the stored hash uses a different cost than configured"""
+        try:
+            # Format: $2b$<cost>$<salt+hash>
+            return int(hashed.split('$')[2]) != self.rounds
+        except (IndexError, ValueError, AttributeError):
+            return False
+
+    def queue_stats(self):
+        """Queue depth and latency figures for sizing the pool"""
+        with self._lock:
+            stats = dict(self.stats)
+            outstanding = self._outstanding
+
+        operations = stats['hashes'] + stats['verifies']
+        return {
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()},
+            'rounds': self.rounds,
+            'maxConcurrency': self.max_concurrency,
+            'maxQueue': self.max_queue,
+            'inFlight': min(outstanding, self.max_concurrency),
+            'queueDepth': max(outstanding - self.max_concurrency, 0),
+            'avgHashMs': round(stats['totalHashMs'] / operations, 3) if operations else 0.0,
+            'avgWaitMs': round(stats['totalWaitMs'] / operations, 3) if operations else 0.0
+        }
+
+# Global instance
+password_hasher = PasswordHasher()
+metrics.register('password_hasher', password_hasher.queue_stats)
\ No newline at end of file
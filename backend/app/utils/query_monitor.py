@@ -0,0 +1,161 @@
+import threading
+from contextlib import contextmanager
+from flask import g, has_request_context, request
+from pymongo import monitoring
+from app.utils.metrics import metrics
+
+def _documents_returned(command_name, reply):
+    """Best-effort count of documents a command returned or touched"""
+    cursor = reply.get('cursor')
+    if cursor:
+        return len(cursor.get('firstBatch', cursor.get('nextBatch', [])))
+    if command_name == 'findAndModify':
+        return 1 if reply.get('value') else 0
+    return int(reply.get('n', 0))
+
+class QueryMonitor(monitoring.CommandListener):
+    """
+    Attributes every MongoDB command to the Flask request that issued it
+
+    Records command name, collection, duration and documents returned per
+    request, aggregates them per endpoint, and supports max_queries() to
+    assert an upper bound in tests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._local = threading.local()
+        self.endpoints = {}
+
+    def init_app(self, app):
+        """Aggregate per-endpoint stats and add X-DB-* headers to responses"""
+
+        @app.after_request
+        def record_request_queries(response):
+            queries = g.pop('mongo_queries', None)
+            if queries is not None and request.url_rule is not None:
+                self._aggregate(f'{request.method} {request.url_rule.rule}', queries)
+                response.headers['X-DB-Queries'] = str(len(queries))
+                response.headers['X-DB-Time-Ms'] = f"{sum(q['durationMs'] for q in queries):.2f}"
+            return response
+
+    # -- pymongo CommandListener --------------------------------------------
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = None
+
+        with self._lock:
+            self._inflight[(event.connection_id, event.request_id)] = collection
+
+    def succeeded(self, event):
+        self._record(event, _documents_returned(event.command_name, event.reply), failed=False)
+
+    def failed(self, event):
+        self._record(event, 0, failed=True)
+
+    # -----------------------------------------------------------------------
+
+    def _record(self, event, documents, failed):
+        with self._lock:
+            collection = self._inflight.pop((event.connection_id, event.request_id), None)
+
+        query = {
+            'command': event.command_name,
+            'collection': collection,
+            'durationMs': event.duration_micros / 1000,
+            'documents': documents,
+            'failed': failed
+        }
+
+        # Events fire on the thread that issued the command
+        recorders = getattr(self._local, 'recorders', None)
+        if recorders:
+            for recorder in recorders:
+                recorder.append(query)
+
+        if has_request_context():
+            g.setdefault('mongo_queries', []).append(query)
+
+    def _aggregate(self, endpoint, queries):
+        duration = sum(q['durationMs'] for q in queries)
+
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, {
+                'requests': 0,
+                'queries': 0,
+                'maxQueriesPerRequest': 0,
+                'totalDbTimeMs': 0.0,
+                'maxDbTimeMs': 0.0,
+                'documents': 0,
+                'failures': 0,
+                'commands': {}
+            })
+            stats['requests'] += 1
+            stats['queries'] += len(queries)
+            stats['maxQueriesPerRequest'] = max(stats['maxQueriesPerRequest'], len(queries))
+            stats['totalDbTimeMs'] += duration
+            stats['maxDbTimeMs'] = max(stats['maxDbTimeMs'], duration)
+
+            for q in queries:
+                stats['documents'] += q['documents']
+                stats['failures'] += int(q['failed'])
+                key = f"{q['command']}:{q['collection']}" if q['collection'] else q['command']
+                stats['commands'][key] = stats['commands'].get(key, 0) + 1
+
+    def endpoint_stats(self):
+        """Per-endpoint aggregates with averages"""
+        with self._lock:
+            snapshot = {}
+            for endpoint, stats in self.endpoints.items():
+                requests = stats['requests'] or 1
+                snapshot[endpoint] = {
+                    **stats,
+                    'commands': dict(stats['commands']),
+                    'totalDbTimeMs': round(stats['totalDbTimeMs'], 3),
+                    'maxDbTimeMs': round(stats['maxDbTimeMs'], 3),
+                    'avgQueriesPerRequest': round(stats['queries'] / requests, 2),
+                    'avgDbTimeMs': round(stats['totalDbTimeMs'] / requests, 3)
+                }
+            return snapshot
+
+    @contextmanager
+    def capture(self):
+        """Collect every command issued on this thread inside the block"""
+        recorded = []
+        recorders = getattr(self._local, 'recorders', None)
+        if recorders is None:
+            recorders = self._local.recorders = []
+
+        recorders.append(recorded)
+        try:
+            yield recorded
+        finally:
+            recorders.remove(recorded)
+
+    @contextmanager
+    def max_queries(self, limit):
+        """
+        Test helper: fail if the block issues more than `limit` commands
+
+        Usage:
+            with query_monitor.max_queries(1):
+                client.get('/api/auth/me', headers=auth_headers)
+        """
+        with self.capture() as recorded:
+            yield recorded
+
+        if len(recorded) > limit:
+            issued = ', '.join(
+                f"{q['command']}({q['collection']})" if q['collection'] else q['command']
+                for q in recorded
+            )
+            raise AssertionError(f'Expected at most {limit} queries, got {len(recorded)}: {issued}')
+
+# Global instance
+query_monitor = QueryMonitor()
+max_queries = query_monitor.max_queries
+
+metrics.register('db_queries', query_monitor.endpoint_stats)
\ No newline at end of file
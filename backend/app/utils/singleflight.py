@@ -0,0 +1,63 @@
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution
+
+    The first caller for a key runs the function; callers arriving while
+    it is in flight wait for and share its result (or exception).
+    Process-local: different gunicorn workers still run their own call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {'executed': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        """
+        Run fn() once per in-flight key
+
+        Returns:
+            tuple: (result, shared) - shared is True for callers that waited
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.stats['executed'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+    def in_flight(self):
+        """Number of keys currently executing"""
+        with self._lock:
+            return len(self._calls)
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+Build per-user personality summaries from existing predictions.
+
+Run once after deploying materialized summaries (safe to re-run):
+    cd backend && python scripts/backfill_user_summaries.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app.database import db
+from app.services.summary_service import SummaryService
+
+def backfill_user_summaries():
+    """Backfill user_summaries from the three prediction collections"""
+    print("="*70)
+    print("USER SUMMARY BACKFILL")
+    print("="*70)
+    
+    summary_service = SummaryService(db)
+    recorded = summary_service.backfill()
+    
+    print(f"\n✅ Recorded {recorded} module results")
+    print(f"✅ Summaries now: {db.user_summaries.count_documents({})}")
+
+if __name__ == '__main__':
+    backfill_user_summaries()
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Benchmark the mock Twitter fetch path used by every analysis.
+
+Compares the old self-HTTP calls (plain requests.get, no Session, no
+keep-alive) with the pooled HTTP transport and the in-process transport.
+A throwaway server hosts only the mock blueprint, so no MongoDB or ML
+models are needed:
+    cd backend && python scripts/benchmark_mock_transport.py [iterations]
+"""
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import requests
+from flask import Flask
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app.routes import twitter_mock_api
+from app.services.twitter_mock_api_client import (
+    TwitterMockAPIClient, HTTPTransport, InProcessTransport
+)
+
+class LegacyTransport:
+    """The pre-transport behaviour: a new connection per call, no timeout"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def get_user(self, username):
+        response = requests.get(f"{self.base_url}/user/{username}")
+        return response.status_code, response.json()
+
+    def get_user_tweets(self, user_id, max_results):
+        response = requests.get(
+            f"{self.base_url}/users/{user_id}/tweets",
+            params={'max_results': max_results}
+        )
+        return response.status_code, response.json()
+
+def start_mock_server():
+    """Serve only the mock blueprint on a free local port"""
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app = Flask(__name__)
+    app.register_blueprint(twitter_mock_api.bp)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/api/mock/twitter"
+
+def time_fetches(client, usernames, iterations):
+    """Latency (ms) of one analysis' fetch stage: tweets + profile"""
+    samples = []
+    for i in range(iterations):
+        username = usernames[i % len(usernames)]
+        started = time.perf_counter()
+        client.get_user_tweets(username, max_tweets=20)
+        client.get_user_profile(username)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def benchmark(iterations=200):
+    server, base_url = start_mock_server()
+    usernames = list(twitter_mock_api.mock_data.keys())
+
+    transports = [
+        ('legacy requests.get (before)', LegacyTransport(base_url)),
+        ('pooled HTTP session', HTTPTransport(base_url, timeout=5)),
+        ('in-process (after)', InProcessTransport())
+    ]
+
+    print("="*70)
+    print(f"MOCK TWITTER FETCH LATENCY ({iterations} analyses, {len(usernames)} handles)")
+    print("="*70)
+
+    # Silence the client's per-call logging while timing
+    devnull = open(os.devnull, 'w')
+    results = []
+
+    for name, transport in transports:
+        client = TwitterMockAPIClient(transport=transport)
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            time_fetches(client, usernames, 10)  # warm-up
+            samples = time_fetches(client, usernames, iterations)
+        finally:
+            sys.stdout = stdout
+        results.append((name, samples))
+
+    devnull.close()
+    server.shutdown()
+
+    print(f"\n{'transport':<32}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, samples in results:
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{name:<32}{statistics.mean(samples):>10.3f}{statistics.median(samples):>10.3f}{p95:>10.3f}")
+
+    baseline = statistics.mean(results[0][1])
+    fastest = statistics.mean(results[-1][1])
+    print(f"\n✅ In-process fetch is {baseline / fastest:.0f}x faster than self-HTTP")
+    print("   (and uses no extra gunicorn worker per analysis)")
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Distill all-MiniLM-L6-v2 into a static token-embedding table.
+
+Each WordPiece token of MiniLM's vocabulary is embedded on its own
+(continuation pieces without their '##'). Tokens get SIF weights
+a / (a + p(token)), with p estimated on the training texts, so frequent
+tokens count less in the weighted mean. Output (used by TEXT_ENCODER=static):
+    app/ml_models/text_static/static_encoder/{vocab.txt, embeddings.npy, weights.npy}
+
+    cd backend && python scripts/distill_static_encoder.py [corpus_split]
+
+Then train matching ensembles with scripts/train_static_ensembles.py.
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sentence_transformers import SentenceTransformer
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+from app.ml_models.text_scoring import ENCODER_NAME
+from app.ml_models.static_encoder import STATIC_ENCODER_DIR, VOCAB_FILE, EMBEDDINGS_FILE, WEIGHTS_FILE
+from app.ml_models.model_bundle import resolve_encoder
+
+OUTPUT_DIR = os.path.join(BACKEND_DIR, 'app', 'ml_models', 'text_static', STATIC_ENCODER_DIR)
+
+# SIF smoothing: tokens much more frequent than this are down-weighted
+SIF_A = 1e-3
+
+def distill_static_encoder(corpus_split='train'):
+    """Embed every vocabulary token once and derive frequency weights"""
+    print("="*70)
+    print("STATIC ENCODER DISTILLATION")
+    print("="*70)
+
+    model = SentenceTransformer(resolve_encoder(ENCODER_NAME))
+    tokenizer = model.tokenizer
+    vocab = sorted(tokenizer.get_vocab().items(), key=lambda item: item[1])
+    tokens = [token for token, _ in vocab]
+    special = set(tokenizer.all_special_tokens)
+    print(f"\n📖 {len(tokens)} WordPiece tokens")
+
+    print("🧠 Embedding tokens with MiniLM...")
+    embeddings = model.encode(
+        [token[2:] if token.startswith('##') else token for token in tokens],
+        batch_size=512, show_progress_bar=True
+    )
+
+    corpus = pd.read_csv(os.path.join(BACKEND_DIR, 'data', 'training', f'mbti_aggregated_{corpus_split}.csv'))
+    print(f"📊 Token frequencies from {len(corpus)} {corpus_split} texts...")
+    counts = np.zeros(len(tokens), dtype=np.float64)
+    for text in corpus['text'].astype(str):
+        ids = tokenizer(text, add_special_tokens=False, truncation=False)['input_ids']
+        counts += np.bincount(ids, minlength=len(tokens))[:len(tokens)]
+
+    probabilities = counts / max(counts.sum(), 1)
+    weights = (SIF_A / (SIF_A + probabilities)).astype(np.float32)
+    for index, token in enumerate(tokens):
+        if token in special or token.startswith('[unused'):
+            weights[index] = 0.0
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with open(os.path.join(OUTPUT_DIR, VOCAB_FILE), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(tokens) + '\n')
+    np.save(os.path.join(OUTPUT_DIR, EMBEDDINGS_FILE), np.asarray(embeddings, dtype=np.float16))
+    np.save(os.path.join(OUTPUT_DIR, WEIGHTS_FILE), weights)
+
+    size_mb = sum(os.path.getsize(os.path.join(OUTPUT_DIR, name)) for name in os.listdir(OUTPUT_DIR)) / 1e6
+    print(f"\n✅ Static encoder saved to {OUTPUT_DIR} ({size_mb:.1f} MB)")
+
+if __name__ == '__main__':
+    distill_static_encoder(*sys.argv[1:2])
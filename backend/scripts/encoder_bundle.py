@@ -0,0 +1,106 @@
+"""
+Manage the local sentence-encoder bundle, so workers never hit the hub.
+
+    cd backend && python scripts/encoder_bundle.py fetch [path]            # download + manifest
+    cd backend && python scripts/encoder_bundle.py pack <archive> [path]   # .tar.gz for air-gapped hosts
+    cd backend && python scripts/encoder_bundle.py unpack <archive> [path] # install a packed bundle
+    cd backend && python scripts/encoder_bundle.py verify [path]           # check sha256 manifest
+
+`path` defaults to TEXT_ENCODER_PATH, else app/ml_models/encoders/<encoder>.
+Bundles are written next to `path` and renamed into place once complete,
+so a worker never sees a half-written one.
+"""
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app.config import Config
+from app.ml_models.text_scoring import ENCODER_NAME
+from app.ml_models.model_bundle import (
+    BundleError, default_encoder_path, verify_bundle, write_manifest
+)
+
+def install(staging, path):
+    """Swap a complete bundle into place"""
+    if os.path.exists(path):
+        previous = f'{path}.old-{os.getpid()}'
+        os.rename(path, previous)
+        os.rename(staging, path)
+        shutil.rmtree(previous)
+    else:
+        os.rename(staging, path)
+
+def fetch(path):
+    """Download the encoder from the hub and write its manifest"""
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.encoder-', dir=os.path.dirname(path))
+
+    print(f"⬇️  Downloading {ENCODER_NAME}...")
+    SentenceTransformer(ENCODER_NAME).save(staging)
+    manifest = write_manifest(staging, ENCODER_NAME)
+
+    install(staging, path)
+    print(f"✅ Bundle ready at {path} ({len(manifest['files'])} files)")
+
+def pack(archive, path):
+    """Verify, then archive the bundle"""
+    verify_bundle(path, ENCODER_NAME)
+    with tarfile.open(archive, 'w:gz') as tar:
+        tar.add(path, arcname=ENCODER_NAME)
+    print(f"✅ Packed {path} into {archive}")
+
+def unpack(archive, path):
+    """Extract and verify a packed bundle, then install it"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.encoder-', dir=os.path.dirname(path))
+
+    with tarfile.open(archive, 'r:gz') as tar:
+        members = tar.getmembers()
+        for member in members:
+            if not (member.isfile() or member.isdir()) or os.path.isabs(member.name) or '..' in member.name.split('/'):
+                shutil.rmtree(staging)
+                raise BundleError(f'Refusing unsafe archive entry: {member.name}')
+        tar.extractall(staging, members=members)
+
+    extracted = os.path.join(staging, ENCODER_NAME)
+    try:
+        verify_bundle(extracted, ENCODER_NAME)
+    except BundleError:
+        shutil.rmtree(staging)
+        raise
+
+    install(extracted, path)
+    shutil.rmtree(staging)
+    print(f"✅ Installed bundle at {path}")
+
+def verify(path):
+    manifest = verify_bundle(path, ENCODER_NAME)
+    print(f"✅ {path}: {manifest['encoder']}, {len(manifest['files'])} files verified")
+
+if __name__ == '__main__':
+    commands = {'fetch': (fetch, 0), 'pack': (pack, 1), 'unpack': (unpack, 1), 'verify': (verify, 0)}
+
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(__doc__)
+        sys.exit(1)
+
+    command, positional = commands[sys.argv[1]]
+    args = sys.argv[2:2 + positional]
+    if len(args) < positional:
+        print(__doc__)
+        sys.exit(1)
+
+    default_path = Config.TEXT_ENCODER_PATH or default_encoder_path(ENCODER_NAME)
+    target = sys.argv[2 + positional] if len(sys.argv) > 2 + positional else default_path
+
+    try:
+        command(*args, os.path.abspath(target))
+    except BundleError as e:
+        print(f"❌ {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,33 @@
+"""
+Create all MongoDB indexes the app relies on.
+
+Run once per deploy (idempotent), instead of on every worker boot:
+    cd backend && python scripts/migrate_indexes.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app.database import mongo, ensure_indexes
+
+def migrate_indexes():
+    """Apply INDEXES from app/database.py"""
+    print("="*70)
+    print("MONGODB INDEX MIGRATION")
+    print("="*70)
+    
+    try:
+        database = mongo.database()
+        created = ensure_indexes(database)
+    except Exception as e:
+        print(f"❌ Index migration failed: {str(e)}")
+        sys.exit(1)
+    
+    for name in created:
+        print(f"   ✅ {name}")
+    
+    print(f"\n✅ {len(created)} indexes ensured on '{database.name}'")
+
+if __name__ == '__main__':
+    migrate_indexes()
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Move tweets embedded in twitter_predictions into the deduplicated
+`tweets` collection and replace them with `tweetIds` references.
+
+Safe to re-run (only documents that still embed tweets are touched):
+    cd backend && python scripts/migrate_twitter_tweets.py [batch_size]
+"""
+import os
+import sys
+from pymongo import UpdateOne
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app.database import db
+from app.services.tweet_store import TweetStore
+
+def migrate_twitter_tweets(batch_size=500):
+    """Rewrite embedded tweets as references, batch by batch"""
+    print("="*70)
+    print("TWITTER PREDICTION TWEET MIGRATION")
+    print("="*70)
+    
+    tweet_store = TweetStore(db)
+    legacy = {'tweets': {'$exists': True}, 'tweetIds': {'$exists': False}}
+    total = db.twitter_predictions.count_documents(legacy)
+    print(f"\n📦 {total} predictions embed their tweets")
+    
+    migrated = 0
+    while True:
+        batch = list(db.twitter_predictions.find(legacy, {'tweets': 1}).limit(batch_size))
+        if not batch:
+            break
+        
+        texts = [
+            [t['text'] for t in sorted(doc['tweets'] or [], key=lambda t: t.get('index', 0))]
+            for doc in batch
+        ]
+        keys = tweet_store.store([text for doc_texts in texts for text in doc_texts])
+        
+        operations = []
+        offset = 0
+        for doc, doc_texts in zip(batch, texts):
+            operations.append(UpdateOne(
+                {'_id': doc['_id'], 'tweetIds': {'$exists': False}},
+                {'$set': {'tweetIds': keys[offset:offset + len(doc_texts)]}, '$unset': {'tweets': ''}}
+            ))
+            offset += len(doc_texts)
+        
+        db.twitter_predictions.bulk_write(operations, ordered=False)
+        migrated += len(batch)
+        print(f"   ✅ {migrated}/{total}")
+    
+    print(f"\n✅ Migrated {migrated} predictions")
+    print(f"✅ Distinct tweets stored: {db.tweets.estimated_document_count()}")
+
+if __name__ == '__main__':
+    migrate_twitter_tweets(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,94 @@
+"""
+Manage versioned model artifacts in app/ml_models/registry.
+
+    cd backend && python scripts/model_registry.py list <model>
+    cd backend && python scripts/model_registry.py publish <model> <artifact_dir> [version]
+    cd backend && python scripts/model_registry.py activate <model> <version>
+    cd backend && python scripts/model_registry.py candidate <model> <version|none>
+
+<model> is 'text' (ensembles + vectorizers, optionally static_encoder/ and
+fast_tier.pkl) or 'questionnaire' (questionnaire_model.pkl). Running
+workers pick up ACTIVE/CANDIDATE changes within MODEL_REGISTRY_POLL_SECONDS:
+the new version loads in the background and is swapped in without a
+restart. `activate` on the previous version is a rollback.
+"""
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app.ml_models.model_bundle import BundleError, verify_bundle, write_manifest
+from app.ml_models.model_registry import (
+    REGISTRY_DIR, ACTIVE_POINTER, CANDIDATE_POINTER,
+    list_versions, read_pointer, version_dir, write_pointer
+)
+
+MODELS = ('text', 'questionnaire')
+
+def list_model(model):
+    active = read_pointer(model, ACTIVE_POINTER)
+    candidate = read_pointer(model, CANDIDATE_POINTER)
+    versions = list_versions(model)
+
+    if not versions:
+        print(f"No {model} versions published (workers use the legacy location)")
+        return
+
+    for version in versions:
+        marker = ' (active)' if version == active else ' (candidate)' if version == candidate else ''
+        print(f"   {version}{marker}")
+
+def publish(model, artifact_dir, version=None):
+    """Copy artifacts into a new version directory with a sha256 manifest"""
+    version = version or datetime.utcnow().strftime('%Y%m%d-%H%M%S')
+    target = version_dir(model, version)
+    if os.path.exists(target):
+        raise BundleError(f'{model} version {version} already exists')
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f'.{version}-', dir=os.path.dirname(target))
+    os.rmdir(staging)
+    shutil.copytree(artifact_dir, staging, ignore=shutil.ignore_patterns('*.png', '__pycache__'))
+    manifest = write_manifest(staging, model)
+    os.rename(staging, target)
+
+    print(f"✅ Published {model} version {version} ({len(manifest['files'])} files)")
+    print(f"   Activate with: python scripts/model_registry.py activate {model} {version}")
+
+def activate(model, version):
+    verify_bundle(version_dir(model, version))
+    write_pointer(model, ACTIVE_POINTER, version)
+    print(f"✅ {model} ACTIVE -> {version}")
+
+def candidate(model, version):
+    if version.lower() == 'none':
+        write_pointer(model, CANDIDATE_POINTER, None)
+        print(f"✅ {model} candidate cleared")
+        return
+    verify_bundle(version_dir(model, version))
+    write_pointer(model, CANDIDATE_POINTER, version)
+    print(f"✅ {model} CANDIDATE -> {version} (shadow-scored at MODEL_SHADOW_SAMPLE_RATE)")
+
+if __name__ == '__main__':
+    commands = {'list': (list_model, 0), 'publish': (publish, 1), 'activate': (activate, 1), 'candidate': (candidate, 1)}
+
+    if len(sys.argv) < 3 or sys.argv[1] not in commands or sys.argv[2] not in MODELS:
+        print(__doc__)
+        sys.exit(1)
+
+    command, required = commands[sys.argv[1]]
+    args = sys.argv[3:]
+    if len(args) < required:
+        print(__doc__)
+        sys.exit(1)
+
+    os.makedirs(os.path.join(REGISTRY_DIR, sys.argv[2]), exist_ok=True)
+
+    try:
+        command(sys.argv[2], *args)
+    except (BundleError, ValueError) as e:
+        print(f"❌ {str(e)}")
+        sys.exit(1)
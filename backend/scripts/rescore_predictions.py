@@ -0,0 +1,88 @@
+"""
+Re-score stored text/Twitter predictions with a new set of ensembles.
+
+Streams prediction_features in large batches through the classifiers in
+<model_dir> (no sentence encoder is loaded) and writes the outcome to
+`modelScores.<modelVersion>` on every prediction referencing the features.
+Feature documents remember the versions they were scored with, so the
+script is safe to re-run or resume:
+    cd backend && python scripts/rescore_predictions.py <model_dir> [batch_size]
+
+Only features produced with the same vectorizers as <model_dir> can be
+re-scored; the rest are counted and skipped.
+"""
+import os
+import sys
+import time
+from datetime import datetime
+from pymongo import UpdateMany
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app.database import db
+from app.ml_models.text_scoring import load_artifacts, score_features
+from app.services.prediction_features import PredictionFeatureStore, PREDICTION_COLLECTIONS
+
+def rescore_predictions(model_dir, batch_size=2000):
+    """Score every compatible feature document not yet scored by this version"""
+    print("="*70)
+    print("PREDICTION RE-SCORING")
+    print("="*70)
+
+    artifacts = load_artifacts(model_dir)
+    version = artifacts['modelVersion']
+    vocab_sizes = {dim: len(v.vocabulary_) for dim, v in artifacts['vectorizers'].items()}
+    print(f"\n🧠 Model version {version} (features {artifacts['featureVersion']})")
+
+    pending = {'featureVersion': artifacts['featureVersion'], 'scoredWith': {'$ne': version}}
+    incompatible = db.prediction_features.count_documents({'featureVersion': {'$ne': artifacts['featureVersion']}})
+    total = db.prediction_features.count_documents(pending)
+    print(f"📦 {total} feature documents to score ({incompatible} from other vocabularies skipped)")
+
+    scored = 0
+    last_id = None
+    started = time.time()
+
+    while True:
+        # Keyset pagination: no long-lived cursor, resumable after a crash
+        query = dict(pending, **({'_id': {'$gt': last_id}} if last_id else {}))
+        batch = list(db.prediction_features.find(query).sort('_id', 1).limit(batch_size))
+        if not batch:
+            break
+        last_id = batch[-1]['_id']
+
+        embeddings, counts, linguistic = PredictionFeatureStore.decode_batch(batch, vocab_sizes)
+        scores = score_features(artifacts['models'], embeddings, counts, linguistic)
+
+        now = datetime.utcnow()
+        operations = {module: [] for module in PREDICTION_COLLECTIONS}
+        for doc, (mbti_type, confidence) in zip(batch, scores):
+            operations[doc['module']].append(UpdateMany(
+                {'featureId': doc['_id']},
+                {'$set': {f'modelScores.{version}': {
+                    'mbtiType': mbti_type,
+                    'confidence': confidence,
+                    'scoredAt': now
+                }}}
+            ))
+
+        for module, module_operations in operations.items():
+            if module_operations:
+                db[PREDICTION_COLLECTIONS[module]].bulk_write(module_operations, ordered=False)
+
+        db.prediction_features.update_many(
+            {'_id': {'$in': [doc['_id'] for doc in batch]}},
+            {'$addToSet': {'scoredWith': version}}
+        )
+
+        scored += len(batch)
+        rate = scored / max(time.time() - started, 1e-6)
+        print(f"   ✅ {scored}/{total} ({rate:.0f} docs/s)")
+
+    print(f"\n✅ Scored {scored} feature documents with {version}")
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/rescore_predictions.py <model_dir> [batch_size]")
+        sys.exit(1)
+    rescore_predictions(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
@@ -0,0 +1,197 @@
+"""
+Train the BERT-free fast tier used by TEXT_INFERENCE_MODE=cascade.
+
+Per dimension: hashed word 1-2 gram counts + the 20 linguistic features
+into a logistic regression. The uncertainty band (fast-tier probabilities
+that are handed to the full model) is calibrated on the validation split
+so that texts resolved by the fast tier keep the full ensemble's test
+accuracy (data/aggregated_training_results.json). Writes
+app/ml_models/text/fast_tier.pkl and data/fast_tier_results.json:
+    cd backend && python scripts/train_fast_tier.py [train_split] [calibration_split]
+
+Splits are read from data/training/aggregated_binary/<DIM>_<split>.csv
+(see prepare_aggregated_binary.py); defaults are train and val. The test
+split is only used for the report. If the full model loads, the report
+also covers cascade accuracy and latency against the full ensemble.
+"""
+import json
+import os
+import pickle
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+from app.ml_models.text_scoring import (
+    DIMENSIONS, FAST_TIER_FILE, linguistic_features, load_fast_tier,
+    fast_tier_features, fast_tier_probabilities
+)
+
+DATA_DIR = os.path.join(BACKEND_DIR, 'data')
+MODEL_DIR = os.path.join(BACKEND_DIR, 'app', 'ml_models', 'text')
+
+# Smallest share of calibration texts the fast tier must resolve to be worth a band
+MIN_COVERAGE = 0.05
+
+def load_split(dim, split):
+    df = pd.read_csv(os.path.join(DATA_DIR, 'training', 'aggregated_binary', f'{dim}_{split}.csv'))
+    return df['text'].astype(str).tolist(), df['binary_label'].to_numpy()
+
+def linguistic_matrix(texts):
+    return np.vstack([linguistic_features(text) for text in texts])
+
+def calibrate_band(probabilities, labels, target_accuracy):
+    """
+    Narrowest symmetric band around 0.5 whose outside keeps `target_accuracy`
+
+    Returns:
+        tuple: (low, high); (0.0, 1.0) sends everything to the full model
+    """
+    margins = np.abs(probabilities - 0.5)
+    correct = (probabilities >= 0.5).astype(int) == labels
+
+    for margin in np.arange(0.0, 0.5, 0.01):
+        resolved = margins >= margin
+        if resolved.mean() < MIN_COVERAGE:
+            break
+        if correct[resolved].mean() >= target_accuracy:
+            return (round(float(0.5 - margin), 2), round(float(0.5 + margin), 2))
+
+    return (0.0, 1.0)
+
+def train_fast_tier(train_split='train', calibration_split='val'):
+    """Train, calibrate and save the fast tier for all four dimensions"""
+    print("="*70)
+    print("FAST TIER TRAINING")
+    print("="*70)
+
+    with open(os.path.join(DATA_DIR, 'aggregated_training_results.json')) as f:
+        full_results = json.load(f)['dimensions']
+
+    fast_tier = {'dimensions': {}}
+
+    for dim in DIMENSIONS:
+        print(f"\n🧠 {dim}")
+        train_texts, train_labels = load_split(dim, train_split)
+        calibration_texts, calibration_labels = load_split(dim, calibration_split)
+
+        entry = {
+            'vectorizer': HashingVectorizer(
+                ngram_range=(1, 2), n_features=2**18, alternate_sign=False,
+                norm='l2', stop_words='english'
+            ),
+            'scaler': StandardScaler().fit(linguistic_matrix(train_texts))
+        }
+        entry['model'] = LogisticRegression(C=4.0, max_iter=2000, class_weight='balanced').fit(
+            fast_tier_features(entry, train_texts, linguistic_matrix(train_texts)), train_labels
+        )
+
+        probabilities = entry['model'].predict_proba(
+            fast_tier_features(entry, calibration_texts, linguistic_matrix(calibration_texts))
+        )[:, 1]
+        target = full_results[dim]['test_accuracy']
+        entry['band'] = calibrate_band(probabilities, calibration_labels, target)
+
+        print(f"   Band {entry['band']} (target accuracy {target:.3f})")
+        fast_tier['dimensions'][dim] = entry
+
+    path = os.path.join(MODEL_DIR, FAST_TIER_FILE)
+    with open(path, 'wb') as f:
+        pickle.dump(fast_tier, f)
+    print(f"\n✅ Saved {path}")
+
+    report = evaluate(load_fast_tier(MODEL_DIR))
+
+    with open(os.path.join(DATA_DIR, 'fast_tier_results.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Report saved to data/fast_tier_results.json")
+
+def evaluate(fast_tier):
+    """Tier shares, accuracy and latency on the test split"""
+    print("\n" + "="*70)
+    print("TEST SPLIT REPORT")
+    print("="*70)
+
+    texts, _ = load_split('IE', 'test')
+    labels = {dim: load_split(dim, 'test')[1] for dim in DIMENSIONS}
+
+    started = time.perf_counter()
+    probabilities = fast_tier_probabilities(fast_tier, texts, linguistic_matrix(texts))
+    fast_ms = (time.perf_counter() - started) * 1000 / len(texts)
+
+    uncertain = {}
+    report = {'fastTierVersion': fast_tier['version'], 'testSize': len(texts), 'dimensions': {}}
+
+    for dim, dim_probabilities in probabilities.items():
+        low, high = fast_tier['dimensions'][dim]['band']
+        uncertain[dim] = (dim_probabilities > low) & (dim_probabilities < high)
+        correct = (dim_probabilities >= 0.5).astype(int) == labels[dim]
+        resolved = ~uncertain[dim]
+
+        report['dimensions'][dim] = {
+            'band': [low, high],
+            'fastAccuracy': float(correct.mean()),
+            'fastShare': float(resolved.mean()),
+            'resolvedAccuracy': float(correct[resolved].mean()) if resolved.any() else None
+        }
+        print(f"\n   {dim}: fast-only accuracy {correct.mean():.3f}, "
+              f"{resolved.mean():.1%} resolved by the fast tier "
+              f"({report['dimensions'][dim]['resolvedAccuracy'] or 0:.3f} accurate)")
+
+    needs_full = np.any(np.vstack(list(uncertain.values())), axis=0)
+    report['fastResolvedTexts'] = float((~needs_full).mean())
+    report['fastMsPerText'] = round(fast_ms, 2)
+    print(f"\n   Texts resolved without BERT: {(~needs_full).mean():.1%}")
+    print(f"   Fast tier latency: {fast_ms:.2f} ms/text")
+
+    report.update(evaluate_cascade(texts, labels, probabilities, uncertain, needs_full))
+    return report
+
+def evaluate_cascade(texts, labels, probabilities, uncertain, needs_full):
+    """Cascade vs full-ensemble accuracy and latency (needs the full model)"""
+    try:
+        from app.ml_models.text_classifier import text_models
+        text_classifier = text_models.current
+    except Exception as e:
+        print(f"\n⚠️  Full model unavailable, skipping cascade comparison: {str(e)}")
+        return {}
+
+    if not text_classifier.is_loaded:
+        print("\n⚠️  Full model not loaded, skipping cascade comparison")
+        return {}
+
+    started = time.perf_counter()
+    embeddings = text_classifier.bert_model.encode(texts, batch_size=32)
+    linguistic = linguistic_matrix(texts)
+    counts = {dim: text_classifier.vectorizers[dim].transform(texts).toarray() for dim in DIMENSIONS}
+    full_scores = text_classifier._score(embeddings, counts, linguistic)
+    full_ms = (time.perf_counter() - started) * 1000 / len(texts)
+
+    result = {'fullMsPerText': round(full_ms, 2), 'dimensions': {}}
+    for index, dim in enumerate(DIMENSIONS):
+        second = DIMENSIONS[dim][1]
+        full_predictions = np.array([int(mbti_type[index] == second) for mbti_type, _ in full_scores])
+        fast_predictions = (probabilities[dim] >= 0.5).astype(int)
+        cascade_predictions = np.where(uncertain[dim], full_predictions, fast_predictions)
+        result['dimensions'][dim] = {
+            'fullAccuracy': float((full_predictions == labels[dim]).mean()),
+            'cascadeAccuracy': float((cascade_predictions == labels[dim]).mean())
+        }
+        print(f"   {dim}: full {result['dimensions'][dim]['fullAccuracy']:.3f} "
+              f"vs cascade {result['dimensions'][dim]['cascadeAccuracy']:.3f}")
+
+    # Cascade cost: fast tier for all, full model for the texts that need it
+    result['cascadeMsPerTextEstimate'] = round(full_ms * needs_full.mean(), 2)
+    print(f"   Full model latency: {full_ms:.2f} ms/text, "
+          f"cascade ≈ {result['cascadeMsPerTextEstimate']:.2f} ms/text + fast tier")
+
+    return {'cascade': result}
+
+if __name__ == '__main__':
+    train_fast_tier(*sys.argv[1:3])
@@ -0,0 +1,120 @@
+"""
+Train ensembles on static-encoder features and compare with the current model.
+
+Uses the same inputs as the MiniLM ensembles (embedding + the existing
+CountVectorizer counts + linguistic features) with the embedding taken from
+the distilled static table (scripts/distill_static_encoder.py). The
+vectorizers are copied as-is, so only the encoder differs. Writes
+app/ml_models/text_static/<DIM>_aggregated_{ensemble,vectorizer}.pkl and
+data/static_encoder_results.json:
+    cd backend && python scripts/train_static_ensembles.py [train_split]
+
+The report scores data/training/mbti_aggregated_test.csv with both models
+(the MiniLM side is skipped if sentence-transformers can't load it).
+"""
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier, VotingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+from app.ml_models.text_scoring import DIMENSIONS, ENCODER_NAME, linguistic_features, load_artifacts, score_features
+from app.ml_models.static_encoder import StaticEncoder, STATIC_ENCODER_DIR
+from app.ml_models.model_bundle import resolve_encoder
+
+DATA_DIR = os.path.join(BACKEND_DIR, 'data')
+MINILM_DIR = os.path.join(BACKEND_DIR, 'app', 'ml_models', 'text')
+STATIC_DIR = os.path.join(BACKEND_DIR, 'app', 'ml_models', 'text_static')
+
+def model_inputs(encoder, vectorizer, texts):
+    return np.hstack([
+        encoder.encode(texts, batch_size=64),
+        vectorizer.transform(texts).toarray(),
+        np.vstack([linguistic_features(text) for text in texts])
+    ])
+
+def train_static_ensembles(train_split='train'):
+    """Train one soft-voting ensemble per dimension on static features"""
+    print("="*70)
+    print("STATIC ENCODER ENSEMBLE TRAINING")
+    print("="*70)
+
+    encoder = StaticEncoder(os.path.join(STATIC_DIR, STATIC_ENCODER_DIR))
+    print(f"\n🧠 Encoder {encoder.name}")
+
+    for dim in DIMENSIONS:
+        vectorizer_file = f'{dim}_aggregated_vectorizer.pkl'
+        shutil.copy(os.path.join(MINILM_DIR, vectorizer_file), os.path.join(STATIC_DIR, vectorizer_file))
+        with open(os.path.join(STATIC_DIR, vectorizer_file), 'rb') as f:
+            vectorizer = pickle.load(f)
+
+        df = pd.read_csv(os.path.join(DATA_DIR, 'training', 'aggregated_binary', f'{dim}_{train_split}.csv'))
+        X = model_inputs(encoder, vectorizer, df['text'].astype(str).tolist())
+
+        print(f"\n   {dim}: training on {X.shape[0]} texts, {X.shape[1]} features...")
+        ensemble = VotingClassifier([
+            ('lr', make_pipeline(StandardScaler(), LogisticRegression(C=0.1, max_iter=3000, class_weight='balanced'))),
+            ('rf', RandomForestClassifier(n_estimators=300, class_weight='balanced', n_jobs=-1, random_state=42))
+        ], voting='soft').fit(X, df['binary_label'].to_numpy())
+
+        with open(os.path.join(STATIC_DIR, f'{dim}_aggregated_ensemble.pkl'), 'wb') as f:
+            pickle.dump(ensemble, f)
+
+    print(f"\n✅ Ensembles saved to {STATIC_DIR}")
+
+    report = {'encoder': encoder.name, 'models': {'static': evaluate(STATIC_DIR, encoder)}}
+
+    try:
+        from sentence_transformers import SentenceTransformer
+        report['models']['minilm'] = evaluate(MINILM_DIR, SentenceTransformer(resolve_encoder(ENCODER_NAME)))
+    except Exception as e:
+        print(f"\n⚠️  MiniLM model unavailable, report covers the static model only: {str(e)}")
+
+    with open(os.path.join(DATA_DIR, 'static_encoder_results.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Report saved to data/static_encoder_results.json")
+
+def evaluate(model_dir, encoder):
+    """Per-dimension and full-type accuracy plus encode latency on the test set"""
+    artifacts = load_artifacts(model_dir)
+    test = pd.read_csv(os.path.join(DATA_DIR, 'training', 'mbti_aggregated_test.csv'))
+    texts = test['text'].astype(str).tolist()
+    types = test['type'].tolist()
+
+    started = time.perf_counter()
+    embeddings = encoder.encode(texts, batch_size=32)
+    encode_ms = (time.perf_counter() - started) * 1000 / len(texts)
+
+    linguistic = np.vstack([linguistic_features(text) for text in texts])
+    counts = {dim: artifacts['vectorizers'][dim].transform(texts).toarray() for dim in DIMENSIONS}
+    predictions = [mbti_type for mbti_type, _ in score_features(artifacts['models'], embeddings, counts, linguistic)]
+
+    result = {
+        'modelVersion': artifacts['modelVersion'],
+        'encodeMsPerText': round(encode_ms, 2),
+        'typeAccuracy': float(np.mean([p == t for p, t in zip(predictions, types)])),
+        'dimensions': {
+            dim: float(np.mean([p[index] == t[index] for p, t in zip(predictions, types)]))
+            for index, dim in enumerate(DIMENSIONS)
+        }
+    }
+
+    print(f"\n   {artifacts['encoderName']}: type accuracy {result['typeAccuracy']:.3f}, "
+          f"encode {encode_ms:.2f} ms/text")
+    for dim, accuracy in result['dimensions'].items():
+        print(f"      {dim}: {accuracy:.3f}")
+
+    return result
+
+if __name__ == '__main__':
+    train_static_ensembles(*sys.argv[1:2])
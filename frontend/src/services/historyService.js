@@ -0,0 +1,16 @@
+import axios from 'axios';
+
+const API_URL = 'http://localhost:5000/api/history';
+
+export const historyService = {
+  // Get combined history across all modules (cursor-paginated)
+  getHistory: async ({ limit, cursor, modules } = {}) => {
+    const params = {};
+    if (limit) params.limit = limit;
+    if (cursor) params.cursor = cursor;
+    if (modules) params.modules = modules.join(',');
+
+    const response = await axios.get(API_URL, { params });
+    return response.data;
+  }
+};
@@ -0,0 +1,24 @@
+import axios from 'axios';
+
+const API_URL = 'http://localhost:5000/api/jobs';
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+export const jobService = {
+  // Get status (and result once done) of an analysis job
+  getJob: async (jobId) => {
+    const response = await axios.get(`${API_URL}/${jobId}`);
+    return response.data;
+  },
+
+  // Poll until the job is done/failed; onProgress receives each job update
+  waitForJob: async (jobId, { intervalMs = 1000, onProgress } = {}) => {
+    for (;;) {
+      const job = await jobService.getJob(jobId);
+      if (onProgress) onProgress(job);
+      if (job.status === 'done') return job.result;
+      if (job.status === 'failed') throw new Error(job.error || 'Analysis failed');
+      await sleep(intervalMs);
+    }
+  }
+};
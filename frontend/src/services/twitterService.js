@@ -10,6 +10,12 @@ export const twitterService = {
     return response.data;
   },
 
+  // Analyze many profiles; returns a job to poll with jobService.waitForJob
+  analyzeBatch: async (usernames) => {
+    const response = await axios.post(`${API_URL}/analyze-batch`, { usernames });
+    return response.data;
+  },
+
   // Get latest Twitter prediction
   getLatestResult: async () => {
     const response = await axios.get(`${API_URL}/results`);